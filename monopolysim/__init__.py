@@ -0,0 +1,5 @@
+import logging
+
+# The simulator logs every move of every game at DEBUG level. Importing the
+# package never configures logging; see run_game.py for writing sim.log.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,271 @@
+import os
+import re
+import mmap
+from multiprocessing import cpu_count
+
+from .board import load_board_template
+from .parallel import map_tasks
+from .stats import TileStats
+
+# Every game in a log starts with this line, so chunks are split on it.
+NEW_GAME = b'Initializing a new board.'
+
+# The messages the engine logs, written with the `%(message)s` format used
+# by `run_game`. Each is looked for only after a cheaper substring test.
+TURN_SEPARATOR = b'-' * 70
+ARRIVED = re.compile(br'^\t?(.+) has arrived at "(.+)"')
+ARRIVED_AT_GO_TO_JAIL = re.compile(br'^(.+) has arrived at Go To Jail, ')
+ROLLED = re.compile(br'^(.+) rolled a (\d+) and (\d+)')
+PAID_RENT = re.compile(br'^(.+) \(\$-?\d+\) paid (.+) \$(\d+) in rent\.')
+UNPAID_RENT = re.compile(br'^(.+) \(\$-?\d+\) cannot afford to pay (.+) rent \(\$\d+\), they are bankrupt and paid '
+                         br'\$(\d+)\.')
+# Older engines logged the rent due, not what a bankrupt player paid. The
+# first of them transferred nothing and logged no "is bankrupt." line.
+LEGACY_UNPAID_RENT = re.compile(br'^(.+) \(\$-?\d+\) cannot afford to pay (.+) rent \(\$(\d+)\), they are bankrupt\.')
+PURCHASED = re.compile(br'^(.+) \(\$-?\d+\) has purchased "(.+)" \(\$(\d+)\)\.')
+BANKRUPT = re.compile(br'^(.+) is bankrupt\.')
+WON = re.compile(br'^Hurray, (.+) won the game with \$(-?\d+) and (\d+) properties!')
+
+
+class LoggedGame(object):
+    """
+    A summary of a single game, rebuilt from its log.
+
+    - `turns` is the number of turns, counted by the separators `start`
+      logs between them.
+    - `rolls` is the number of dice rolls, including doubles and rolls
+      to leave jail.
+    - `rent` is the total rent paid, which is less than was due when the
+      payer went bankrupt. Older logs don't say what a bankrupt player
+      paid, and count nothing.
+    - `purchases` is the number of properties bought.
+    - `bankrupt` is the nicknames of the bankrupt players, in order.
+    - `winner` is the winner's nickname, or None if the log doesn't say.
+    """
+    def __init__(self):
+        self.turns = 0
+        self.rolls = 0
+        self.rent = 0
+        self.purchases = 0
+        self.bankrupt = []
+        self.winner = None
+
+    def __repr__(self):
+        return '<LoggedGame: %d turns, winner %r>' % (self.turns, self.winner)
+
+
+class LogAnalysis(object):
+    """
+    The games in a log, in order, and per-tile counters rebuilt from it
+    (see `TileStats`; bankruptcies are counted on the tile the player
+    last arrived at).
+    """
+    def __init__(self, tile_names):
+        self.games = []
+        self.stats = TileStats(tile_names)
+
+    def __repr__(self):
+        return '<LogAnalysis: %d games>' % len(self.games)
+
+    def merge(self, other):
+        """
+        Appends `other`'s games, which follow these, and adds its counters.
+        """
+        self.games.extend(other.games)
+        self.stats.merge(other.stats)
+        return self
+
+    @property
+    def mean_turns(self):
+        if not self.games:
+            return 0.0
+        return float(sum(game.turns for game in self.games)) / len(self.games)
+
+    def wins_by_player(self):
+        wins = {}
+        for game in self.games:
+            if game.winner is not None:
+                wins[game.winner] = wins.get(game.winner, 0) + 1
+        return wins
+
+
+def tile_indices(locale):
+    """
+    Returns the indices of `locale`'s tiles by name, as it's logged (the
+    Chance and Community Chest tiles share their names), and the indices
+    of the "Go To Jail" and "Jail" tiles.
+    """
+    indices = {}
+    go_to_jail = jail = None
+    for index, tile in enumerate(load_board_template(locale)):
+        indices.setdefault(tile['name'].encode('utf-8'), []).append(index)
+        if tile['type'] == 'gotojail':
+            go_to_jail = index
+        elif tile['type'] == 'jail':
+            jail = index
+    return indices, go_to_jail, jail
+
+
+def closest(candidates, expected, tile_count):
+    """
+    Returns the index in `candidates` closest to `expected`, either way
+    around the board.
+    """
+    return min(candidates, key=lambda index: min((index - expected) % tile_count, (expected - index) % tile_count))
+
+
+def analyze_lines(lines, locale='en-gb'):
+    """
+    Rebuilds the games and per-tile counters from an iterable of log
+    lines (as bytes). Lines before the first game are ignored.
+    """
+    indices, go_to_jail, jail = tile_indices(locale)
+    tile_names = [tile['name'] for tile in load_board_template(locale)]
+    tile_count = len(tile_names)
+    analysis = LogAnalysis(tile_names)
+    stats = analysis.stats
+    game = None
+    # The tile each player last arrived at, and the total of the roll
+    # they're moving by, by nickname. Tiles which share a name are told
+    # apart by where the roll should have taken the player.
+    positions = {}
+    moves = {}
+
+    for line in lines:
+        line = line.rstrip(b'\r\n')
+        if line == NEW_GAME:
+            game = LoggedGame()
+            analysis.games.append(game)
+            stats.games += 1
+            positions = {}
+            moves = {}
+            continue
+        if game is None:
+            continue
+        if line == TURN_SEPARATOR:
+            game.turns += 1
+        elif b' has arrived at ' in line:
+            match = ARRIVED.match(line)
+            if match:
+                player = match.group(1)
+                candidates = indices.get(match.group(2))
+                if not candidates:
+                    continue
+                index = candidates[0]
+                if len(candidates) > 1:
+                    index = closest(candidates, positions.get(player, 0) + moves.get(player, 0), tile_count)
+            else:
+                match = ARRIVED_AT_GO_TO_JAIL.match(line)
+                if not match:
+                    continue
+                player, index = match.group(1), go_to_jail
+            stats.landings[index] += 1
+            positions[player] = jail if index == go_to_jail else index
+            moves[player] = 0
+        elif b' rolled a ' in line:
+            match = ROLLED.match(line)
+            if not match:
+                continue
+            if b' jail' in line:
+                positions[match.group(1)] = jail
+            # Doubles which get a player out of jail are logged twice.
+            if not line.endswith(b', they exit jail.'):
+                game.rolls += 1
+                moves[match.group(1)] = int(match.group(2)) + int(match.group(3))
+        elif line.endswith(b' in rent.') or line.endswith(b'), they are bankrupt.') or \
+                b'), they are bankrupt and paid $' in line:
+            match = PAID_RENT.match(line) or UNPAID_RENT.match(line)
+            if match and match.group(1) in positions:
+                rent = int(match.group(3))
+                stats.rent[positions[match.group(1)]] += rent
+                game.rent += rent
+                continue
+            match = LEGACY_UNPAID_RENT.match(line)
+            if match:
+                nickname = match.group(1).decode('utf-8')
+                if nickname not in game.bankrupt:
+                    game.bankrupt.append(nickname)
+                    stats.bankruptcies[positions.get(match.group(1), 0)] += 1
+        elif b' has purchased "' in line:
+            match = PURCHASED.match(line)
+            if match and match.group(1) in positions:
+                index = positions[match.group(1)]
+                stats.purchases[index] += 1
+                stats.purchase_turns[index] += game.turns
+                game.purchases += 1
+        elif line.endswith(b' is bankrupt.'):
+            match = BANKRUPT.match(line)
+            if match:
+                game.bankrupt.append(match.group(1).decode('utf-8'))
+                stats.bankruptcies[positions.get(match.group(1), 0)] += 1
+        elif line.startswith(b'Hurray, '):
+            match = WON.match(line)
+            if match:
+                game.winner = match.group(1).decode('utf-8')
+    return analysis
+
+
+def mapped_lines(buf, start, stop):
+    """
+    Yields the lines of `buf`, a memory-mapped file, from `start` up to
+    `stop`, one at a time.
+    """
+    buf.seek(start)
+    while buf.tell() < stop:
+        line = buf.readline()
+        if not line:
+            break
+        yield line
+
+
+def chunk_offsets(buf, chunks):
+    """
+    Splits `buf` into at most `chunks` byte ranges of similar size, each
+    starting at the beginning of a game, and returns their offsets.
+    """
+    size = len(buf)
+    offsets = [0]
+    for chunk in range(1, chunks):
+        position = buf.find(b'\n' + NEW_GAME, max(size * chunk // chunks - 1, offsets[-1]))
+        if position < 0:
+            break
+        if position + 1 > offsets[-1]:
+            offsets.append(position + 1)
+    return list(zip(offsets, offsets[1:] + [size]))
+
+
+def analyze_chunk(task):
+    """
+    Pool worker: analyzes the bytes `[start, stop)` of the log at `path`.
+    """
+    path, start, stop, locale = task
+    with open(path, 'rb') as fs:
+        buf = mmap.mmap(fs.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return analyze_lines(mapped_lines(buf, start, stop), locale)
+        finally:
+            buf.close()
+
+
+def analyze_log(path, locale='en-gb', workers=None, chunks=None, start_method=None):
+    """
+    Analyzes the log at `path` in chunks, split on game boundaries, across
+    a process pool, and returns the merged `LogAnalysis`. Each worker
+    memory-maps the log and reads it a line at a time, so memory use
+    depends on the number of games, not the size of the log.
+    """
+    workers = workers or cpu_count()
+    analysis = LogAnalysis(tile['name'] for tile in load_board_template(locale))
+    if not os.path.getsize(path):
+        return analysis
+    with open(path, 'rb') as fs:
+        buf = mmap.mmap(fs.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            offsets = chunk_offsets(buf, chunks or workers * 4)
+        finally:
+            buf.close()
+
+    tasks = [(path, start, stop, locale) for start, stop in offsets]
+    for partial in map_tasks(analyze_chunk, tasks, workers, start_method):
+        analysis.merge(partial)
+    return analysis
@@ -0,0 +1,23 @@
+from . import conf
+
+
+class Bank(object):
+    """
+    The bank's stock of houses and hotels. Stock is limited, so once
+    it's all been built nobody else can build until some is returned.
+    """
+    def __init__(self, houses=None, hotels=None):
+        self.houses = conf.MAX_BOARD_HOUSES if houses is None else houses
+        self.hotels = conf.MAX_BOARD_HOTELS if hotels is None else hotels
+
+    def __repr__(self):
+        return '<Bank: %d houses, %d hotels>' % (self.houses, self.hotels)
+
+    def has_stock(self, upgrade_type):
+        """
+        Whether the bank can supply the building for an upgrade of
+        `upgrade_type`, as returned by `PropertyTile.get_upgrade_price`.
+        """
+        if upgrade_type == 'hotel':
+            return self.hotels > 0
+        return self.houses > 0
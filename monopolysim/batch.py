@@ -0,0 +1,345 @@
+from importlib import import_module
+from multiprocessing import cpu_count
+
+from . import conf
+from . import estimators
+from .board import Board
+from .cache import CACHE_SHARD_SIZE, ResultCache, shard_key
+from .player import Player
+from .stats import TileStats
+from .timeline import Timeline, TimelineWriter, merge_files
+from .parallel import imap_tasks, split_range
+from .store import ResultStore, ResultWriter, config_metadata
+
+
+def game_seed(seed, index):
+    """
+    Returns the dice seed of the `index`th game in a batch with master
+    `seed`. Batches with different master seeds never share a game.
+    """
+    return (seed << 32) + index
+
+
+class GameResult(object):
+    """
+    A summary of a single simulated game.
+
+    - `seed` is the game's dice seed.
+    - `turns` is the number of turns that were played.
+    - `winner` is the winning seat, or None if the game was abandoned.
+    - `cash` is each seat's final cash.
+    - `seat` is the seat under study.
+    - `antithetic` is whether the game was played with mirrored dice.
+    - `dice` is each seat's `(rolls, pips, doubles)`, if they were counted.
+    """
+    def __init__(self, seed, num_players, turns, winner, cash, seat=0, antithetic=False, dice=None):
+        self.seed = seed
+        self.num_players = num_players
+        self.turns = turns
+        self.winner = winner
+        self.cash = cash
+        self.seat = seat
+        self.antithetic = antithetic
+        self.dice = dice
+
+    def __repr__(self):
+        return '<GameResult: seed %d, %d turns, winner %r>' % (self.seed, self.turns, self.winner)
+
+    def to_list(self):
+        return [self.seed, self.num_players, self.turns, self.winner, list(self.cash), self.seat, self.antithetic,
+                [list(counts) for counts in self.dice] if self.dice is not None else None]
+
+    @classmethod
+    def from_list(cls, data):
+        seed, num_players, turns, winner, cash, seat, antithetic, dice = data
+        if dice is not None:
+            dice = tuple(tuple(counts) for counts in dice)
+        return cls(seed, num_players, turns, winner, tuple(cash), seat, antithetic, dice)
+
+    def controls(self):
+        """
+        Quantities with a known expectation of zero, for control variates:
+        how far the seat under study's dice, and everyone else's, came out
+        above average in pips (seven a roll) and doubles (one roll in six).
+        """
+        own, others = [0, 0, 0], [0, 0, 0]
+        for seat, counts in enumerate(self.dice):
+            totals = own if seat == self.seat else others
+            for index, count in enumerate(counts):
+                totals[index] += count
+        return (own[1] - 7.0 * own[0], own[2] - own[0] / 6.0,
+                others[1] - 7.0 * others[0], others[2] - others[0] / 6.0)
+
+
+def count_dice(board):
+    """
+    Counts each player's rolls, pips and doubles in `board`'s game, by
+    wrapping their `roll_dice`. Returns the counts, one list per seat,
+    which are kept up to date as the game is played.
+    """
+    counts = []
+    for player in board.players:
+        seat_counts = [0, 0, 0]
+        counts.append(seat_counts)
+
+        def counted_roll_dice(roll_dice=player.roll_dice, seat_counts=seat_counts):
+            dice_roll = roll_dice()
+            if dice_roll is not None:
+                seat_counts[0] += 1
+                seat_counts[1] += dice_roll[0] + dice_roll[1]
+                seat_counts[2] += dice_roll[0] == dice_roll[1]
+            return dice_roll
+
+        player.roll_dice = counted_roll_dice
+    return counts
+
+
+def play_game(seed, num_players=2, locale='en-gb', max_turns=None, stats=None, player_classes=None,
+              seat=0, antithetic=False, dice=False, timelines=None, hooks=None):
+    """
+    Plays a single game to completion, or until `max_turns` have been
+    played, and returns its `GameResult`. Counters are collected into
+    `stats` when given, seats are played by `player_classes` if given,
+    each seat's dice are counted if `dice` is set, the game's timeline
+    is written to the `TimelineWriter` `timelines` if given, and the
+    events subscribed to in `hooks` (see `events.Hooks`) are raised.
+    """
+    if max_turns is None:
+        max_turns = conf.MAX_GAME_TURNS
+
+    board = Board(num_players=num_players, locale=locale, seed=seed, player_classes=player_classes,
+                  antithetic=antithetic)
+    board.setup()
+    if stats is not None:
+        stats.bind(board)
+    if hooks is not None:
+        hooks.bind(board)
+    dice_counts = count_dice(board) if dice else None
+    timeline = None
+    if timelines is not None:
+        timeline = Timeline.for_board(board, timelines.capacity)
+        timeline.bind(board)
+
+    board.run(max_turns)
+
+    if timeline is not None:
+        timelines.write(timeline)
+
+    winner = None
+    if board.finished:
+        for player_seat, player in enumerate(board.players):
+            if not player.bankrupt:
+                winner = player_seat
+    if dice_counts is not None:
+        dice_counts = tuple(tuple(counts) for counts in dice_counts)
+    return GameResult(seed, num_players, board.turn, winner, tuple(p.cash for p in board.players),
+                      seat, antithetic, dice_counts)
+
+
+class BatchResult(object):
+    """
+    The results of a batch of games, in game order, and the merged
+    per-tile counters if they were collected.
+    """
+    def __init__(self, games=None, stats=None):
+        self.games = games or []
+        self.stats = stats
+
+    def __repr__(self):
+        return '<BatchResult: %d games>' % len(self.games)
+
+    def to_dict(self):
+        """
+        Returns the games and counters as plain lists and dicts, e.g. to
+        send them as JSON.
+        """
+        return {
+            'games': [game.to_list() for game in self.games],
+            'stats': self.stats.to_dict() if self.stats is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = TileStats.from_dict(data['stats']) if data['stats'] is not None else None
+        return cls([GameResult.from_list(game) for game in data['games']], stats)
+
+    def merge(self, other):
+        """
+        Appends `other`'s games, which follow these, and adds its counters.
+        """
+        self.games.extend(other.games)
+        if self.stats is None:
+            self.stats = other.stats
+        elif other.stats is not None:
+            self.stats.merge(other.stats)
+        return self
+
+    def wins_by_seat(self):
+        wins = [0] * max([game.num_players for game in self.games] or [0])
+        for game in self.games:
+            if game.winner is not None:
+                wins[game.winner] += 1
+        return wins
+
+    @property
+    def mean_turns(self):
+        if not self.games:
+            return 0.0
+        return float(sum(game.turns for game in self.games)) / len(self.games)
+
+    def values(self, metric):
+        """
+        Returns each game's `metric`: 'wins' (whether the seat under study
+        won) or 'turns'.
+        """
+        if metric == 'wins':
+            return [1 if game.winner == game.seat else 0 for game in self.games]
+        return [game.turns for game in self.games]
+
+    def estimate(self, metric, estimator='plain'):
+        """
+        Estimates the mean of `metric` with one of `estimators.ESTIMATORS`.
+        The games must have been played for that estimator (see `run_batch`).
+        """
+        values = self.values(metric)
+        if estimator == 'antithetic':
+            return estimators.antithetic(values)
+        if estimator == 'control':
+            return estimators.control_variate(values, [game.controls() for game in self.games])
+        if estimator == 'stratified':
+            return estimators.stratified(values, [game.seat for game in self.games])
+        return estimators.plain(values)
+
+    def variance_reduction(self, metric, estimator):
+        """
+        How many times lower the variance of `estimator`'s estimate is than
+        that of the plain mean of as many independent games.
+        """
+        reduced = self.estimate(metric, estimator).stderr ** 2
+        if not reduced:
+            return float('inf')
+        return self.estimate(metric).stderr ** 2 / reduced
+
+
+def run_games(task):
+    """
+    Pool worker: plays the games with indices `[start, stop)` of a batch.
+    """
+    seed, start, stop, num_players, locale, max_turns, collect_stats, estimator, player_class, timelines = task
+    player_classes = None
+    if player_class is not None:
+        module_name, class_name = player_class.rsplit('.', 1)
+        player_class = getattr(import_module(module_name), class_name)
+    result = BatchResult()
+    writer = None
+    if timelines is not None:
+        # Each task writes its own part, which `run_batch` merges in order.
+        path, capacity = timelines
+        fs = open(timeline_part(path, start), 'wb')
+        writer = TimelineWriter(fs, capacity)
+    for index in range(start, stop):
+        if collect_stats and result.stats is None:
+            board = Board(num_players=num_players, locale=locale)
+            board.initialize_board()
+            result.stats = TileStats.for_board(board)
+        # Antithetic games come in pairs, the second replaying the first's seed
+        # with mirrored dice. Stratified games rotate the seat under study.
+        game_index, antithetic, seat = index, False, 0
+        if estimator == 'antithetic':
+            game_index, antithetic = index - index % 2, index % 2 == 1
+        elif estimator == 'stratified':
+            seat = index % num_players
+        if player_class is not None:
+            player_classes = [Player] * num_players
+            player_classes[seat] = player_class
+        result.games.append(play_game(game_seed(seed, game_index), num_players, locale, max_turns, result.stats,
+                                      player_classes, seat, antithetic, estimator == 'control', writer))
+    if writer is not None:
+        writer.close()
+        fs.close()
+    return result
+
+
+def timeline_part(path, start):
+    return '%s.%d' % (path, start)
+
+
+def batch_tasks(games, seed, num_players, locale, max_turns, workers, collect_stats, chunk_size=None,
+                estimator=None, player_class=None, timelines=None):
+    """
+    Splits a batch into `run_games` tasks, enough to keep `workers` busy.
+    """
+    tasks = []
+    for start, stop in split_range(0, games, workers, chunk_size):
+        tasks.append((seed, start, stop, num_players, locale, max_turns, collect_stats, estimator, player_class,
+                      timelines))
+    return tasks
+
+
+def run_batch(games, seed=0, num_players=2, locale='en-gb', max_turns=None, workers=None,
+              collect_stats=False, chunk_size=None, start_method=None, estimator=None, player_class=None,
+              timelines=None, timeline_capacity=None, store=None, cache=None):
+    """
+    Plays `games` games split into chunks across a process pool, and
+    returns their merged `BatchResult`. The result depends only on the
+    master `seed`, not on the number of workers or how they're started.
+
+    The games can be played for one of the variance-reducing `estimator`s
+    (see `BatchResult.estimate`): 'antithetic' plays them in pairs, the
+    second with mirrored dice, 'control' counts each seat's dice, and
+    'stratified' rotates the seat under study. `player_class` is the
+    `module.Class` path of the player under study, if not the default.
+
+    If `timelines` is a path, every game's timeline is written to a single
+    timeline file there, in game order, keeping only each game's last
+    `timeline_capacity` turns if it's given (see `timeline.Timeline`).
+
+    If `store` is a path, the games and the batch's config are also
+    written to the SQLite `ResultStore` there, as chunks come back from
+    the pool.
+
+    If `cache` is a `cache.ResultCache`, or a directory for one, shards of
+    `CACHE_SHARD_SIZE` games already played under the same engine,
+    settings and strategy are read from it rather than played again, and
+    the rest are added to it. Batches writing `timelines` aren't cached.
+    """
+    workers = workers or cpu_count()
+    if cache is not None and not isinstance(cache, ResultCache):
+        cache = ResultCache(cache)
+    if timelines:
+        cache = None
+    if cache is not None:
+        chunk_size = chunk_size or CACHE_SHARD_SIZE
+    tasks = batch_tasks(games, seed, num_players, locale, max_turns, workers, collect_stats, chunk_size,
+                        estimator, player_class, (timelines, timeline_capacity) if timelines else None)
+
+    writer = None
+    if store:
+        results = ResultStore(store)
+        run_id = results.add_run(config_metadata(locale, num_players, max_turns, estimator, player_class), seed, games)
+        results.close()
+        writer = ResultWriter(store)
+
+    keys = [shard_key(task) for task in tasks] if cache is not None else None
+    cached = [cache.get(key) for key in keys] if cache is not None else [None] * len(tasks)
+    played = imap_tasks(run_games, [task for task, partial in zip(tasks, cached) if partial is None], workers,
+                        start_method)
+
+    result = BatchResult()
+    try:
+        for index, task in enumerate(tasks):
+            partial = cached[index]
+            if partial is None:
+                partial = next(played)
+                if cache is not None:
+                    cache.put(keys[index], partial)
+            if writer is not None:
+                writer.write(run_id, task[1], partial.games)
+            result.merge(partial)
+    finally:
+        played.close()
+        if writer is not None:
+            writer.close()
+    if timelines:
+        merge_files(timelines, [timeline_part(timelines, task[1]) for task in tasks])
+    return result
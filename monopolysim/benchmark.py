@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+from . import conf
+from .batch import game_seed, play_game
+from .board import Board
+
+# The directory holding the package, from which other interpreters import it.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def locale_for(tile_count):
+    """
+    The standard locale for a 40 tile board, otherwise a synthetic one.
+    """
+    return 'en-gb' if tile_count == 40 else 'synthetic-%d' % tile_count
+
+
+def time_turns(tile_count=40, num_players=4, turns=5000, seed=0, repeat=3):
+    """
+    Returns the mean number of seconds a turn takes on a board of
+    `tile_count` tiles with `num_players` players, playing seeded games
+    until at least `turns` turns have been played. Setting up each board
+    isn't timed. The fastest of `repeat` runs is kept.
+    """
+    locale = locale_for(tile_count)
+    best = None
+    for _ in range(repeat):
+        played, elapsed, game = 0, 0.0, 0
+        while played < turns:
+            board = Board(num_players=num_players, locale=locale, seed=seed + game)
+            board.setup()
+            started = time.time()
+            board.run(min(turns - played, conf.MAX_GAME_TURNS))
+            elapsed += time.time() - started
+            played += board.turn
+            game += 1
+        per_turn = elapsed / played
+        if best is None or per_turn < best:
+            best = per_turn
+    return best
+
+
+def run_benchmark(tile_counts=(40, 400, 4000), player_counts=(2, 8, 32), turns=5000, seed=0, repeat=3):
+    """
+    Times turns for every combination of `tile_counts` and
+    `player_counts`, and returns `{(tile_count, num_players): seconds}`.
+    """
+    results = {}
+    for tile_count in tile_counts:
+        for num_players in player_counts:
+            results[tile_count, num_players] = time_turns(tile_count, num_players, turns, seed, repeat)
+    return results
+
+
+def time_games(games=200, tile_count=40, num_players=4, seed=0, repeat=3, warmup=50):
+    """
+    Plays `games` seeded games on a board of `tile_count` tiles with
+    `num_players` players, in this process, and returns the number
+    played per second, the fastest of `repeat` runs, and the games' total
+    number of turns, which is the same under any interpreter. `warmup`
+    games are played untimed first, so a JIT has compiled the game loop
+    before it's timed.
+    """
+    locale = locale_for(tile_count)
+    for index in range(warmup):
+        play_game(game_seed(seed, games + index), num_players, locale)
+    best, turns = None, None
+    for _ in range(repeat):
+        started = time.time()
+        results = [play_game(game_seed(seed, index), num_players, locale) for index in range(games)]
+        elapsed = time.time() - started
+        turns = sum(result.turns for result in results)
+        if best is None or elapsed < best:
+            best = elapsed
+    return games / max(best, 1e-9), turns
+
+
+class InterpreterTiming(object):
+    """
+    The games per second played under one `interpreter`, reporting its
+    `version`, and their total `turns`; or why it couldn't be timed, as
+    `error`.
+    """
+    def __init__(self, interpreter, version=None, games_per_second=None, turns=None, error=None):
+        self.interpreter = interpreter
+        self.version = version
+        self.games_per_second = games_per_second
+        self.turns = turns
+        self.error = error
+
+    def __repr__(self):
+        if self.error:
+            return '<InterpreterTiming: %s failed>' % self.interpreter
+        return '<InterpreterTiming: %s, %.1f games/s>' % (self.interpreter, self.games_per_second)
+
+
+def time_interpreter(interpreter, games=200, tile_count=40, num_players=4, seed=0, repeat=3, warmup=50):
+    """
+    Runs `time_games` under the `interpreter` executable, in a fresh
+    process importing this copy of the package, and returns its
+    `InterpreterTiming`.
+    """
+    command = [interpreter, '-m', 'monopolysim.run_benchmark', '--games', str(games), '--tiles', str(tile_count),
+               '--players', str(num_players), '--seed', str(seed), '--repeat', str(repeat), '--warmup', str(warmup),
+               '--json']
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(filter(None, (ROOT, environment.get('PYTHONPATH'))))
+    try:
+        process = subprocess.Popen(command, cwd=ROOT, env=environment, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+    except OSError as e:
+        return InterpreterTiming(interpreter, error=str(e))
+    out, err = process.communicate()
+    if process.returncode:
+        lines = err.decode('utf-8', 'replace').strip().splitlines()
+        return InterpreterTiming(interpreter, error=lines[-1] if lines else 'exit status %d' % process.returncode)
+    timing = json.loads(out.decode('utf-8').strip().splitlines()[-1])
+    return InterpreterTiming(interpreter, timing['version'], timing['games_per_second'], timing['turns'])
+
+
+def compare_interpreters(interpreters, games=200, tile_count=40, num_players=4, seed=0, repeat=3, warmup=50):
+    """
+    Times the same games under each of `interpreters` (see
+    `time_interpreter`), one after another so they don't compete for a
+    CPU, and returns their `InterpreterTiming`s in order.
+    """
+    return [time_interpreter(interpreter, games, tile_count, num_players, seed, repeat, warmup)
+            for interpreter in interpreters]
+
+
+def interpreter_version():
+    implementation = getattr(sys, 'implementation', None)
+    name = implementation.name if implementation else ('pypy' if 'PyPy' in sys.version else 'cpython')
+    return '%s %s' % (name, sys.version.split()[0])
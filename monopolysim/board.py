@@ -1,13 +1,67 @@
+import os
 import sys
 import json
 import logging
-from time import sleep
-from random import randint
+from bisect import bisect_right
+from random import Random, randint
 
-import conf
-from player import Player
-from tiles import Tile, TaxableTile, ChanceTile, PropertyTile, \
-    CommunityChestTile, JailTile, GoToJailTile, FreeParkingTile, GoTile
+from . import conf
+from . import tiles
+from .bank import Bank
+from .cards import Deck, create_cards
+from .liquidation import Liquidator
+from .trading import Valuation
+from .dice import CARD_STREAM, DiceStream, stream_seed
+from .player import Player
+from .rules import RuleSet
+from .synthetic import BASE_LOCALE, synthetic_template, synthetic_tile_count
+from .tiles import CardTile, PropertyTile, PropertyGroup
+
+logger = logging.getLogger(__name__)
+
+# The directory holding the board template of each locale.
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locale')
+
+# Board templates and cards which have already been read, by locale.
+board_templates = {}
+locale_cards = {}
+
+
+def load_board_template(locale):
+    """
+    Returns the board template of `locale`. Each template is read
+    from the package's locale directory, or built for a synthetic locale
+    (see `synthetic.synthetic_template`), once per process.
+    """
+    if locale not in board_templates:
+        tile_count = synthetic_tile_count(locale)
+        if tile_count is not None:
+            board_templates[locale] = synthetic_template(load_board_template(BASE_LOCALE), tile_count)
+            return board_templates[locale]
+        try:
+            with open(os.path.join(LOCALE_DIR, 'board_%s.json' % locale)) as fs:
+                board_templates[locale] = json.loads(fs.read())
+        except IOError:
+            raise LocaleDoesNotExist('The %s locale does not have a board template.' % locale)
+    return board_templates[locale]
+
+
+def load_cards(locale):
+    """
+    Returns the cards of each of `locale`'s decks, by deck name. Cards
+    are read from the package's locale directory once per process, and
+    are shared by every game.
+    """
+    if synthetic_tile_count(locale) is not None:
+        return load_cards(BASE_LOCALE)
+    if locale not in locale_cards:
+        try:
+            with open(os.path.join(LOCALE_DIR, 'cards_%s.json' % locale)) as fs:
+                card_templates = json.loads(fs.read())
+        except IOError:
+            raise LocaleDoesNotExist('The %s locale does not have a card template.' % locale)
+        locale_cards[locale] = dict((name, create_cards(templates)) for name, templates in card_templates.items())
+    return locale_cards[locale]
 
 
 class Board(object):
@@ -36,52 +90,97 @@ class Board(object):
             - If the tile is CardTile (Chance, Community Chest)
                 - It picks its card, applies its changes.
     """
-    def __init__(self, num_players=4, locale='en-gb', fast=False):
+    def __init__(self, num_players=4, locale='en-gb', seed=None, player_classes=None, antithetic=False, rules=None):
         self.tiles = []
         self.players = []
+        # The first tile with each name, and the steps of the tiles of each
+        # type, in order, so tiles are found without scanning the board.
+        self.tiles_by_name = {}
+        self.steps_by_type = {}
+        # The steps of the tiles which do something when they're passed.
+        self.transit_steps = []
+        # The `Player` class (i.e. strategy) of each seat, if not the default.
+        self.player_classes = player_classes
         self.turn_order = {}
         self.num_players = num_players
         self.locale = locale
-        self.turn_pause = 0
-        if not fast:
-            self.turn_pause = conf.TURN_PAUSE_DURATION
         # The total number of tiles on the board.
         self.total_tile_count = 0
+        # Every die rolled in this game is drawn from this stream, or its
+        # mirror image if the game is `antithetic`.
+        self.seed = seed
+        self.dice = DiceStream(seed, antithetic=antithetic)
+        # The Chance and Community Chest decks, shuffled for this game.
+        self.decks = {}
+        # The property groups, by colour (or "station" and "utility"),
+        # and the bank's stock of houses and hotels.
+        self.groups = {}
+        self.bank = Bank()
+        self.liquidator = Liquidator(self)
+        self.valuation = None
+        # The house rules in play (`conf.HOUSE_RULES` unless given), and
+        # the jackpot of taxes paid under the Free Parking rule.
+        self.rules = RuleSet(conf.HOUSE_RULES if rules is None else rules)
+        self.jackpot = 0
+        # The number of turns played so far, and the players taking
+        # their turn in the current round.
+        self.turn = 0
+        self.round_players = []
+        self.round_index = 0
+        self.finished = False
+        # The number of players who have gone bankrupt, and the active
+        # players the last time they were counted, with the number of
+        # players and bankruptcies when they were.
+        self.bankruptcies = 0
+        self.active_players = ((0, 0), [])
+        # The nicknames of the first `named_players` players.
+        self.used_player_names = set()
+        self.named_players = 0
 
     def initialize_board(self):
         """
         Reads the board JSON template for the requested locale
         and constructs the board using the relevant tiles.
         """
-        logging.debug('Initializing a new board.')
-        try:
-            fs = open('locale/board_%s.json' % self.locale)
-            board_template = json.loads(fs.read())
-        except IOError:
-            raise LocaleDoesNotExist('The %s locale does not have a board template.' % self.locale)
-
-        tile_map = {
-            'go': GoTile,
-            'station': PropertyTile,
-            'utility': PropertyTile,
-            'tax': TaxableTile,
-            'jail': JailTile,
-            'chance': ChanceTile,
-            'property': PropertyTile,
-            'gotojail': GoToJailTile,
-            'freeparking': FreeParkingTile,
-            'community_chest': CommunityChestTile
-        }
+        logger.debug('Initializing a new board.')
+        board_template = load_board_template(self.locale)
+
+        # The tile classes are those of the house rules being played.
+        tile_classes = self.rules.tile_classes
 
         for tile_step, tile_template in enumerate(board_template):
             tile_type = tile_template['type']
-            tile_template['board'] = self
-            tile_template['step'] = tile_step + 1
-            tile = tile_map[tile_type](**tile_template)
+            tile = tile_classes[tile_type](board=self, step=tile_step + 1, **tile_template)
             self.tiles.append(tile)
 
         # Update the total tile count.
         self.total_tile_count = len(self.tiles)
+        for tile in self.tiles:
+            self.tiles_by_name.setdefault(tile.name, tile)
+            self.steps_by_type.setdefault(tile.type, []).append(tile.step)
+            if tile.transit_effects:
+                self.transit_steps.append(tile.step)
+
+        # Group the property tiles, grouping stations and utilities by type.
+        for tile in self.tiles:
+            if isinstance(tile, PropertyTile):
+                group_name = tile.group if tile.type == 'property' else tile.type
+                if group_name not in self.groups:
+                    self.groups[group_name] = PropertyGroup(group_name, buildable=tile.type == 'property')
+                tile.property_group = self.groups[group_name]
+                tile.property_group.tiles.append(tile)
+
+        # Shuffle this game's decks, and hand each card tile its deck.
+        card_random = Random(stream_seed(self.seed, CARD_STREAM)).random
+        cards = load_cards(self.locale)
+        for deck_name in sorted(cards):
+            self.decks[deck_name] = Deck(deck_name, cards[deck_name], card_random)
+        for tile in self.tiles:
+            if isinstance(tile, CardTile):
+                tile.deck = self.decks[tile.type]
+
+        # The properties' rent yields, worked out once per locale, for trading.
+        self.valuation = Valuation.for_board(self)
 
     def initialize_players(self):
         """
@@ -89,10 +188,11 @@ class Board(object):
         if not len(self.tiles):
             raise RuntimeError('The board has not been initialized.')
 
-        logging.debug('Initializing %d players.' % self.num_players)
-        for pid in xrange(0, self.num_players):
+        logger.debug('Initializing %d players.', self.num_players)
+        for pid in range(self.num_players):
             nickname = self.get_random_player_name(pid)
-            player = Player(nickname=nickname, tile=self.tiles[0])
+            player_class = self.player_classes[pid] if self.player_classes else Player
+            player = player_class(nickname=nickname, tile=self.tiles[0])
             self.players.append(player)
 
     def initialize_turns(self):
@@ -108,10 +208,21 @@ class Board(object):
         """
         Returns the `Tile` in `self.tiles` which has a name of `name`.
         """
-        for tile in self.tiles:
-            if tile.name == name:
-                return tile
-        return None
+        return self.tiles_by_name.get(name)
+
+    def get_nearest_tile(self, tile, tile_type):
+        """
+        Returns the next tile of `tile_type` after `tile`, going around the
+        board, or None if there are no others.
+        """
+        steps = self.steps_by_type.get(tile_type)
+        if not steps:
+            return None
+        index = bisect_right(steps, tile.step)
+        step = steps[index] if index < len(steps) else steps[0]
+        if step == tile.step:
+            return None
+        return self.tiles[step - 1]
 
     def get_random_player_name(self, pid, database=None):
         """
@@ -120,8 +231,11 @@ class Board(object):
         """
         if database is None:
             database = conf.DEFAULT_PLAYER_NAMES
-        used_player_names = map(lambda player: player.nickname, self.players)
-        available_names = list(set(database) - set(used_player_names))
+        # Only the players who joined since the last call are looked at.
+        for player in self.players[self.named_players:]:
+            self.used_player_names.add(player.nickname)
+        self.named_players = len(self.players)
+        available_names = [name for name in database if name not in self.used_player_names]
         if available_names:
             return available_names[randint(0, len(available_names) - 1)]
         return 'Player%d' % pid
@@ -146,38 +260,35 @@ class Board(object):
         if turn_decision == conf.PLAYER_JAIL_PAY:
             player.wallet.withdraw(50)
             player.handle_jail_exit()
+        elif turn_decision == conf.PLAYER_JAIL_CARD:
+            player.use_jail_free_card()
+            player.handle_jail_exit()
         elif turn_decision == conf.PLAYER_JAIL_WAIT:
             if player.jail_exit_rolls == conf.MAX_JAIL_FAILED_ROLLS:
                 player.wallet.withdraw(50)
                 player.handle_jail_exit()
-                logging.debug('%s has been in jail for %s turns, they '
-                              'are now free.' % (player.nickname, conf.MAX_JAIL_FAILED_ROLLS))
+                logger.debug('%s has been in jail for %s turns, they '
+                             'are now free.', player.nickname, conf.MAX_JAIL_FAILED_ROLLS)
                 return self.handle_play_turn(player)
 
             dice_roll = player.roll_dice()
             if dice_roll[0] == dice_roll[1]:
-                logging.debug('%s rolled a %d and %d, they exit jail.' % (
-                    player.nickname,
-                    dice_roll[0],
-                    dice_roll[1]
-                ))
+                logger.debug('%s rolled a %d and %d, they exit jail.', player.nickname, dice_roll[0], dice_roll[1])
                 player.handle_jail_exit()
                 return self.handle_play_turn(player, dice_roll)
 
             player.jail_exit_rolls += 1
-            logging.debug('%s rolled a %d and %d. They remain in jail (roll %d of %d).' % (
-                player.nickname,
-                dice_roll[0],
-                dice_roll[1],
-                player.jail_exit_rolls,
-                conf.MAX_JAIL_FAILED_ROLLS
-            ))
+            logger.debug('%s rolled a %d and %d. They remain in jail (roll %d of %d).', player.nickname,
+                         dice_roll[0], dice_roll[1], player.jail_exit_rolls, conf.MAX_JAIL_FAILED_ROLLS)
 
     def handle_play_turn(self, player, dice_roll=None):
         """
         Responsible for handling a player's current turn.
         """
-        # Let the player decide if they wish to purchase houses or hotels.
+        # Let the player offer trades, then decide if they wish to lift
+        # mortgages and purchase houses or hotels.
+        player.propose_trades()
+        player.unmortgage_properties()
         player.construct_houses()
 
         # If a dice roll hasn't been given to it, roll.
@@ -189,115 +300,148 @@ class Board(object):
 
         # Count the number of tiles we're moving.
         tile_moves = sum(dice_roll)
-        logging.debug('%s rolled a %d and %d.' % (player.nickname, dice_roll[0], dice_roll[1]))
-
-        # Whether or not this roll takes us around the board again.
-        circular_roll = False
-
-        # If the player's current tile, plus the number of tiles we're moving to (based on our
-        # dice roll) is more than the total number of times, we're going around the board passed
-        # the GO tile. To get the correct `dest_tile_step` we add the current step plus the tile
-        # moves and subtract the total number of times.
-        if (player.tile.step + tile_moves) > self.total_tile_count:
-            circular_roll = True
-            dest_tile_step = (player.tile.step + tile_moves) - self.total_tile_count
-        else:
-            # If we aren't about to go around the board, the `dest_tile_step` is simply the current
-            # tile's step plus the total moves the player has rolled on their dice.
-            dest_tile_step = player.tile.step + tile_moves
+        logger.debug('%s rolled a %d and %d.', player.nickname, dice_roll[0], dice_roll[1])
 
-        # The tiles we've found that the user is going to journey through.
-        # These tiles should always be between the player's NEXT tile and
-        # up to and including their destination tile.
-        journey_tiles = []
-
-        # Iterate over each tile...
-        for tile in self.tiles:
-
-            # If our roll takes us over GO...
-            if circular_roll:
-                # A valid tile is between the player's current tile, and the end of the board,
-                # OR, if the tile's step is below the destination tile's step.
-                if player.tile.step < tile.step <= self.total_tile_count or tile.step <= dest_tile_step:
-                    journey_tiles.append(tile)
-            else:
-                # If the roll doesn't take us across go, a valid next tile is
-                # between the player's current tile and the destination tile.
-                if player.tile.step < tile.step <= dest_tile_step:
-                    journey_tiles.append(tile)
-
-        # We've now built up a list, `journey_tiles`, of Tiles which the player is going to navigate
-        # across. However, if the turn is circular (we're going around the board again), we need to
-        # ensure that pre-GO tiles are sorted before post-GO tiles. For example, if I'm at Super Tax
-        # (the penultimate tile), I need to navigate across Mayfair first (#40) before I start navigating
-        # across GO (#1), Old Kent Road (#2), etc. As we can't simply sort (we need highest step DESC, then
-        # highest step ASC), we'll:
-        # 1) Pluck out the pre_go_tiles (between player's next tile and the end of the board).
-        # 2) Establish what the difference is between the journey tiles and the pre_go_tiles (post_go_tiles).
-        # 3) Sort the post_go_tiles by step ASC.
-        # 4) Re-create the journey tiles, sticking the pre-GO tiles first.
-        if circular_roll:
-            pre_go_tiles = [t for t in journey_tiles if t.step > player.tile.step and t.step <= self.total_tile_count]
-            post_go_tiles = list(set(journey_tiles) - set(pre_go_tiles))
-            post_go_tiles.sort(key=lambda t: t.step)
-            journey_tiles = pre_go_tiles + post_go_tiles
-
-        # Iterate over each journey tile...
-        for tile in journey_tiles:
-            # Have we arrived at our destination?
-            if tile.step == dest_tile_step:
-                player.handle_land_on_tile(tile, dice_roll)
-            else:
-                # For each tile, handle what happens when you transit across it.
-                player.handle_transit_tile(tile)
+        # Move across the tiles we journey through, and land on our destination.
+        player.handle_land_on_tile(self.move_player(player, tile_moves), dice_roll)
 
         # Did the player roll double die?
         if not player.bankrupt and dice_roll[0] == dice_roll[1]:
-            logging.debug('%s rolled a double (%d & %d), they get to roll again.' %
-                          (player.nickname, dice_roll[0], dice_roll[1]))
+            logger.debug('%s rolled a double (%d & %d), they get to roll again.',
+                         player.nickname, dice_roll[0], dice_roll[1])
             self.handle_play_turn(player)
 
+    def move_player(self, player, tile_moves):
+        """
+        Moves `player` forward by `tile_moves` tiles, transiting across each
+        tile before their destination, and returns the destination tile. It's
+        up to the caller to land the player on it.
+        """
+        start = player.tile.step
+        for tile in self.get_transit_tiles(start, tile_moves):
+            player.handle_transit_tile(tile)
+        return self.tiles[(start + tile_moves - 1) % self.total_tile_count]
+
+    def get_transit_tiles(self, step, tile_moves):
+        """
+        Returns the tiles a player moving `tile_moves` tiles on from `step`
+        passes before their destination, going around the board past GO.
+
+        Only tiles which do something when passed (e.g. GO) are returned,
+        unless their visits are being logged, so long card moves across a
+        large board cost no more than a roll of the dice.
+        """
+        tile_count = self.total_tile_count
+        if tiles.logger.isEnabledFor(logging.DEBUG):
+            return [self.tiles[(step + moves - 1) % tile_count] for moves in range(1, tile_moves)]
+        last = step + tile_moves - 1
+        steps = self.transit_steps
+        passed = steps[bisect_right(steps, step):bisect_right(steps, min(last, tile_count))]
+        if last > tile_count:
+            passed += steps[:bisect_right(steps, last - tile_count)]
+        return [self.tiles[passed_step - 1] for passed_step in passed]
+
     def handle_game_end(self, players):
         """
         """
         if not players:
-            logging.debug('There are no active players! Nobody won.')
+            logger.debug('There are no active players! Nobody won.')
         if len(players) == 1:
             player = players[0]
-            logging.debug('Hurray, %s won the game with $%d and %d properties!' %
-                          (player.nickname, player.cash, len(player.portfolio)))
+            logger.debug('Hurray, %s won the game with $%d and %d properties!',
+                         player.nickname, player.cash, len(player.portfolio))
             for tile in player.portfolio:
                 if tile.hotel:
-                    logging.debug('- %s, with a hotel on it.' % tile.name)
+                    logger.debug('- %s, with a hotel on it.', tile.name)
                 else:
-                    logging.debug('- %s, with %d houses on it.' % (tile.name, tile.houses))
+                    logger.debug('- %s, with %d houses on it.', tile.name, tile.houses)
         sys.exit(0)
 
     def setup(self):
         self.initialize_board()
         self.initialize_players()
 
+    def get_active_players(self):
+        """
+        Returns the players who are not yet bankrupt. They're only counted
+        again after a bankruptcy, or when players join.
+        """
+        key = len(self.players), self.bankruptcies
+        if self.active_players[0] != key:
+            self.active_players = key, [player for player in self.players if not player.bankrupt]
+        return list(self.active_players[1])
+
+    def count_active_players(self):
+        self.get_active_players()
+        return len(self.active_players[1])
+
+    def play_turn(self, player):
+        """
+        Plays a single turn for `player`, from jail if they're in it.
+        """
+        if player.in_jail:
+            self.handle_jail_turn(player)
+        else:
+            self.handle_play_turn(player)
+
+    def step(self):
+        """
+        Plays the next player's turn and returns True, or returns False
+        once all but one player are bankrupt.
+
+        Players are taken in rounds: the active players are decided at the
+        start of each round, and every one of them plays their turn in that
+        round, even if they become bankrupt before it comes around.
+        """
+        if self.finished:
+            return False
+        if self.round_index >= len(self.round_players):
+            active_players = self.get_active_players()
+            if len(active_players) <= 1:
+                self.finished = True
+                return False
+            self.round_players = active_players
+            self.round_index = 0
+        player = self.round_players[self.round_index]
+        self.round_index += 1
+        self.play_turn(player)
+        self.turn += 1
+        return True
+
+    def run(self, max_turns=None):
+        """
+        Plays turns at full speed until the game ends or, if given,
+        `max_turns` have been played.
+        """
+        while (max_turns is None or self.turn < max_turns) and self.step():
+            pass
+
+    def snapshot(self):
+        """
+        Returns a comparable, engine-independent picture of the game state:
+        each seat's position, cash, jail/bankruptcy status and "Get Out Of
+        Jail Free" cards, each property's owning seat, development and
+        mortgage, and the position of each deck.
+        """
+        seats = dict((player.id, seat) for seat, player in enumerate(self.players))
+        players = tuple((player.tile.step, player.cash, player.in_jail, player.jail_exit_rolls,
+                         player.bankrupt, len(player.jail_free_cards)) for player in self.players)
+        properties = tuple((seats[tile.owner.id] if tile.owner else None, tile.houses, tile.hotel, tile.mortgaged)
+                           for tile in self.tiles if isinstance(tile, PropertyTile))
+        decks = tuple((name, self.decks[name].cursor) for name in sorted(self.decks))
+        return players, properties, decks
+
     def start(self):
         """
         Responsible for starting the game, taking turns, and
         looping until all but one player are bankrupt.
         """
-        game_running = True
         try:
-            while game_running:
-                active_players = filter(lambda p: not p.bankrupt, self.players)
-                if len(active_players) > 1:
-                    for player in active_players:
-                        if player.in_jail:
-                            self.handle_jail_turn(player)
-                        else:
-                            self.handle_play_turn(player)
-                        sleep(self.turn_pause)
-                        logging.debug('-' * 70)
-                else:
-                    self.handle_game_end(active_players)
+            while self.step():
+                logger.debug('-' * 70)
+            self.handle_game_end(self.get_active_players())
         except KeyboardInterrupt:
-            print 'Game has been suspended.'
+            print('Game has been suspended.')
             sys.exit(0)
 
 
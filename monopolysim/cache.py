@@ -0,0 +1,144 @@
+import os
+import json
+import hashlib
+from importlib import import_module
+
+from .board import LOCALE_DIR, load_board_template
+from .store import game_settings
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The modules whose code decides how games are played and summarised.
+ENGINE_MODULES = ('bank', 'batch', 'board', 'cards', 'conf', 'dice', 'liquidation', 'player', 'rules', 'stats',
+                  'synthetic', 'tiles', 'trading')
+
+# Batches played through a cache are split into shards of this many games,
+# counted from the first game, so batches which overlap share shards.
+CACHE_SHARD_SIZE = 1000
+
+engine_versions = []
+
+
+def hash_files(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as fs:
+            digest.update(fs.read())
+    return digest.hexdigest()
+
+
+def engine_version():
+    """
+    A hash of the engine's code and locale files, computed once per
+    process. Any change to either gives every shard a new key.
+    """
+    if not engine_versions:
+        paths = [os.path.join(PACKAGE_DIR, module + '.py') for module in ENGINE_MODULES]
+        paths.extend(os.path.join(LOCALE_DIR, name) for name in sorted(os.listdir(LOCALE_DIR)))
+        engine_versions.append(hash_files(paths))
+    return engine_versions[0]
+
+
+def strategy_version(player_class):
+    """
+    A hash of the code of the module defining `player_class`, a
+    `module.Class` path, or None for the default player.
+    """
+    if player_class is None:
+        return None
+    path = import_module(player_class.rsplit('.', 1)[0]).__file__
+    if path.endswith(('.pyc', '.pyo')):
+        path = path[:-1]
+    return hash_files([path])
+
+
+def shard_key(task):
+    """
+    The cache key of a `batch.run_games` task: a hash of the engine
+    version, the compiled board template, the `conf` settings, the
+    strategy and the task itself, which holds the seed and game range.
+    """
+    seed, start, stop, num_players, locale, max_turns, collect_stats, estimator, player_class, timelines = task
+    key = {
+        'engine': engine_version(),
+        'template': load_board_template(locale),
+        'settings': game_settings(),
+        'strategy': [player_class, strategy_version(player_class)],
+        'task': [seed, start, stop, num_players, locale, max_turns, collect_stats, estimator],
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResultCache(object):
+    """
+    A directory of shard results (see `batch.BatchResult`), each in a file
+    named by its key (see `shard_key`) and led by a checksum of its
+    contents. Entries which fail their checksum are dropped and replayed.
+
+    Reading an entry marks it as recently used. Once the entries take more
+    than `max_bytes`, the least recently used are evicted.
+    """
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __repr__(self):
+        return '<ResultCache: %s, %d hits, %d misses>' % (self.directory, self.hits, self.misses)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """
+        Returns the cached `BatchResult` of `key`, or None.
+        """
+        from .batch import BatchResult
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as fs:
+                checksum, _, payload = fs.read().partition(b'\n')
+        except IOError:
+            self.misses += 1
+            return None
+        if hashlib.sha256(payload).hexdigest().encode('ascii') != checksum:
+            os.remove(path)
+            self.misses += 1
+            return None
+        os.utime(path, None)
+        self.hits += 1
+        return BatchResult.from_dict(json.loads(payload.decode('utf-8')))
+
+    def put(self, key, result):
+        """
+        Caches `result` under `key`, then evicts entries to fit `max_bytes`.
+        """
+        payload = json.dumps(result.to_dict()).encode('utf-8')
+        temporary = self.path(key) + '.tmp'
+        with open(temporary, 'wb') as fs:
+            fs.write(hashlib.sha256(payload).hexdigest().encode('ascii') + b'\n' + payload)
+        os.rename(temporary, self.path(key))
+        self.evict()
+
+    def entries(self):
+        """
+        Returns `(last used, size, path)` for every entry, least recent first.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                status = os.stat(os.path.join(self.directory, name))
+                entries.append((status.st_mtime, status.st_size, os.path.join(self.directory, name)))
+        return sorted(entries)
+
+    def evict(self):
+        entries = self.entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            os.remove(path)
+            size -= entry_size
@@ -0,0 +1,203 @@
+from array import array
+
+
+def shuffle(order, random):
+    """
+    Shuffles `order` in place (Fisher-Yates), drawing from `random`.
+    Unlike `random.shuffle`, the result is identical across Python versions.
+    """
+    for i in range(len(order) - 1, 0, -1):
+        j = int(random() * (i + 1))
+        order[i], order[j] = order[j], order[i]
+
+
+class Card(object):
+    """
+    Our base Card object. Cards are read from the locale's card template,
+    where `action` decides the type of card, and are shared by every game
+    using that locale.
+    """
+    def __init__(self, *args, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def __repr__(self):
+        return '<Card: %s>' % self.text
+
+    def apply(self, player, deck):
+        """
+        What happens when our Player draws this card from `deck`?
+        """
+        pass
+
+
+class AdvanceCard(Card):
+    """
+    Moves the player forward to `tile`, collecting GO on the way.
+    """
+    def apply(self, player, deck):
+        board = player.board
+        target = board.get_tile_by_name(self.tile)
+        tile_moves = (target.step - player.tile.step) % board.total_tile_count
+        player.handle_land_on_tile(board.move_player(player, tile_moves), player.dice_roll)
+
+
+class AdvanceToNearestCard(Card):
+    """
+    Moves the player forward to the nearest tile of `tile_type`, and lands
+    on it as usual, except that if it's owned by another player, its rent
+    is multiplied by `rent_multiplier`, or, for a `dice_multiplier`, is a
+    fresh throw of the dice multiplied by it.
+    """
+    rent_multiplier = 1
+    dice_multiplier = None
+
+    def apply(self, player, deck):
+        board = player.board
+        target = board.get_nearest_tile(player.tile, self.tile_type)
+        if target is None:
+            return
+        tile_moves = (target.step - player.tile.step) % board.total_tile_count
+        tile = board.move_player(player, tile_moves)
+
+        rent_price = None
+        if tile.is_owned and tile.owner is not player and not tile.mortgaged:
+            if self.dice_multiplier:
+                rent_price = (player.roll_die() + player.roll_die()) * self.dice_multiplier
+            else:
+                rent_price = tile.get_rent_cost(player.dice_roll) * self.rent_multiplier
+        player.handle_land_on_tile(tile, player.dice_roll, rent_price)
+
+
+class GoBackCard(Card):
+    """
+    Moves the player back `steps` tiles, without passing over them.
+    """
+    def apply(self, player, deck):
+        board = player.board
+        tile = board.tiles[(player.tile.step - 1 - self.steps) % board.total_tile_count]
+        player.handle_land_on_tile(tile, player.dice_roll)
+
+
+class GoToJailCard(Card):
+    """
+    Sends the player straight to jail.
+    """
+    def apply(self, player, deck):
+        player.handle_jail_entry()
+
+
+class PayCard(Card):
+    """
+    The player pays `amount` to the bank.
+    """
+    def apply(self, player, deck):
+        player.wallet.withdraw(self.amount)
+
+
+class CollectCard(Card):
+    """
+    The bank pays the player `amount`.
+    """
+    def apply(self, player, deck):
+        player.wallet.deposit(self.amount)
+
+
+class CollectFromPlayersCard(Card):
+    """
+    Every other active player pays the player `amount`.
+    """
+    def apply(self, player, deck):
+        for other in player.board.players:
+            if other is not player and not other.bankrupt:
+                player.wallet.deposit(other.wallet.withdraw(self.amount, creditor=player))
+
+
+class RepairsCard(Card):
+    """
+    The player pays `house` for every house and `hotel` for every
+    hotel they own.
+    """
+    def apply(self, player, deck):
+        cost = 0
+        for tile in player.portfolio:
+            if tile.hotel:
+                cost += self.hotel
+            else:
+                cost += tile.houses * self.house
+        if cost:
+            player.wallet.withdraw(cost)
+
+
+class GetOutOfJailFreeCard(Card):
+    """
+    The player keeps this card until they use it to leave jail, when
+    it's returned to `deck`.
+    """
+    def apply(self, player, deck):
+        deck.hold(self)
+        player.jail_free_cards.append((deck, self))
+
+
+card_map = {
+    'advance': AdvanceCard,
+    'advance_to_nearest': AdvanceToNearestCard,
+    'go_back': GoBackCard,
+    'go_to_jail': GoToJailCard,
+    'pay': PayCard,
+    'collect': CollectCard,
+    'collect_from_players': CollectFromPlayersCard,
+    'repairs': RepairsCard,
+    'get_out_of_jail_free': GetOutOfJailFreeCard
+}
+
+
+def create_cards(card_templates):
+    """
+    Constructs the cards of a single deck from its card templates.
+    """
+    return [card_map[template['action']](index=index, **template) for index, template in enumerate(card_templates)]
+
+
+class Deck(object):
+    """
+    A deck of cards, shuffled once per game.
+
+    The shuffled deck is an integer array of card indices with a cursor
+    pointing at the next card, so a draw is O(1) and allocates nothing.
+    Drawn cards go back to the bottom of the deck, except for cards which
+    are `held` by a player, which are skipped until they're released.
+    """
+    def __init__(self, name, cards, random):
+        self.name = name
+        self.cards = cards
+        self.order = array('i', range(len(cards)))
+        shuffle(self.order, random)
+        self.held = array('b', [0]) * len(cards)
+        self.held_count = 0
+        self.cursor = 0
+
+    def __repr__(self):
+        return '<Deck: %s>' % self.name
+
+    def draw(self):
+        """
+        Returns the next card, or None if every card is held.
+        """
+        if self.held_count == len(self.cards):
+            return None
+        while True:
+            index = self.order[self.cursor]
+            self.cursor += 1
+            if self.cursor == len(self.order):
+                self.cursor = 0
+            if not self.held[index]:
+                return self.cards[index]
+
+    def hold(self, card):
+        self.held[card.index] = 1
+        self.held_count += 1
+
+    def release(self, card):
+        self.held[card.index] = 0
+        self.held_count -= 1
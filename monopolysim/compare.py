@@ -0,0 +1,155 @@
+import json
+from contextlib import contextmanager
+from multiprocessing import cpu_count
+
+from . import conf
+from .batch import BatchResult, game_seed, play_game
+from .estimators import Estimate
+from .parallel import map_tasks, split_range
+
+# The per-game outcomes compared, each for the seat under study.
+METRICS = ('wins', 'turns', 'cash')
+
+
+@contextmanager
+def configured(overrides):
+    """
+    Temporarily replaces the `conf` settings named in `overrides`.
+    """
+    for name in overrides:
+        if not hasattr(conf, name):
+            raise ValueError('There is no %s setting.' % name)
+    previous = dict((name, getattr(conf, name)) for name in overrides)
+    for name, value in overrides.items():
+        setattr(conf, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(conf, name, value)
+
+
+def parse_overrides(settings):
+    """
+    Parses `NAME=VALUE` settings, reading values as JSON where possible.
+    """
+    overrides = {}
+    for setting in settings:
+        name, _, value = setting.partition('=')
+        try:
+            overrides[name] = json.loads(value)
+        except ValueError:
+            overrides[name] = value
+    return overrides
+
+
+def game_metrics(game, seat):
+    """
+    Returns the `METRICS` of a `GameResult`, for `seat`.
+    """
+    return 1 if game.winner == seat else 0, game.turns, game.cash[seat]
+
+
+class Variant(object):
+    """
+    One side of a comparison: the `conf` settings to override, and the
+    `Player` class of each seat (or None for the default players).
+    """
+    def __init__(self, name, overrides=None, player_classes=None):
+        self.name = name
+        self.overrides = overrides or {}
+        self.player_classes = player_classes
+
+    def __repr__(self):
+        return '<Variant: %s>' % self.name
+
+    def play(self, seed, num_players, locale, max_turns):
+        with configured(self.overrides):
+            return play_game(seed, num_players, locale, max_turns, player_classes=self.player_classes)
+
+
+def play_pairs(task):
+    """
+    Pool worker: plays the games with indices `[start, stop)` of a
+    comparison, once under each variant.
+    """
+    seed, start, stop, num_players, locale, max_turns, variants = task
+    results = [BatchResult() for _ in variants]
+    for index in range(start, stop):
+        for variant, result in zip(variants, results):
+            result.games.append(variant.play(game_seed(seed, index), num_players, locale, max_turns))
+    return results
+
+
+class Comparison(object):
+    """
+    The results of a paired comparison: every game was played under both
+    variants, with the same dice and card streams (common random numbers).
+    Each game's outcomes only differ by what the variants changed, so the
+    differences between them vary far less than those between independent
+    games would, and fewer games are needed to tell the variants apart.
+    """
+    def __init__(self, baseline, candidate, seat=0, baseline_result=None, candidate_result=None):
+        self.baseline = baseline
+        self.candidate = candidate
+        self.seat = seat
+        self.baseline_result = baseline_result or BatchResult()
+        self.candidate_result = candidate_result or BatchResult()
+
+    def __repr__(self):
+        return '<Comparison: %s vs %s, %d games>' % (self.baseline.name, self.candidate.name,
+                                                     len(self.baseline_result.games))
+
+    def values(self, metric):
+        """
+        Returns each game's `metric` under the baseline and the candidate.
+        """
+        index = METRICS.index(metric)
+        return ([game_metrics(game, self.seat)[index] for game in self.baseline_result.games],
+                [game_metrics(game, self.seat)[index] for game in self.candidate_result.games])
+
+    def paired(self, metric):
+        """
+        Estimates the candidate's effect on `metric` from the paired
+        differences.
+        """
+        baseline, candidate = self.values(metric)
+        return Estimate.from_values(b - a for a, b in zip(baseline, candidate))
+
+    def independent(self, metric):
+        """
+        Estimates the same effect as if the games had been independent,
+        for comparison.
+        """
+        baseline, candidate = [Estimate.from_values(values) for values in self.values(metric)]
+        return Estimate(candidate.mean - baseline.mean, baseline.variance + candidate.variance, baseline.count)
+
+    def summary(self):
+        lines = ['%s vs %s, seat %d, %d games:' % (self.candidate.name, self.baseline.name, self.seat + 1,
+                                                     len(self.baseline_result.games))]
+        for metric in METRICS:
+            paired, independent = self.paired(metric), self.independent(metric)
+            low, high = paired.interval()
+            reduction = independent.variance / paired.variance if paired.variance else float('inf')
+            lines.append('  %-6s %+10.4f  95%% CI [%+.4f, %+.4f]  variance %.1fx lower than independent games' % (
+                metric, paired.mean, low, high, reduction))
+        return '\n'.join(lines)
+
+
+def run_comparison(games, baseline, candidate, seed=0, num_players=2, locale='en-gb', max_turns=None, seat=0,
+                   workers=None, chunk_size=None, start_method=None):
+    """
+    Plays `games` games under both the `baseline` and `candidate` variants
+    across a process pool, and returns their `Comparison`.
+    """
+    workers = workers or cpu_count()
+    variants = (baseline, candidate)
+    tasks = []
+    for start, stop in split_range(0, games, workers, chunk_size):
+        tasks.append((seed, start, stop, num_players, locale, max_turns, variants))
+
+    comparison = Comparison(baseline, candidate, seat)
+    for baseline_result, candidate_result in map_tasks(play_pairs, tasks, workers, start_method):
+        comparison.baseline_result.merge(baseline_result)
+        comparison.candidate_result.merge(candidate_result)
+    return comparison
@@ -1,11 +1,8 @@
-import logging
-logging.basicConfig(format='%(message)s', filename='sim.log', level=logging.DEBUG)
-
 # How much money do players start with?
 INITIAL_PLAYER_CASH = 2500
 
-# How much time should there be between turns?
-TURN_PAUSE_DURATION = 0.25
+# How many frames per second should the game viewer draw?
+VIEWER_FRAME_RATE = 10
 
 # How much money does a player gain by passing "GO"?
 GO_TRANSIT_PAYMENT = 200
@@ -16,10 +13,26 @@ MAX_BOARD_HOTELS = 12
 # The maximum number of hotels which can exist on the board.
 MAX_BOARD_HOUSES = 32
 
+# After how many turns is a simulated game abandoned as a stalemate?
+MAX_GAME_TURNS = 1000
+
+# When valuing properties for trades, how many houses is a monopoly
+# expected to be developed to, and over how many rounds is its rent
+# expected to be collected?
+TRADE_VALUATION_HOUSES = 3
+TRADE_VALUATION_ROUNDS = 20
+
 # How many times can a player fail their jail exit roll before
 # their next roll allows them to leave?
 MAX_JAIL_FAILED_ROLLS = 3
 
+# Which house rules are played (see `rules.RULES`), e.g. ['auctions'].
+# None are by default.
+HOUSE_RULES = []
+
+# What's the lowest bid at an auction, under the 'auctions' house rule?
+AUCTION_OPENING_BID = 10
+
 # Our default player names.
 DEFAULT_PLAYER_NAMES = [
     'Oliver',
@@ -47,6 +60,10 @@ DEFAULT_PLAYER_NAMES = [
 # The actions that are available to players.
 PLAYER_JAIL_PAY = 'pay'
 PLAYER_JAIL_WAIT = 'wait'
+PLAYER_JAIL_CARD = 'card'
 PLAYER_BUILD_PROPERTY = 'build'
 PLAYER_PURCHASE_PROPERTY = 'purchase'
+PLAYER_UNMORTGAGE_PROPERTY = 'unmortgage'
+PLAYER_ACCEPT_TRADE = 'accept'
+PLAYER_DECLINE_TRADE = 'decline'
 
@@ -0,0 +1,47 @@
+from random import Random
+
+# Each game draws from independent random streams, all derived from the game's seed.
+DICE_STREAM = 0
+CARD_STREAM = 1
+
+
+def stream_seed(seed, stream):
+    """
+    Returns the seed of one of a game's random streams.
+    """
+    if seed is None:
+        return None
+    return (seed << 8) | stream
+
+
+class DiceStream(object):
+    """
+    A seeded stream of die rolls.
+
+    Every die roll in a game is drawn from the board's `DiceStream`, so two
+    engines constructed with the same `seed` see exactly the same sequence
+    of rolls. Rolls are derived from `Random.random()` rather than `randint`
+    as its output is identical across Python versions.
+
+    An `antithetic` stream mirrors every roll of the stream with the same
+    seed: where one rolls `n`, the other rolls `sides + 1 - n`.
+    """
+    def __init__(self, seed=None, sides=6, antithetic=False):
+        self.seed = seed
+        self.sides = sides
+        self.antithetic = antithetic
+        self.random = Random(stream_seed(seed, DICE_STREAM)).random
+        if antithetic:
+            self.roll_die = self.roll_mirrored_die
+
+    def __repr__(self):
+        return '<DiceStream: seed %r>' % self.seed
+
+    def roll_die(self):
+        return int(self.random() * self.sides) + 1
+
+    def roll_mirrored_die(self):
+        return self.sides - int(self.random() * self.sides)
+
+    def roll(self):
+        return self.roll_die(), self.roll_die()
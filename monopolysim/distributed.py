@@ -0,0 +1,255 @@
+import json
+import time
+import socket
+import struct
+import logging
+import threading
+from collections import deque
+from multiprocessing import cpu_count
+
+try:
+    from socketserver import ThreadingTCPServer, BaseRequestHandler
+except ImportError:
+    from SocketServer import ThreadingTCPServer, BaseRequestHandler
+
+from .batch import BatchResult, batch_tasks, run_games
+from .parallel import preload
+
+logger = logging.getLogger(__name__)
+
+# The port coordinators listen on unless told otherwise.
+DEFAULT_PORT = 7654
+
+# Messages are JSON objects, each prefixed with its length.
+HEADER = struct.Struct('>I')
+
+# Unless a coordinator is given a `lease_timeout`, a shard is re-issued
+# once it's been out LEASE_TIMEOUT_FACTOR times as long as the slowest
+# shard returned so far took, and at least MIN_LEASE_TIMEOUT seconds, or
+# INITIAL_LEASE_TIMEOUT seconds before any shard has been returned.
+LEASE_TIMEOUT_FACTOR = 4
+MIN_LEASE_TIMEOUT = 30.0
+INITIAL_LEASE_TIMEOUT = 600.0
+
+
+def send_message(sock, message):
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def receive_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def receive_message(sock):
+    """
+    Returns the next message from `sock`, or None once it's closed.
+    """
+    header = receive_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    data = receive_exactly(sock, HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return json.loads(data.decode('utf-8'))
+
+
+class Coordinator(object):
+    """
+    Hands out a batch's shards (`run_games` tasks) to workers, and collects
+    their results.
+
+    A shard is leased to one worker at a time. It's put back in the queue
+    if its worker disconnects, or hasn't returned it within `lease_timeout`
+    seconds (by default, sized from how long shards take; see
+    `LEASE_TIMEOUT_FACTOR`), so a worker host which is lost without closing
+    its connections doesn't stall the batch. The first result to come back
+    for a shard is kept. Every
+    shard's games are decided by its seeds alone, so it doesn't matter
+    which worker played it, and merging the results in shard order gives
+    exactly what a single machine would have.
+    """
+    def __init__(self, tasks, lease_timeout=None):
+        self.tasks = tasks
+        self.lease_timeout = lease_timeout
+        self.results = [None] * len(tasks)
+        self.remaining = len(tasks)
+        self.pending = deque(range(len(tasks)))
+        self.leases = {}
+        self.slowest = None
+        self.condition = threading.Condition()
+
+    def __repr__(self):
+        return '<Coordinator: %d of %d shards left>' % (self.remaining, len(self.tasks))
+
+    def lease(self):
+        """
+        Returns the next shard to play, None if every remaining shard is
+        leased, or -1 once every shard has been played.
+        """
+        with self.condition:
+            if not self.remaining:
+                return -1
+            now = time.time()
+            timeout = self.current_lease_timeout()
+            for shard, leased_at in sorted(self.leases.items()):
+                if now - leased_at > timeout:
+                    logger.debug('Shard %d timed out, re-issuing it.', shard)
+                    self.release(shard)
+            if not self.pending:
+                return None
+            shard = self.pending.popleft()
+            self.leases[shard] = time.time()
+            return shard
+
+    def current_lease_timeout(self):
+        """
+        How many seconds a shard may be out before it's re-issued.
+        """
+        if self.lease_timeout is not None:
+            return self.lease_timeout
+        if self.slowest is None:
+            return INITIAL_LEASE_TIMEOUT
+        return max(MIN_LEASE_TIMEOUT, LEASE_TIMEOUT_FACTOR * self.slowest)
+
+    def release(self, shard):
+        """
+        Puts a leased shard back at the front of the queue.
+        """
+        with self.condition:
+            if self.leases.pop(shard, None) is not None and self.results[shard] is None:
+                self.pending.appendleft(shard)
+
+    def complete(self, shard, result):
+        with self.condition:
+            leased_at = self.leases.pop(shard, None)
+            if leased_at is not None:
+                self.slowest = max(self.slowest or 0.0, time.time() - leased_at)
+            if self.results[shard] is None:
+                self.results[shard] = result
+                self.remaining -= 1
+                if shard in self.pending:
+                    self.pending.remove(shard)
+                if not self.remaining:
+                    self.condition.notify_all()
+
+    def wait(self, timeout=None):
+        """
+        Blocks until every shard has been played, and returns the merged
+        `BatchResult`.
+        """
+        with self.condition:
+            while self.remaining:
+                self.condition.wait(timeout)
+        result = BatchResult()
+        for partial in self.results:
+            result.merge(BatchResult.from_dict(partial))
+        return result
+
+
+class CoordinatorHandler(BaseRequestHandler):
+    """
+    Serves a single worker's connection, for as long as it stays open.
+    """
+    def handle(self):
+        coordinator = self.server.coordinator
+        leased = set()
+        try:
+            while True:
+                message = receive_message(self.request)
+                if message is None:
+                    break
+                if message['type'] == 'lease':
+                    shard = coordinator.lease()
+                    if shard is None:
+                        send_message(self.request, {'type': 'wait'})
+                    elif shard < 0:
+                        send_message(self.request, {'type': 'done'})
+                    else:
+                        leased.add(shard)
+                        send_message(self.request, {'type': 'task', 'shard': shard,
+                                                    'task': coordinator.tasks[shard]})
+                elif message['type'] == 'result':
+                    leased.discard(message['shard'])
+                    coordinator.complete(message['shard'], message['result'])
+        except socket.error as e:
+            logger.debug('Lost a worker: %s', e)
+        finally:
+            for shard in leased:
+                coordinator.release(shard)
+
+
+def start_coordinator(coordinator, address=('', DEFAULT_PORT)):
+    """
+    Serves `coordinator` on `address` from a background thread, and
+    returns the server, whose `server_address` is the address bound.
+    """
+    ThreadingTCPServer.allow_reuse_address = True
+    server = ThreadingTCPServer(address, CoordinatorHandler)
+    server.daemon_threads = True
+    server.coordinator = coordinator
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def run_coordinator(games, seed=0, num_players=2, locale='en-gb', max_turns=None, workers=None,
+                    collect_stats=False, chunk_size=None, address=('', DEFAULT_PORT), lease_timeout=None):
+    """
+    Splits a batch into shards, enough to keep `workers` worker processes
+    busy across every host, serves them on `address` until they've all
+    been played and returns the merged `BatchResult`, which is identical
+    to `run_batch`'s for the same master `seed`.
+    """
+    tasks = batch_tasks(games, seed, num_players, locale, max_turns, workers or cpu_count(), collect_stats,
+                        chunk_size)
+    coordinator = Coordinator(tasks, lease_timeout)
+    server = start_coordinator(coordinator, address)
+    try:
+        return coordinator.wait(1.0)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_worker(address, poll_interval=1.0, connect_timeout=30.0):
+    """
+    Plays shards leased from the coordinator at `address` until there are
+    none left, and returns how many it played.
+    """
+    deadline = time.time() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection(address)
+            break
+        except socket.error:
+            if time.time() > deadline:
+                raise
+            time.sleep(poll_interval)
+
+    played = 0
+    try:
+        while True:
+            send_message(sock, {'type': 'lease'})
+            message = receive_message(sock)
+            if message is None or message['type'] == 'done':
+                return played
+            if message['type'] == 'wait':
+                time.sleep(poll_interval)
+                continue
+            task = message['task']
+            if not played:
+                preload((task[4],))
+            result = run_games(tuple(task))
+            send_message(sock, {'type': 'result', 'shard': message['shard'], 'result': result.to_dict()})
+            played += 1
+    finally:
+        sock.close()
@@ -0,0 +1,130 @@
+from math import sqrt
+
+# The number of standard errors either side of a mean which cover 95%.
+Z_95 = 1.959964
+
+
+class Estimate(object):
+    """
+    An estimate of a mean from `count` observations, which vary by
+    `variance` (i.e. the variance of a single observation).
+    """
+    def __init__(self, mean, variance, count):
+        self.mean = mean
+        self.variance = variance
+        self.count = count
+
+    def __repr__(self):
+        return '<Estimate: %.4f +/- %.4f>' % (self.mean, Z_95 * self.stderr)
+
+    @classmethod
+    def from_values(cls, values):
+        values = list(values)
+        count = len(values)
+        if not count:
+            return cls(0.0, 0.0, 0)
+        mean = float(sum(values)) / count
+        variance = sum((value - mean) ** 2 for value in values) / (count - 1) if count > 1 else 0.0
+        return cls(mean, variance, count)
+
+    @property
+    def stderr(self):
+        if not self.count:
+            return 0.0
+        return sqrt(self.variance / self.count)
+
+    def interval(self, z=Z_95):
+        """
+        The confidence interval of the mean, 95% by default.
+        """
+        return self.mean - z * self.stderr, self.mean + z * self.stderr
+
+
+def solve(matrix, vector):
+    """
+    Solves `matrix * x = vector` by Gaussian elimination with partial
+    pivoting. Returns None if `matrix` is singular.
+    """
+    size = len(vector)
+    rows = [list(map(float, row)) + [float(value)] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            return None
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(column + 1, size):
+            factor = rows[row][column] / rows[column][column]
+            for index in range(column, size + 1):
+                rows[row][index] -= factor * rows[column][index]
+    solution = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        total = rows[row][size] - sum(rows[row][index] * solution[index] for index in range(row + 1, size))
+        solution[row] = total / rows[row][row]
+    return solution
+
+
+def plain(values):
+    """
+    The sample mean.
+    """
+    return Estimate.from_values(values)
+
+
+def antithetic(values):
+    """
+    The mean of antithetic pairs: `values` alternate between a game and
+    the game played with its mirrored dice. Each pair's average is an
+    observation, and varies less than a single game if the pair's games
+    are negatively correlated.
+    """
+    pairs = [(a + b) / 2.0 for a, b in zip(values[0::2], values[1::2])]
+    return Estimate.from_values(pairs)
+
+
+def control_variate(values, controls):
+    """
+    The mean of `values`, less the part explained by `controls`: each
+    value's quantities whose expectation is known to be zero. The
+    coefficients are fitted by least squares, and the estimate's variance
+    is that of the residuals.
+    """
+    count = len(values)
+    if count < 2 or not controls or not controls[0]:
+        return Estimate.from_values(values)
+    width = len(controls[0])
+    value_mean = float(sum(values)) / count
+    control_means = [float(sum(control[index] for control in controls)) / count for index in range(width)]
+    centred = [[control[index] - control_means[index] for index in range(width)] for control in controls]
+    covariance = [[sum(row[i] * row[j] for row in centred) for j in range(width)] for i in range(width)]
+    cross = [sum(row[i] * (value - value_mean) for row, value in zip(centred, values)) for i in range(width)]
+    coefficients = solve(covariance, cross)
+    if coefficients is None:
+        return Estimate.from_values(values)
+    adjusted = [value - sum(b * c for b, c in zip(coefficients, control)) for value, control in zip(values, controls)]
+    residuals = Estimate.from_values(adjusted)
+    # One degree of freedom is lost to each fitted coefficient.
+    residuals.variance *= float(count - 1) / max(count - 1 - width, 1)
+    return residuals
+
+
+def stratified(values, strata):
+    """
+    The mean of `values`, each observed in one of `strata`, weighting each
+    stratum by its share of the observations. Differences between the
+    strata no longer add to the estimate's variance.
+    """
+    groups = {}
+    for value, stratum in zip(values, strata):
+        groups.setdefault(stratum, []).append(value)
+    count = len(values)
+    mean, variance_of_mean = 0.0, 0.0
+    for stratum in sorted(groups):
+        estimate = Estimate.from_values(groups[stratum])
+        weight = float(estimate.count) / count
+        mean += weight * estimate.mean
+        variance_of_mean += weight ** 2 * estimate.stderr ** 2
+    return Estimate(mean, variance_of_mean * count, count)
+
+
+# The estimators a batch can be studied with, by name.
+ESTIMATORS = ('plain', 'antithetic', 'control', 'stratified')
@@ -0,0 +1,206 @@
+from collections import namedtuple
+
+# The events a game can be observed through. Each is passed to its
+# subscribers as a named tuple of these fields. A `RentPaid` event's price
+# is what the owner received, which is less than the rent when the player
+# went bankrupt.
+TurnStarted = namedtuple('TurnStarted', 'board player turn')
+DiceRolled = namedtuple('DiceRolled', 'board player dice_roll')
+TileLanded = namedtuple('TileLanded', 'board player tile dice_roll')
+RentPaid = namedtuple('RentPaid', 'board player tile owner price')
+PropertyPurchased = namedtuple('PropertyPurchased', 'board player tile price')
+PropertyUpgraded = namedtuple('PropertyUpgraded', 'board player tile development')
+JailEntered = namedtuple('JailEntered', 'board player')
+JailExited = namedtuple('JailExited', 'board player')
+PlayerBankrupt = namedtuple('PlayerBankrupt', 'board player creditor')
+GameEnded = namedtuple('GameEnded', 'board winner turns')
+
+
+def notify(callbacks, event):
+    for callback in callbacks:
+        callback(event)
+
+
+def bind_turn_started(board, callbacks):
+    play_turn = board.play_turn
+
+    def hooked_play_turn(player):
+        notify(callbacks, TurnStarted(board, player, board.turn))
+        return play_turn(player)
+
+    board.play_turn = hooked_play_turn
+
+
+def bind_game_ended(board, callbacks):
+    step = board.step
+    ended = []
+
+    def hooked_step():
+        running = step()
+        if not running and board.finished and not ended:
+            ended.append(True)
+            active_players = board.get_active_players()
+            winner = active_players[0] if len(active_players) == 1 else None
+            notify(callbacks, GameEnded(board, winner, board.turn))
+        return running
+
+    board.step = hooked_step
+
+
+def bind_dice_rolled(board, player, callbacks):
+    roll_dice = player._roll_dice
+
+    def hooked_roll_dice():
+        dice_roll = roll_dice()
+        notify(callbacks, DiceRolled(board, player, dice_roll))
+        return dice_roll
+
+    player._roll_dice = hooked_roll_dice
+
+
+def bind_tile_landed(board, player, callbacks):
+    handle_land_on_tile = player.handle_land_on_tile
+
+    def hooked_handle_land_on_tile(tile, dice_roll, rent_price=None):
+        notify(callbacks, TileLanded(board, player, tile, dice_roll))
+        return handle_land_on_tile(tile, dice_roll, rent_price)
+
+    player.handle_land_on_tile = hooked_handle_land_on_tile
+
+
+def bind_rent_paid(board, player, callbacks):
+    pay_rent = player.pay_rent
+
+    def hooked_pay_rent(tile, price):
+        owner = tile.owner
+        paid = pay_rent(tile, price)
+        notify(callbacks, RentPaid(board, player, tile, owner, paid))
+        return paid
+
+    player.pay_rent = hooked_pay_rent
+
+
+def bind_property_purchased(board, player, callbacks):
+    purchase_property = player.purchase_property
+
+    def hooked_purchase_property(tile, price=None):
+        result = purchase_property(tile, price)
+        notify(callbacks, PropertyPurchased(board, player, tile, tile.prices['purchase'] if price is None else price))
+        return result
+
+    player.purchase_property = hooked_purchase_property
+
+
+def bind_property_upgraded(board, player, callbacks):
+    upgrade_property = player.upgrade_property
+
+    def hooked_upgrade_property(tile):
+        result = upgrade_property(tile)
+        notify(callbacks, PropertyUpgraded(board, player, tile, tile.development))
+        return result
+
+    player.upgrade_property = hooked_upgrade_property
+
+
+def bind_jail_entered(board, player, callbacks):
+    handle_jail_entry = player.handle_jail_entry
+
+    def hooked_handle_jail_entry():
+        result = handle_jail_entry()
+        notify(callbacks, JailEntered(board, player))
+        return result
+
+    player.handle_jail_entry = hooked_handle_jail_entry
+
+
+def bind_jail_exited(board, player, callbacks):
+    handle_jail_exit = player.handle_jail_exit
+
+    def hooked_handle_jail_exit():
+        result = handle_jail_exit()
+        notify(callbacks, JailExited(board, player))
+        return result
+
+    player.handle_jail_exit = hooked_handle_jail_exit
+
+
+def bind_player_bankrupt(board, player, callbacks):
+    declare_bankruptcy = player.declare_bankruptcy
+
+    def hooked_declare_bankruptcy(creditor=None):
+        result = declare_bankruptcy(creditor)
+        notify(callbacks, PlayerBankrupt(board, player, creditor))
+        return result
+
+    player.declare_bankruptcy = hooked_declare_bankruptcy
+
+
+# How each event is hooked into a board, or into each of its players.
+BOARD_BINDERS = (
+    (TurnStarted, bind_turn_started),
+    (GameEnded, bind_game_ended),
+)
+PLAYER_BINDERS = (
+    (DiceRolled, bind_dice_rolled),
+    (TileLanded, bind_tile_landed),
+    (RentPaid, bind_rent_paid),
+    (PropertyPurchased, bind_property_purchased),
+    (PropertyUpgraded, bind_property_upgraded),
+    (JailEntered, bind_jail_entered),
+    (JailExited, bind_jail_exited),
+    (PlayerBankrupt, bind_player_bankrupt),
+)
+EVENTS = tuple(event for event, _ in BOARD_BINDERS + PLAYER_BINDERS)
+
+
+class Hooks(object):
+    """
+    Subscribers to a game's events, for analytics plugins:
+
+        hooks = Hooks()
+
+        @hooks.on(RentPaid)
+        def count_rent(event):
+            rent[event.tile.step - 1] += event.price
+
+        hooks.bind(board)
+
+    Like `TileStats`, `bind` wraps the methods of that game's board and
+    players which raise the subscribed events, once, at setup. Events
+    nobody subscribed to by then aren't hooked, and cost nothing.
+    """
+    def __init__(self):
+        self.subscribers = {}
+
+    def __repr__(self):
+        return '<Hooks: %s>' % ', '.join(sorted(event.__name__ for event in self.subscribers))
+
+    def subscribe(self, event, callback):
+        """
+        Calls `callback` with every `event` in the games bound after this.
+        """
+        if event not in EVENTS:
+            raise ValueError('%r is not an event.' % (event,))
+        self.subscribers.setdefault(event, []).append(callback)
+        return callback
+
+    def on(self, event):
+        """
+        Decorator form of `subscribe`.
+        """
+        def decorator(callback):
+            return self.subscribe(event, callback)
+        return decorator
+
+    def bind(self, board):
+        """
+        Starts raising the subscribed events in `board`'s game, which must
+        already be set up.
+        """
+        for event, binder in BOARD_BINDERS:
+            if event in self.subscribers:
+                binder(board, self.subscribers[event])
+        for player in board.players:
+            for event, binder in PLAYER_BINDERS:
+                if event in self.subscribers:
+                    binder(board, player, self.subscribers[event])
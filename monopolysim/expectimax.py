@@ -0,0 +1,587 @@
+from collections import namedtuple
+from fractions import Fraction
+
+from . import conf
+from .cards import (AdvanceCard, AdvanceToNearestCard, CollectCard, CollectFromPlayersCard, GetOutOfJailFreeCard,
+                    GoBackCard, GoToJailCard, PayCard, RepairsCard)
+from .rules import AUCTIONS, FREE_PARKING_JACKPOT
+from .tiles import CardTile, PropertyTile
+
+# Every throw of two dice, each as likely as the others.
+DICE = tuple((die1, die2) for die1 in range(1, 7) for die2 in range(1, 7))
+
+
+def group_throws():
+    """
+    Throws with the same total, which are both doubles or both not, play
+    alike. Returns a `(dice roll, ways)` for each group: one of its throws,
+    and how many there are.
+    """
+    groups = {}
+    for die1, die2 in DICE:
+        key = die1 + die2, die1 == die2
+        dice_roll, ways = groups.get(key, ((die1, die2), 0))
+        groups[key] = dice_roll, ways + 1
+    return tuple(groups[key] for key in sorted(groups))
+
+
+THROWS = group_throws()
+
+# Doubles end a turn in jail after at most five throws, but a player who
+# was sent to jail by the tile or card they moved to is let roll on by
+# `Board.handle_play_turn` for as long as they throw doubles. Those turns
+# are cut short after this many throws in jail, in outcomes with no state.
+MAX_JAILED_THROWS = 4
+
+# The fine for leaving jail, as in `Board.handle_jail_turn`.
+JAIL_FINE = 50
+
+# The house rules whose state isn't tracked: the jackpot, and who buys at auction.
+UNSUPPORTED_RULES = (FREE_PARKING_JACKPOT, AUCTIONS)
+
+# The compact state of the player under study, which is all that decides
+# their future cash swings while everything else on the board stands
+# still: their position, jail status, the rolls since their dice history
+# was last checked for three doubles (and how many were doubles), the
+# "Get Out Of Jail Free" cards they hold, as `(deck, card index)`, and
+# each deck's `(cursor, held cards)`.
+State = namedtuple('State', 'step in_jail jail_exit_rolls rolls doubles jail_cards decks')
+
+powers = [1]
+
+
+def power(throws):
+    """
+    The number of ways `throws` throws of the dice can fall, `36 ** throws`.
+    """
+    while len(powers) <= throws:
+        powers.append(powers[-1] * len(DICE))
+    return powers[throws]
+
+
+class Distribution(object):
+    """
+    The outcomes of part of a turn, or of turns: how many of the
+    `36 ** throws` ways the dice can fall lead to each `(cash swing,
+    state)`. Counting ways, rather than summing fractions, keeps the
+    probabilities exact with integer arithmetic. Outcomes which were cut
+    short have no state (see `MAX_JAILED_THROWS`).
+    """
+    __slots__ = ('throws', 'ways')
+
+    def __init__(self, throws=0, ways=None):
+        self.throws = throws
+        self.ways = {} if ways is None else ways
+
+    def __repr__(self):
+        return '<Distribution: %d outcomes over %d throws>' % (len(self.ways), self.throws)
+
+    @classmethod
+    def certain(cls, cash, state):
+        return cls(0, {(cash, state): 1})
+
+    @classmethod
+    def throw(cls, branches):
+        """
+        The outcomes of a throw of the dice, from `branches`: for each of
+        `THROWS`, its number of ways, and the cash it adds to the outcomes
+        which follow it.
+        """
+        throws = max(branch.throws for _, _, branch in branches)
+        outcomes = cls(throws + 1)
+        ways = outcomes.ways
+        for branch_ways, cash, branch in branches:
+            scale = branch_ways * power(throws - branch.throws)
+            for (delta, state), count in branch.ways.items():
+                key = delta + cash, state
+                ways[key] = ways.get(key, 0) + scale * count
+        return outcomes
+
+    def shift(self, cash):
+        """
+        Adds `cash` to every outcome's cash swing.
+        """
+        if not cash:
+            return self
+        return Distribution(self.throws, dict(((delta + cash, state), count)
+                                              for (delta, state), count in self.ways.items()))
+
+    def chain(self, function):
+        """
+        Follows every outcome with the outcomes of `function(state)`, adding
+        up the cash swings and the throws of the dice. Outcomes which were
+        cut short stay as they are.
+        """
+        following = []
+        for (delta, state), count in self.ways.items():
+            following.append((delta, count, self.certain(0, None) if state is None else function(state)))
+        throws = max(outcomes.throws for _, _, outcomes in following)
+        chained = Distribution(self.throws + throws)
+        ways = chained.ways
+        for delta, count, outcomes in following:
+            scale = count * power(throws - outcomes.throws)
+            for (next_delta, next_state), next_count in outcomes.ways.items():
+                key = delta + next_delta, next_state
+                ways[key] = ways.get(key, 0) + scale * next_count
+        return chained
+
+    def certain_outcome(self):
+        """
+        Returns the `(cash swing, state)` of the only outcome, if it's
+        certain, or None.
+        """
+        if not self.throws and len(self.ways) == 1:
+            return next(iter(self.ways))
+        return None
+
+    def map(self, function):
+        """
+        Replaces every outcome's state with `function(state)`, merging
+        outcomes which end up alike.
+        """
+        ways = {}
+        for (delta, state), count in self.ways.items():
+            key = (0, None) if state is None else (delta, function(state))
+            ways[key] = ways.get(key, 0) + count
+        return Distribution(self.throws, ways)
+
+    def summarize(self):
+        """
+        Returns `{state: (ways, cash)}`, where `cash` is the sum of the cash
+        swings over all the ways.
+        """
+        summary = {}
+        for (delta, state), count in self.ways.items():
+            ways, cash = summary.get(state, (0, 0))
+            summary[state] = ways + count, cash + delta * count
+        return summary
+
+
+class Expectation(object):
+    """
+    Like a `Distribution`, but only keeps how many ways lead to each
+    state, and the sum of their cash swings, which is enough for the
+    expected cash swing. Outcomes with different cash swings merge, so
+    there are far fewer.
+    """
+    __slots__ = ('throws', 'ways', 'cash')
+
+    def __init__(self, throws=0, ways=None, cash=None):
+        self.throws = throws
+        self.ways = {} if ways is None else ways
+        self.cash = {} if cash is None else cash
+
+    def __repr__(self):
+        return '<Expectation: %d outcomes over %d throws>' % (len(self.ways), self.throws)
+
+    @classmethod
+    def certain(cls, cash, state):
+        return cls(0, {state: 1}, {state: cash})
+
+    @classmethod
+    def throw(cls, branches):
+        throws = max(branch.throws for _, _, branch in branches)
+        outcomes = cls(throws + 1)
+        ways, cash = outcomes.ways, outcomes.cash
+        for branch_ways, branch_cash, branch in branches:
+            scale = branch_ways * power(throws - branch.throws)
+            for state, count in branch.ways.items():
+                ways[state] = ways.get(state, 0) + scale * count
+                cash[state] = cash.get(state, 0) + scale * (branch.cash[state] + branch_cash * count)
+        return outcomes
+
+    def shift(self, cash):
+        if not cash:
+            return self
+        return Expectation(self.throws, self.ways, dict((state, self.cash[state] + cash * count)
+                                                        for state, count in self.ways.items()))
+
+    def chain(self, function):
+        following = []
+        for state, count in self.ways.items():
+            following.append((count, self.cash[state], self.certain(0, None) if state is None else function(state)))
+        throws = max(outcomes.throws for _, _, outcomes in following)
+        chained = Expectation(self.throws + throws)
+        ways, cash = chained.ways, chained.cash
+        for count, count_cash, outcomes in following:
+            scale = power(throws - outcomes.throws)
+            for next_state, next_count in outcomes.ways.items():
+                ways[next_state] = ways.get(next_state, 0) + scale * count * next_count
+                cash[next_state] = cash.get(next_state, 0) + scale * (count_cash * next_count +
+                                                                      count * outcomes.cash[next_state])
+        return chained
+
+    def certain_outcome(self):
+        if not self.throws and len(self.ways) == 1:
+            state = next(iter(self.ways))
+            return self.cash[state], state
+        return None
+
+    def map(self, function):
+        ways, cash = {}, {}
+        for state, count in self.ways.items():
+            key = None if state is None else function(state)
+            ways[key] = ways.get(key, 0) + count
+            cash[key] = cash.get(key, 0) + self.cash[state]
+        return Expectation(self.throws, ways, cash)
+
+    def summarize(self):
+        return dict((state, (count, self.cash[state])) for state, count in self.ways.items())
+
+
+class Probe(object):
+    """
+    Stands in for the player under study when a tile's own code is run,
+    adding up what they're paid and charged instead of moving any cash,
+    and noting if they're sent to jail.
+    """
+    def __init__(self, player):
+        self.board = player.board
+        self.nickname = player.nickname
+        self.wallet = self
+        self.cash = 0
+        self.jailed = False
+
+    def deposit(self, amount):
+        self.cash += amount
+
+    def withdraw(self, amount, creditor=None):
+        self.cash -= amount
+        return amount
+
+    def pay_rent(self, tile, price):
+        self.cash -= price
+        return price
+
+    def handle_jail_entry(self):
+        self.jailed = True
+
+
+class Evaluation(object):
+    """
+    The exact outcomes of a player's next `turns` turns, a `Distribution`
+    or an `Expectation` of whether the player ends up in jail. The
+    probability that a turn was cut short (see `MAX_JAILED_THROWS`) is
+    `truncated`, and those outcomes are left out of everything else.
+    Probabilities are `Fraction`s.
+    """
+    def __init__(self, turns, outcomes):
+        self.turns = turns
+        self.outcomes = outcomes
+        self.total = power(outcomes.throws)
+        self.summary = outcomes.summarize()
+
+    def __repr__(self):
+        return '<Evaluation: %d turns, expected cash swing %.2f>' % (self.turns, float(self.expected_cash))
+
+    def probability(self, ways):
+        return Fraction(ways, self.total)
+
+    @property
+    def truncated(self):
+        return self.probability(self.summary.get(None, (0, 0))[0])
+
+    @property
+    def expected_cash(self):
+        return self.probability(sum(cash for in_jail, (_, cash) in self.summary.items() if in_jail is not None))
+
+    @property
+    def jail_probability(self):
+        return self.probability(self.summary.get(True, (0, 0))[0])
+
+    def cash_distribution(self):
+        """
+        Returns `{cash swing: probability}`.
+        """
+        if not isinstance(self.outcomes, Distribution):
+            raise ValueError('Only the expected cash swing was evaluated.')
+        ways = {}
+        for (delta, in_jail), count in self.outcomes.ways.items():
+            if in_jail is not None:
+                ways[delta] = ways.get(delta, 0) + count
+        return dict((delta, self.probability(count)) for delta, count in ways.items())
+
+
+class ExactEvaluator(object):
+    """
+    Enumerates every throw of the dice over a `player`'s next turns, and
+    returns the exact distribution of their cash swing (see `evaluate`),
+    or only its expectation if `distribution` is false. Distributions
+    spread out quickly on a developed board, so over three turns they can
+    take minutes where the expectation takes seconds.
+
+    Turns follow `Board.play_turn`, throw for throw: rolling again on
+    doubles, three doubles in the player's dice history sending them to
+    jail, and jail turns as the default `Player` plays them (using a
+    "Get Out Of Jail Free" card if they hold one, or waiting). Tiles run
+    their own code, with a `Probe` in place of the player, so rent is
+    `PropertyTile.get_rent_cost`, charged by the tile, and GO, taxes and
+    "Go To Jail" pay and jail as they do in a game. Cards are drawn in the
+    order of the board's shuffled decks.
+
+    Everything but the player stands still: they buy, build, mortgage and
+    trade nothing, nobody else moves, and nobody goes bankrupt. Under those
+    assumptions, the future depends only on the player's compact `State`,
+    so the outcomes of a turn, and of the rest of a turn after each throw,
+    are memoized by it: transpositions (the same state reached by
+    different throws) are evaluated once.
+    """
+    def __init__(self, board, player, distribution=True):
+        unsupported = [rule for rule in UNSUPPORTED_RULES if rule in board.rules]
+        if unsupported:
+            raise ValueError('Exact evaluation does not support the %s house rules.' % ', '.join(unsupported))
+        self.board = board
+        self.player = player
+        self.outcomes = Distribution if distribution else Expectation
+        self.jail_step = board.get_tile_by_name('Jail').step
+        self.deck_names = sorted(board.decks)
+        self.deck_indices = dict((name, index) for index, name in enumerate(self.deck_names))
+        self.decks = [board.decks[name] for name in self.deck_names]
+        self.other_players = sum(1 for other in board.players if other is not player and not other.bankrupt)
+        self.card_handlers = {
+            AdvanceCard: self.advance,
+            AdvanceToNearestCard: self.advance_to_nearest,
+            GoBackCard: self.go_back,
+            GoToJailCard: self.go_to_jail,
+            PayCard: self.pay,
+            CollectCard: self.collect,
+            CollectFromPlayersCard: self.collect_from_players,
+            RepairsCard: self.repairs,
+            GetOutOfJailFreeCard: self.keep_jail_free_card,
+        }
+        # Memoized outcomes of a turn, by state and whether it's the last,
+        # and of the rest of a turn before a throw of the dice, also by
+        # the throws in jail so far.
+        self.turn_outcomes = {}
+        self.play_outcomes = {}
+
+    def __repr__(self):
+        return '<ExactEvaluator: %s>' % self.player.nickname
+
+    def initial_state(self):
+        player = self.player
+        history = player.dice_roll_history
+        return State(
+            player.tile.step, player.in_jail, player.jail_exit_rolls, len(history),
+            sum(1 for die1, die2 in history if die1 == die2),
+            tuple((self.deck_indices[deck.name], card.index) for deck, card in player.jail_free_cards),
+            tuple((deck.cursor, tuple(deck.held)) for deck in self.decks))
+
+    def evaluate(self, turns=3):
+        """
+        Returns the `Evaluation` of the player's next `turns` turns,
+        followed forwards from the player's current state.
+        """
+        outcomes = self.outcomes.certain(0, self.initial_state())
+        for turn in range(turns):
+            last = turn == turns - 1
+            outcomes = outcomes.chain(lambda state: self.turn(state, last))
+        return Evaluation(turns, self.end(outcomes, not turns))
+
+    def end(self, outcomes, last):
+        """
+        The outcomes at the end of a turn. At the end of the `last` turn,
+        only whether the player is in jail is kept of their state, which
+        merges the outcomes of the last turn into far fewer.
+        """
+        if not last:
+            return outcomes
+        return outcomes.map(lambda state: state.in_jail)
+
+    def turn(self, state, last=False):
+        """
+        The outcomes of a turn, as in `Board.play_turn`.
+        """
+        key = state, last
+        if key not in self.turn_outcomes:
+            self.turn_outcomes[key] = self.jail_turn(state, last) if state.in_jail else self.play(state, 0, last)
+        return self.turn_outcomes[key]
+
+    def jail_turn(self, state, last):
+        """
+        The outcomes of a turn in jail, as in `Board.handle_jail_turn`.
+        """
+        if state.jail_cards:
+            deck_index, card_index = state.jail_cards[-1]
+            state = self.set_held(state, deck_index, card_index, 0)._replace(jail_cards=state.jail_cards[:-1])
+            return self.end(self.outcomes.certain(0, self.leave_jail(state)), last)
+        if state.jail_exit_rolls == conf.MAX_JAIL_FAILED_ROLLS:
+            return self.play(self.leave_jail(state), 0, last).shift(-JAIL_FINE)
+        branches = []
+        for dice_roll, ways in THROWS:
+            rolled, _ = self.roll(state, dice_roll)
+            if dice_roll[0] == dice_roll[1]:
+                branches.append((ways,) + self.after_throw(self.leave_jail(rolled), dice_roll, 0, last))
+            else:
+                stayed = self.outcomes.certain(0, rolled._replace(jail_exit_rolls=rolled.jail_exit_rolls + 1))
+                branches.append((ways, 0, self.end(stayed, last)))
+        return self.outcomes.throw(branches)
+
+    def play(self, state, jailed_throws=0, last=False):
+        """
+        The outcomes of the rest of a turn from a throw of the dice, as in
+        `Board.handle_play_turn`, having thrown `jailed_throws` since being
+        sent to jail this turn.
+        """
+        if jailed_throws == MAX_JAILED_THROWS:
+            return self.outcomes.certain(0, None)
+        key = state, jailed_throws, last
+        if key not in self.play_outcomes:
+            jailed_throws += state.in_jail
+            branches = []
+            for dice_roll, ways in THROWS:
+                rolled, jailed = self.roll(state, dice_roll)
+                if jailed:
+                    branches.append((ways, 0, self.end(self.outcomes.certain(0, rolled), last)))
+                else:
+                    branches.append((ways,) + self.after_throw(rolled, dice_roll, jailed_throws, last))
+            self.play_outcomes[key] = self.outcomes.throw(branches)
+        return self.play_outcomes[key]
+
+    def after_throw(self, state, dice_roll, jailed_throws, last):
+        """
+        The outcomes of the rest of a turn after throwing `dice_roll`, as
+        `(cash, outcomes)`: the cash is collected on the way to the tile,
+        and added to every outcome.
+        """
+        cash, moved = self.move(state, sum(dice_roll))
+        landed = self.land(moved, dice_roll)
+        if dice_roll[0] != dice_roll[1]:
+            return cash, self.end(landed, last)
+        certain = landed.certain_outcome()
+        if certain is not None:
+            # Usually landing is certain, and the outcomes of the next throw
+            # can be shared rather than copied.
+            delta, landed_state = certain
+            return cash + delta, self.play(landed_state, jailed_throws, last)
+        return cash, landed.chain(lambda landed_state: self.play(landed_state, jailed_throws, last))
+
+    def roll(self, state, dice_roll):
+        """
+        Adds `dice_roll` to the player's dice history, as in
+        `Player.roll_dice`. Returns the new state, and whether they were
+        sent to jail for three doubles.
+        """
+        rolls, doubles = state.rolls + 1, state.doubles + (dice_roll[0] == dice_roll[1])
+        if rolls < 3:
+            return state._replace(rolls=rolls, doubles=doubles), False
+        state = state._replace(rolls=0, doubles=0)
+        if not state.in_jail and doubles == 3:
+            return self.enter_jail(state), True
+        return state, False
+
+    def enter_jail(self, state):
+        return state._replace(step=self.jail_step, in_jail=True)
+
+    def leave_jail(self, state):
+        return state._replace(in_jail=False, jail_exit_rolls=0)
+
+    def move(self, state, tile_moves):
+        """
+        Moves the player as `Board.move_player` does, returning what they
+        collected on the way and the new state.
+        """
+        probe = Probe(self.player)
+        for tile in self.board.get_transit_tiles(state.step, tile_moves):
+            tile.on_transit(probe)
+        return probe.cash, state._replace(step=(state.step + tile_moves - 1) % self.board.total_tile_count + 1)
+
+    def land(self, state, dice_roll):
+        """
+        The outcomes of landing on the player's tile, as in
+        `Player.handle_land_on_tile`.
+        """
+        tile = self.board.tiles[state.step - 1]
+        if isinstance(tile, CardTile):
+            return self.draw(state, tile, dice_roll)
+        probe = Probe(self.player)
+        tile.on_land(probe)
+        if isinstance(tile, PropertyTile):
+            if tile.is_owned and tile.owner is not self.player and not tile.mortgaged:
+                tile.charge_rent(probe, tile.get_rent_cost(dice_roll))
+        elif probe.jailed:
+            state = self.enter_jail(state)
+        return self.outcomes.certain(probe.cash, state)
+
+    def draw(self, state, tile, dice_roll):
+        """
+        Draws the next card of `tile`'s deck, as in `Deck.draw`, and
+        returns the outcomes of applying it.
+        """
+        deck_index = self.deck_indices[tile.type]
+        deck = self.decks[deck_index]
+        cursor, held = state.decks[deck_index]
+        if sum(held) == len(deck.cards):
+            return self.outcomes.certain(0, state)
+        while True:
+            index = deck.order[cursor]
+            cursor = (cursor + 1) % len(deck.order)
+            if not held[index]:
+                break
+        decks = state.decks[:deck_index] + ((cursor, held),) + state.decks[deck_index + 1:]
+        card = deck.cards[index]
+        handler = self.card_handlers.get(type(card))
+        if handler is None:
+            return self.outcomes.certain(0, state._replace(decks=decks))
+        return handler(state._replace(decks=decks), card, deck_index, dice_roll)
+
+    def set_held(self, state, deck_index, card_index, value):
+        cursor, held = state.decks[deck_index]
+        held = held[:card_index] + (value,) + held[card_index + 1:]
+        return state._replace(decks=state.decks[:deck_index] + ((cursor, held),) + state.decks[deck_index + 1:])
+
+    def advance(self, state, card, deck_index, dice_roll):
+        target = self.board.get_tile_by_name(card.tile)
+        cash, moved = self.move(state, (target.step - state.step) % self.board.total_tile_count)
+        return self.land(moved, dice_roll).shift(cash)
+
+    def advance_to_nearest(self, state, card, deck_index, dice_roll):
+        board = self.board
+        target = board.get_nearest_tile(board.tiles[state.step - 1], card.tile_type)
+        if target is None:
+            return self.outcomes.certain(0, state)
+        cash, moved = self.move(state, (target.step - state.step) % board.total_tile_count)
+        if not target.is_owned or target.owner is self.player or target.mortgaged:
+            return self.land(moved, dice_roll).shift(cash)
+        if not card.dice_multiplier:
+            probe = Probe(self.player)
+            target.charge_rent(probe, target.get_rent_cost(dice_roll) * card.rent_multiplier)
+            return self.outcomes.certain(cash + probe.cash, moved)
+        branches = []
+        for card_roll, ways in THROWS:
+            probe = Probe(self.player)
+            target.charge_rent(probe, sum(card_roll) * card.dice_multiplier)
+            branches.append((ways, 0, self.outcomes.certain(cash + probe.cash, moved)))
+        return self.outcomes.throw(branches)
+
+    def go_back(self, state, card, deck_index, dice_roll):
+        step = (state.step - 1 - card.steps) % self.board.total_tile_count + 1
+        return self.land(state._replace(step=step), dice_roll)
+
+    def go_to_jail(self, state, card, deck_index, dice_roll):
+        return self.outcomes.certain(0, self.enter_jail(state))
+
+    def pay(self, state, card, deck_index, dice_roll):
+        return self.outcomes.certain(-card.amount, state)
+
+    def collect(self, state, card, deck_index, dice_roll):
+        return self.outcomes.certain(card.amount, state)
+
+    def collect_from_players(self, state, card, deck_index, dice_roll):
+        return self.outcomes.certain(card.amount * self.other_players, state)
+
+    def repairs(self, state, card, deck_index, dice_roll):
+        cost = sum(card.hotel if tile.hotel else tile.houses * card.house for tile in self.player.portfolio)
+        return self.outcomes.certain(-cost, state)
+
+    def keep_jail_free_card(self, state, card, deck_index, dice_roll):
+        state = self.set_held(state, deck_index, card.index, 1)
+        return self.outcomes.certain(0, state._replace(jail_cards=state.jail_cards + ((deck_index, card.index),)))
+
+
+def evaluate(board, player, turns=3, distribution=True):
+    """
+    Returns the exact `Evaluation` of `player`'s next `turns` turns on
+    `board` (see `ExactEvaluator`).
+    """
+    return ExactEvaluator(board, player, distribution).evaluate(turns)
@@ -0,0 +1,170 @@
+from multiprocessing import cpu_count
+
+from . import conf
+from .board import Board
+from .parallel import map_tasks, split_range
+
+# How many of a sweep's earliest mismatches are kept, with their snapshots,
+# and replayed with fewer players when shrinking. Each chunk of seeds only
+# returns its earliest mismatch, so a systematic divergence over millions
+# of games doesn't fill memory.
+SHRINK_CANDIDATES = 8
+
+
+class Mismatch(object):
+    """
+    The first point at which a candidate engine's state diverged from the
+    reference engine's state.
+
+    - `seed` is the dice seed both engines were constructed with.
+    - `num_players` is the number of players in the game.
+    - `turn` is the number of turns played when the states were compared.
+    - `expected` is the reference engine's `(running, snapshot)`.
+    - `actual` is the candidate engine's `(running, snapshot)`, or the
+      error it raised.
+    """
+    def __init__(self, seed, num_players, turn, expected, actual):
+        self.seed = seed
+        self.num_players = num_players
+        self.turn = turn
+        self.expected = expected
+        self.actual = actual
+
+    def __repr__(self):
+        return '<Mismatch: seed %d, %d players, turn %d>' % (self.seed, self.num_players, self.turn)
+
+    @property
+    def sort_key(self):
+        return self.turn, self.num_players, self.seed
+
+
+class SweepResult(object):
+    """
+    The outcome of an equivalence sweep over many seeded games: how many
+    `games` were checked, and how many of them mismatched, of which the
+    earliest (see `SHRINK_CANDIDATES`) are kept as `mismatches`.
+    """
+    def __init__(self, games=0, mismatch_count=0, mismatches=None):
+        self.games = games
+        self.mismatch_count = mismatch_count
+        self.mismatches = mismatches or []
+        self.minimal = None
+
+    def __repr__(self):
+        return '<SweepResult: %d games, %d mismatches>' % (self.games, self.mismatch_count)
+
+    @property
+    def passed(self):
+        return not self.mismatch_count
+
+
+def create_engine(engine_class, seed, num_players, locale):
+    engine = engine_class(num_players=num_players, locale=locale, seed=seed)
+    engine.setup()
+    return engine
+
+
+def play_in_lockstep(candidate, seed, num_players=2, locale='en-gb', reference=Board, max_turns=None):
+    """
+    Plays a single game on both the `reference` and `candidate` engines,
+    feeding them the same seeded dice stream, and compares their snapshots
+    after every turn. Returns the first `Mismatch`, or None if both engines
+    agreed until the game ended or `max_turns` were played.
+    """
+    if max_turns is None:
+        max_turns = conf.MAX_GAME_TURNS
+
+    expected_engine = create_engine(reference, seed, num_players, locale)
+    try:
+        actual_engine = create_engine(candidate, seed, num_players, locale)
+    except Exception as e:
+        return Mismatch(seed, num_players, 0, (True, expected_engine.snapshot()), repr(e))
+
+    turn = 0
+    while True:
+        expected = (not expected_engine.finished, expected_engine.snapshot())
+        try:
+            actual = (not actual_engine.finished, actual_engine.snapshot())
+        except Exception as e:
+            actual = repr(e)
+        if expected != actual:
+            return Mismatch(seed, num_players, turn, expected, actual)
+        if expected_engine.finished or turn == max_turns:
+            return None
+
+        expected_engine.step()
+        try:
+            actual_engine.step()
+        except Exception as e:
+            return Mismatch(seed, num_players, turn + 1, (not expected_engine.finished,
+                                                          expected_engine.snapshot()), repr(e))
+        turn += 1
+
+
+def check_seeds(task):
+    """
+    Pool worker: plays every seed in `[start, stop)` in lockstep and
+    returns the number of games checked, how many mismatched, and the
+    earliest mismatch, if any.
+    """
+    candidate, reference, start, stop, num_players, locale, max_turns = task
+    count, earliest = 0, None
+    for seed in range(start, stop):
+        mismatch = play_in_lockstep(candidate, seed, num_players, locale, reference, max_turns)
+        if mismatch is not None:
+            count += 1
+            if earliest is None or mismatch.sort_key < earliest.sort_key:
+                earliest = mismatch
+    return stop - start, count, earliest
+
+
+def replay_seed(task):
+    """
+    Pool worker: replays one seed in lockstep with fewer players.
+    """
+    candidate, reference, seed, num_players, locale, max_turns = task
+    return play_in_lockstep(candidate, seed, num_players, locale, reference, max_turns)
+
+
+def shrink(mismatches, candidate, locale='en-gb', reference=Board, max_turns=None, workers=None,
+           start_method=None):
+    """
+    Reduces a list of mismatches to the smallest reproduction: the earliest
+    diverging turn (lowest seed on a tie), replayed with as few players as
+    still reproduce a divergence. The replays are played across a process
+    pool.
+    """
+    if not mismatches:
+        return None
+    minimal = min(mismatches, key=lambda m: m.sort_key)
+    tasks = [(candidate, reference, mismatch.seed, num_players, locale, max_turns)
+             for num_players in range(2, minimal.num_players)
+             for mismatch in sorted(mismatches, key=lambda m: m.sort_key)]
+    smaller = [mismatch for mismatch in map_tasks(replay_seed, tasks, min(workers or cpu_count(), len(tasks) or 1),
+                                                  start_method) if mismatch is not None]
+    return min(smaller + [minimal], key=lambda m: (m.num_players, m.turn, m.seed))
+
+
+def run_sweep(candidate, games, start_seed=0, num_players=2, locale='en-gb', reference=Board,
+              max_turns=None, workers=None, chunk_size=None, start_method=None):
+    """
+    Checks `candidate` against `reference` over `games` consecutive seeds,
+    starting at `start_seed`, split into chunks across a process pool.
+    With `workers=1` the sweep runs in this process.
+    """
+    workers = workers or cpu_count()
+    tasks = []
+    for start, stop in split_range(start_seed, games, workers, chunk_size):
+        tasks.append((candidate, reference, start, stop, num_players, locale, max_turns))
+
+    results = map_tasks(check_seeds, tasks, workers, start_method)
+
+    result = SweepResult()
+    for checked, count, earliest in results:
+        result.games += checked
+        result.mismatch_count += count
+        if earliest is not None:
+            result.mismatches.append(earliest)
+    result.mismatches = sorted(result.mismatches, key=lambda m: m.sort_key)[:SHRINK_CANDIDATES]
+    result.minimal = shrink(result.mismatches, candidate, locale, reference, max_turns, workers, start_method)
+    return result
@@ -0,0 +1,25 @@
+def ring_layout(tile_count):
+    """
+    Arranges `tile_count` tiles around the edge of a square grid, the way
+    they're printed on a physical board: GO in the bottom-right corner,
+    then along the bottom row to Jail, up the left column, along the top
+    row and back down the right column.
+
+    Returns a list of rows, each a list of tile indices (in the locale
+    template's order) or None for cells which hold no tile.
+    """
+    # The number of tiles along each side, not counting the next corner.
+    side = max(1, -(-tile_count // 4))
+    size = side + 1
+    grid = [[None] * size for _ in range(size)]
+
+    path = []
+    path.extend((size - 1, size - 1 - i) for i in range(side))
+    path.extend((size - 1 - i, 0) for i in range(side))
+    path.extend((0, i) for i in range(side))
+    path.extend((i, size - 1) for i in range(side))
+
+    for index in range(tile_count):
+        row, column = path[index]
+        grid[row][column] = index
+    return grid
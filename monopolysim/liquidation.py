@@ -0,0 +1,157 @@
+from bisect import bisect_left
+
+# The steps of a liquidation plan, each applied to the tile at `step`.
+SELL = 'sell'
+SELL_ALL = 'sell_all'
+MORTGAGE = 'mortgage'
+
+
+def portfolio_key(player, bank):
+    """
+    Describes everything about `player`'s portfolio which decides how they
+    can raise cash: which tiles they own, how developed and whether they're
+    mortgaged, and how many houses the bank has to break hotels down with.
+    """
+    return bank.houses, tuple(sorted((tile.step, tile.development, tile.mortgaged) for tile in player.portfolio))
+
+
+class Mortgages(object):
+    """
+    The totals which mortgaging some of `tiles` can raise, kept as integer
+    bitsets: bit `n` of `reachable[i]` is set if some of the first `i` tiles
+    raise exactly `n`. Finding the cheapest mortgages for a shortfall is then
+    a handful of big integer operations, rather than a search.
+    """
+    def __init__(self, tiles):
+        self.tiles = [(tile.step, tile.mortgage_value) for tile in tiles]
+        self.reachable = [1]
+        for _, value in self.tiles:
+            self.reachable.append(self.reachable[-1] | self.reachable[-1] << value)
+        self.total = sum(value for _, value in self.tiles)
+
+    def cheapest(self, shortfall):
+        """
+        Returns the steps of the tiles whose mortgages raise as little as
+        possible over `shortfall`.
+        """
+        above = self.reachable[-1] >> shortfall
+        total = shortfall + (above & -above).bit_length() - 1
+        steps = []
+        for index in range(len(self.tiles), 0, -1):
+            if not self.reachable[index - 1] >> total & 1:
+                step, value = self.tiles[index - 1]
+                steps.append(step)
+                total -= value
+        return tuple(reversed(steps))
+
+
+def sell_off(groups, bank_houses):
+    """
+    Sells every house and hotel in `groups` back to the bank, cheapest
+    houses first and evenly across each group, as `(step, raised)` pairs
+    where `raised` is the running total. If the bank hasn't the houses to
+    break a hotel down with, the group's buildings are all sold at once.
+    """
+    steps, raised = [], 0
+    for group in sorted(groups, key=lambda g: (g.tiles[0].prices['house'], g.tiles[0].step)):
+        development = [tile.development for tile in group.tiles]
+        house_value = group.tiles[0].prices['house'] // 2
+        hotel_value = group.tiles[0].prices['hotel'] // 2
+        while any(development):
+            highest = max(development)
+            index = len(development) - 1 - development[::-1].index(highest)
+            if highest == 5 and bank_houses < 4:
+                for level in development:
+                    raised += hotel_value + 4 * house_value if level == 5 else level * house_value
+                    bank_houses += level if level < 5 else 0
+                development = [0] * len(development)
+                steps.append(((SELL_ALL, group.tiles[index].step), raised))
+                continue
+            if highest == 5:
+                raised += hotel_value
+                bank_houses -= 4
+            else:
+                raised += house_value
+                bank_houses += 1
+            development[index] -= 1
+            steps.append(((SELL, group.tiles[index].step), raised))
+    return steps
+
+
+class LiquidationOptions(object):
+    """
+    The ways a single portfolio configuration can raise cash, in the order
+    they're used, so that monopolies are only broken up as a last resort:
+
+    1. Mortgaging tiles outside of the player's monopolies.
+    2. Selling houses and hotels back to the bank.
+    3. Mortgaging the tiles of the player's monopolies.
+
+    Within a stage, the player raises as little as possible over what they
+    need, which is also the cheapest option: mortgages cost 10% of the
+    amount raised to lift, and houses sell for half of what they cost.
+    """
+    def __init__(self, player):
+        groups = set(tile.property_group for tile in player.portfolio)
+        developed = [group for group in groups if group.development]
+        unmortgaged = [tile for tile in sorted(player.portfolio, key=lambda t: t.step) if not tile.mortgaged]
+        first = [tile for tile in unmortgaged
+                 if tile.property_group not in player.monopolies and not tile.property_group.development]
+        last = [tile for tile in unmortgaged if tile not in first]
+
+        self.first = Mortgages(first)
+        self.sales = sell_off(developed, player.board.bank.houses)
+        self.sale_totals = [raised for _, raised in self.sales]
+        self.last = Mortgages(last)
+        self.total = self.first.total + (self.sale_totals[-1] if self.sales else 0) + self.last.total
+
+    def plan(self, shortfall):
+        """
+        Returns the steps which raise at least `shortfall`, or None if the
+        whole portfolio isn't worth that much.
+        """
+        if shortfall > self.total:
+            return None
+        if shortfall <= self.first.total:
+            return tuple((MORTGAGE, step) for step in self.first.cheapest(shortfall))
+        plan = [(MORTGAGE, step) for step, _ in self.first.tiles]
+        shortfall -= self.first.total
+
+        index = bisect_left(self.sale_totals, shortfall)
+        plan.extend(step for step, _ in self.sales[:index + 1])
+        if index < len(self.sale_totals):
+            return tuple(plan)
+        if self.sales:
+            shortfall -= self.sale_totals[-1]
+
+        plan.extend((MORTGAGE, step) for step in self.last.cheapest(shortfall))
+        return tuple(plan)
+
+
+class Liquidator(object):
+    """
+    Plans how players raise the cash for debts they can't pay outright.
+
+    Working out a portfolio's options is the expensive part, so they're
+    memoized per portfolio configuration (see `portfolio_key`) for the rest
+    of the game; planning for a particular debt is then a few bisections.
+    """
+    def __init__(self, board):
+        self.board = board
+        self.options = {}
+
+    def plan(self, player, amount):
+        """
+        Returns the steps by which `player` raises `amount`, which are
+        empty if they have the cash already, or None if they can't.
+        """
+        shortfall = amount - player.cash
+        if shortfall <= 0:
+            return ()
+        if not player.portfolio:
+            return None
+        key = portfolio_key(player, self.board.bank)
+        options = self.options.get(key)
+        if options is None:
+            options = self.options[key] = LiquidationOptions(player)
+        return options.plan(shortfall)
@@ -0,0 +1,265 @@
+import os
+import json
+from random import Random
+from multiprocessing import cpu_count
+
+from . import conf
+from .batch import game_seed, play_game
+from .estimators import Estimate
+from .parallel import map_tasks, split_range
+from .player import Player
+
+# The tunable parameters of `ParameterizedPlayer`, with their bounds. Each
+# is an amount of cash, in the board's currency.
+PARAMETERS = (
+    ('purchase_reserve', 0, 1000),
+    ('build_reserve', 0, 1500),
+    ('unmortgage_reserve', 0, 1500),
+    ('jail_pay_cash', 0, 5000),
+)
+
+# The parameters which play like the default `Player`.
+DEFAULT_PARAMETERS = {
+    'purchase_reserve': 0,
+    'build_reserve': 0,
+    'unmortgage_reserve': 0,
+    'jail_pay_cash': 5000,
+}
+
+# Validation games are numbered from here, so they never share seeds with
+# the games played during the search.
+VALIDATION_OFFSET = 2 ** 31
+
+
+class ParameterizedPlayer(Player):
+    """
+    A player whose decisions are set by `parameters` (see `PARAMETERS`):
+
+    - they buy, build and unmortgage as long as they'd have at least the
+      matching reserve of cash left afterwards;
+    - they pay to leave jail if they have `jail_pay_cash` or more, and
+      otherwise use a "Get Out Of Jail Free" card or wait, as usual.
+
+    Use `parameterized_class` to make a class for a set of parameters.
+    """
+    parameters = DEFAULT_PARAMETERS
+
+    def property_purchase_choice(self, purchase_price):
+        if self.cash - purchase_price >= self.parameters['purchase_reserve']:
+            return conf.PLAYER_PURCHASE_PROPERTY
+        return None
+
+    def property_build_choice(self, upgrade_price):
+        if self.cash - upgrade_price >= self.parameters['build_reserve']:
+            return conf.PLAYER_BUILD_PROPERTY
+        return None
+
+    def property_unmortgage_choice(self, unmortgage_cost):
+        if self.cash - unmortgage_cost >= self.parameters['unmortgage_reserve']:
+            return conf.PLAYER_UNMORTGAGE_PROPERTY
+        return None
+
+    def jail_exit_choice(self):
+        if self.jail_free_cards:
+            return conf.PLAYER_JAIL_CARD
+        if self.cash >= self.parameters['jail_pay_cash']:
+            return conf.PLAYER_JAIL_PAY
+        return conf.PLAYER_JAIL_WAIT
+
+
+def parameterized_class(parameters):
+    """
+    Returns a `ParameterizedPlayer` class playing with `parameters`, or the
+    default `Player` if they're None.
+    """
+    if parameters is None:
+        return Player
+    return type('ParameterizedPlayer', (ParameterizedPlayer,), {'parameters': dict(parameters)})
+
+
+def play_candidates(task):
+    """
+    Pool worker: plays the games with indices `[start, stop)` once for each
+    candidate set of parameters (None for the default player), which takes
+    a seat in turn against default players. Every candidate plays each
+    game with the same seed and seat, so they face the same dice and cards.
+    Returns whether each candidate won each game.
+    """
+    seed, start, stop, num_players, locale, max_turns, candidates = task
+    classes = [parameterized_class(parameters) for parameters in candidates]
+    wins = [[] for _ in candidates]
+    for index in range(start, stop):
+        seat = index % num_players
+        for player_class, candidate_wins in zip(classes, wins):
+            player_classes = [Player] * num_players
+            player_classes[seat] = player_class
+            game = play_game(game_seed(seed, index), num_players, locale, max_turns, player_classes=player_classes)
+            candidate_wins.append(1 if game.winner == seat else 0)
+    return wins
+
+
+def play_all(candidates, start, games, seed, num_players, locale, max_turns, workers, start_method=None):
+    """
+    Plays games `[start, start + games)` for every candidate across a
+    process pool, and returns whether each candidate won each game.
+    """
+    tasks = []
+    for chunk_start, chunk_stop in split_range(start, games, workers):
+        tasks.append((seed, chunk_start, chunk_stop, num_players, locale, max_turns, candidates))
+    wins = [[] for _ in candidates]
+    for partial in map_tasks(play_candidates, tasks, workers, start_method):
+        for candidate_wins, chunk_wins in zip(wins, partial):
+            candidate_wins.extend(chunk_wins)
+    return wins
+
+
+class Optimizer(object):
+    """
+    Evolves `ParameterizedPlayer` parameters towards a higher win rate
+    against default players.
+
+    Each generation, every candidate plays the same `games` games, so
+    their win rates are measured with common random numbers and differ by
+    their parameters rather than their luck. The `elite` best carry over
+    unchanged, and the rest of the next generation are bred from the
+    fittest: a uniform crossover of two tournament winners, each
+    parameter then mutated by a normal step of `mutation` times its range.
+    Every generation plays new games, so no candidate is fitted to them.
+
+    With a `checkpoint` path, the state is saved after every generation,
+    and a search which was stopped can be resumed with `load`.
+    """
+    def __init__(self, population_size=16, games=200, num_players=2, locale='en-gb', max_turns=None, seed=0,
+                 elite=None, mutation=0.1, checkpoint=None):
+        self.population_size = population_size
+        self.games = games
+        self.num_players = num_players
+        self.locale = locale
+        self.max_turns = max_turns
+        self.seed = seed
+        self.elite = max(1, population_size // 4) if elite is None else elite
+        self.mutation = mutation
+        self.checkpoint = checkpoint
+        self.generation = 0
+        self.population = []
+        # Each generation's best parameters, with its best and mean win rates.
+        self.history = []
+
+    def __repr__(self):
+        return '<Optimizer: generation %d, %d candidates>' % (self.generation, len(self.population))
+
+    @property
+    def best(self):
+        """
+        The best parameters of the last generation played, and their win rate.
+        """
+        if not self.history:
+            return None, None
+        return self.history[-1]['parameters'], self.history[-1]['best']
+
+    def random(self):
+        return Random((self.seed << 16) + self.generation)
+
+    def initial_population(self):
+        rand = self.random()
+        population = [dict(DEFAULT_PARAMETERS)]
+        while len(population) < self.population_size:
+            population.append(dict((name, rand.randint(low, high)) for name, low, high in PARAMETERS))
+        return population
+
+    def breed(self, ranked, rand):
+        """
+        Returns the next generation from the current one, `ranked` best first.
+        """
+        population = [dict(parameters) for parameters in ranked[:self.elite]]
+        while len(population) < self.population_size:
+            first, second = [min(rand.sample(range(len(ranked)), 2)) for _ in range(2)]
+            child = {}
+            for name, low, high in PARAMETERS:
+                value = ranked[first][name] if rand.random() < 0.5 else ranked[second][name]
+                value += int(round(rand.gauss(0, self.mutation * (high - low))))
+                child[name] = min(high, max(low, value))
+            population.append(child)
+        return population
+
+    def step(self, workers=None, start_method=None):
+        """
+        Plays a generation, records its best candidate and breeds the next.
+        """
+        if not self.population:
+            self.population = self.initial_population()
+        wins = play_all(self.population, self.generation * self.games, self.games, self.seed, self.num_players,
+                        self.locale, self.max_turns, workers or cpu_count(), start_method)
+        fitness = [float(sum(candidate_wins)) / self.games for candidate_wins in wins]
+        order = sorted(range(len(self.population)), key=lambda index: -fitness[index])
+        ranked = [self.population[index] for index in order]
+        self.history.append({
+            'generation': self.generation,
+            'parameters': ranked[0],
+            'best': fitness[order[0]],
+            'mean': sum(fitness) / len(fitness),
+        })
+        self.population = self.breed(ranked, self.random())
+        self.generation += 1
+        if self.checkpoint:
+            self.save(self.checkpoint)
+        return self.history[-1]
+
+    def run(self, generations, workers=None, start_method=None):
+        """
+        Plays generations until `generations` have been played in total.
+        """
+        while self.generation < generations:
+            self.step(workers, start_method)
+        return self.best
+
+    def to_dict(self):
+        return {
+            'population_size': self.population_size,
+            'games': self.games,
+            'num_players': self.num_players,
+            'locale': self.locale,
+            'max_turns': self.max_turns,
+            'seed': self.seed,
+            'elite': self.elite,
+            'mutation': self.mutation,
+            'generation': self.generation,
+            'population': self.population,
+            'history': self.history,
+        }
+
+    @classmethod
+    def from_dict(cls, data, checkpoint=None):
+        optimizer = cls(data['population_size'], data['games'], data['num_players'], data['locale'],
+                        data['max_turns'], data['seed'], data['elite'], data['mutation'], checkpoint)
+        optimizer.generation = data['generation']
+        optimizer.population = data['population']
+        optimizer.history = data['history']
+        return optimizer
+
+    def save(self, path):
+        """
+        Writes the state to `path`, replacing it in one step so a search
+        stopped mid-write leaves the previous checkpoint intact.
+        """
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as fs:
+            json.dump(self.to_dict(), fs, indent=2, sort_keys=True)
+        os.rename(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as fs:
+            return cls.from_dict(json.load(fs), checkpoint=path)
+
+
+def measure(parameters, games=2000, seed=0, num_players=2, locale='en-gb', max_turns=None, workers=None,
+            start_method=None):
+    """
+    Measures `parameters` on fresh games against default players, rotating
+    seats. Returns the estimated win rate, and how much it exceeds that of
+    a default player in the same seats with the same dice and cards.
+    """
+    wins, default_wins = play_all([parameters, None], VALIDATION_OFFSET, games, seed, num_players, locale,
+                                  max_turns, workers or cpu_count(), start_method)
+    return Estimate.from_values(wins), Estimate.from_values(a - b for a, b in zip(wins, default_wins))
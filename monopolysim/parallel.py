@@ -0,0 +1,98 @@
+from importlib import import_module
+from multiprocessing import Pool, cpu_count
+
+from .board import load_board_template
+
+# The modules pool workers need to play games, imported before they start.
+PRELOAD_MODULES = tuple(__name__.rpartition('.')[0] + module for module in ('.batch', '.harness'))
+
+
+def preload(locales=('en-gb',)):
+    """
+    Imports the engine and reads the board templates of `locales`, so
+    they're ready before a worker receives its first task.
+    """
+    for module in PRELOAD_MODULES:
+        import_module(module)
+    for locale in locales:
+        load_board_template(locale)
+
+
+def create_pool(workers=None, method=None, locales=('en-gb',)):
+    """
+    Starts a pool of `workers` processes which already have the engine
+    imported and the board templates of `locales` read. `method` is the
+    way workers are started:
+
+    - None or 'fork': this process preloads, then forks every worker, so
+      workers start with everything already in memory.
+    - 'forkserver': workers are forked from a server process which
+      preloaded the engine once (Python 3.4+).
+    - 'spawn': every worker starts a fresh interpreter, then preloads.
+    """
+    workers = workers or cpu_count()
+    if method is None:
+        preload(locales)
+        return Pool(workers, preload, (locales,))
+
+    try:
+        from multiprocessing import get_context
+    except ImportError:
+        raise ValueError('The %s start method requires Python 3.4 or later.' % method)
+    context = get_context(method)
+    if method == 'forkserver':
+        context.set_forkserver_preload(list(PRELOAD_MODULES))
+    elif method == 'fork':
+        preload(locales)
+    return context.Pool(workers, preload, (locales,))
+
+
+def split_range(start, count, workers, chunk_size=None):
+    """
+    Splits `count` consecutive indices, beginning at `start`, into
+    `(start, stop)` chunks. Unless a `chunk_size` is given, there are
+    enough chunks to keep every worker busy until the end of the run.
+    """
+    if chunk_size is None:
+        chunk_size = max(1, min(250, count // (workers * 4)))
+    chunks = []
+    for chunk_start in range(start, start + count, chunk_size):
+        chunks.append((chunk_start, min(chunk_start + chunk_size, start + count)))
+    return chunks
+
+
+def map_tasks(function, tasks, workers=None, method=None):
+    """
+    Applies `function` to every task across a pool of preloaded workers
+    (see `create_pool`) and returns the results in task order. With
+    `workers=1` the tasks run in this process.
+    """
+    workers = workers or cpu_count()
+    if workers == 1:
+        return [function(task) for task in tasks]
+    pool = create_pool(workers, method)
+    try:
+        return pool.map(function, tasks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def imap_tasks(function, tasks, workers=None, method=None):
+    """
+    Like `map_tasks`, but yields each result in task order as soon as it's
+    ready, so the caller can consume early results while later tasks are
+    still being played.
+    """
+    workers = workers or cpu_count()
+    if workers == 1:
+        for task in tasks:
+            yield function(task)
+        return
+    pool = create_pool(workers, method)
+    try:
+        for result in pool.imap(function, tasks, chunksize=1):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
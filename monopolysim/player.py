@@ -1,10 +1,14 @@
 import logging
 from uuid import uuid4
-from random import randint
 from collections import defaultdict
 
-import conf
-from tiles import PropertyTile
+from . import conf
+from .dice import DiceStream
+from .liquidation import SELL, SELL_ALL
+from .trading import candidate_trades
+from .tiles import PropertyTile
+
+logger = logging.getLogger(__name__)
 
 
 class Player(object):
@@ -31,6 +35,16 @@ class Player(object):
         self.bankrupt = kwargs.get('bankrupt', False)
         self.nickname = kwargs.get('nickname', 'Anonymous')
         self.dice_roll_history = []
+        self.dice = getattr(self.board, 'dice', None) or DiceStream()
+        # The dice roll which moved the player onto their current tile.
+        self.dice_roll = None
+        # The decks and "Get Out Of Jail Free" cards this player holds.
+        self.jail_free_cards = []
+        # The property groups this player owns every tile of, those they're
+        # one tile short of, and the tiles they've mortgaged.
+        self.monopolies = set()
+        self.near_monopolies = set()
+        self.mortgages = set()
 
     def __repr__(self):
         return '<Player: %s>' % str(self.nickname)
@@ -43,27 +57,92 @@ class Player(object):
         self.in_jail = False
         self.jail_exit_rolls = 0
 
+    def use_jail_free_card(self):
+        """
+        Returns a held "Get Out Of Jail Free" card to its deck.
+        """
+        deck, card = self.jail_free_cards.pop()
+        deck.release(card)
+        logger.debug('%s used a "Get Out Of Jail Free" card.', self.nickname)
+
     def get_portfolio(self):
         """
         Returns the player's property portfolio, grouped by `type`.
         """
         portfolio = defaultdict(list)
-        tiles = filter(lambda t: t.type in ['property', 'station', 'utility'], self.board.tiles)
-        for tile in tiles:
-            if tile.owner == self:
-                group_by = 'group'
-                if tile.type in ['station', 'utility']:
-                    group_by = 'type'
-                portfolio[getattr(tile, group_by)].append(tile)
+        for tile in sorted(self.portfolio, key=lambda t: t.step):
+            group_by = 'group'
+            if tile.type in ['station', 'utility']:
+                group_by = 'type'
+            portfolio[getattr(tile, group_by)].append(tile)
         return portfolio
 
     def construct_houses(self):
         """
         On any given non-jail turn, a player can decide if they wish to
-        purchase houses or hotels for their properties.
-        TODO: implement this.
+        purchase houses or hotels for their properties. They may only build
+        on colour groups they own every tile of, evenly across the group,
+        and only while the bank has houses or hotels left.
+        """
+        bank = self.board.bank
+        for group in sorted(self.monopolies, key=lambda g: g.tiles[0].step):
+            tile = group.get_buildable_tile()
+            while tile is not None:
+                upgrade_type, upgrade_price = tile.get_upgrade_price()
+                if not bank.has_stock(upgrade_type):
+                    logger.debug('%s cannot upgrade "%s", the bank has no %ss left.',
+                                 self.nickname, tile.name, upgrade_type)
+                    break
+                if self.cash < upgrade_price:
+                    logger.debug('%s ($%d) cannot afford to upgrade "%s" ($%d).',
+                                 self.nickname, self.cash, tile.name, upgrade_price)
+                    break
+                if self.property_build_choice(upgrade_price) != conf.PLAYER_BUILD_PROPERTY:
+                    logger.debug('%s chose not to upgrade "%s".', self.nickname, tile.name)
+                    break
+                self.upgrade_property(tile)
+                tile = group.get_buildable_tile()
+
+    def propose_trades(self):
+        """
+        On any given non-jail turn, a player can offer another player a
+        trade. By default, of the trades which would complete one of their
+        groups (see `candidate_trades`), they offer the one which leaves
+        them best off, if it leaves them better off at all.
         """
-        pass
+        valuation = self.board.valuation
+        best_trade, best_gain = None, 0
+        for trade in candidate_trades(self, valuation):
+            if not trade.is_affordable():
+                continue
+            gain = valuation.trade_gain(trade, self)
+            if gain > best_gain:
+                best_trade, best_gain = trade, gain
+        if best_trade is None:
+            return
+        if best_trade.responder.trade_acceptance_choice(best_trade) == conf.PLAYER_ACCEPT_TRADE:
+            best_trade.execute()
+        else:
+            logger.debug('%s declined a trade from %s.', best_trade.responder.nickname, self.nickname)
+
+    def unmortgage_properties(self):
+        """
+        On any given non-jail turn, a player can lift the mortgages on their
+        properties, those of their monopolies first so they can build again.
+        """
+        if not self.mortgages:
+            return
+        tiles = sorted(self.mortgages, key=lambda t: (t.property_group not in self.monopolies, t.step))
+        for tile in tiles:
+            cost = tile.unmortgage_cost
+            if self.cash < cost:
+                logger.debug('%s ($%d) cannot afford to unmortgage "%s" ($%d).',
+                             self.nickname, self.cash, tile.name, cost)
+                break
+            if self.property_unmortgage_choice(cost) != conf.PLAYER_UNMORTGAGE_PROPERTY:
+                logger.debug('%s chose not to unmortgage "%s".', self.nickname, tile.name)
+                continue
+            self.unmortgage_property(tile)
 
     def property_purchase_choice(self, purchase_price):
         """
@@ -72,6 +151,13 @@ class Player(object):
         """
         return conf.PLAYER_PURCHASE_PROPERTY
 
+    def auction_bid_limit(self, tile):
+        """
+        What's the most the Player will bid for `tile` at auction? By
+        default, they'll go as high as its price, if they have the cash.
+        """
+        return tile.prices['purchase']
+
     def property_build_choice(self, upgrade_price):
         """
         What should the Player do when given the option to upgrade?
@@ -79,6 +165,22 @@ class Player(object):
         """
         return conf.PLAYER_BUILD_PROPERTY
 
+    def property_unmortgage_choice(self, unmortgage_cost):
+        """
+        What should the Player do when given the option to unmortgage?
+        By default, if they have the cash, they'll unmortgage.
+        """
+        return conf.PLAYER_UNMORTGAGE_PROPERTY
+
+    def trade_acceptance_choice(self, trade):
+        """
+        What should the Player do when offered a trade?
+        By default, they'll accept if it leaves them better off.
+        """
+        if self.board.valuation.trade_gain(trade, self) > 0:
+            return conf.PLAYER_ACCEPT_TRADE
+        return conf.PLAYER_DECLINE_TRADE
+
     def jail_exit_choice(self):
         """
         Based on this player's AI, returns their preferred method of
@@ -90,54 +192,189 @@ class Player(object):
         4. Wait there for three turns, rolling the dice on each turn to try to roll a double.
            If they roll a double on any turn, move out of Jail using this dice roll.
 
-        Until the AI system has been implemented, this method will pick "wait".
+        Until the AI system has been implemented, this method will use a
+        "Get Out Of Jail Free" card if it has one, or otherwise pick "wait".
         """
-        # TODO: implement using the "Get Out Of Jail Free" card when the Cards system has been built.
+        if self.jail_free_cards:
+            return conf.PLAYER_JAIL_CARD
         return conf.PLAYER_JAIL_WAIT
 
     def pay_rent(self, tile, price):
         """
         Handles rent payment between the property owner and this player.
+        If the player can't pay, the owner takes everything they have.
+        Returns the amount the owner received.
         """
-        self.wallet.withdraw(price)
-        tile.owner.wallet.deposit(price)
-        logging.debug('%s ($%d) paid %s $%d in rent.' % (self.nickname, self.cash, tile.owner.nickname, price))
+        owner = tile.owner
+        paid = self.wallet.withdraw(price, creditor=owner)
+        owner.wallet.deposit(paid)
+        if self.bankrupt:
+            logger.debug('%s ($%d) cannot afford to pay %s rent ($%d), they are bankrupt and paid $%d.',
+                         self.nickname, self.cash, owner.nickname, price, paid)
+            return paid
+        logger.debug('%s ($%d) paid %s $%d in rent.', self.nickname, self.cash, tile.owner.nickname, price)
+        return paid
 
-    def purchase_property(self, tile):
+    def purchase_property(self, tile, price=None):
         """
-        Handles purchasing a new property.
+        Handles purchasing a new property, for its price unless another
+        `price` was agreed (e.g. at auction).
         """
         tile.owner = self
-        price = tile.prices['purchase']
+        if price is None:
+            price = tile.prices['purchase']
         self.portfolio.append(tile)
         self.wallet.withdraw(price)
-        logging.debug('%s ($%d) has purchased "%s" ($%d).' % (self.nickname, self.cash, tile.name, price))
+        logger.debug('%s ($%d) has purchased "%s" ($%d).', self.nickname, self.cash, tile.name, price)
 
     def upgrade_property(self, tile):
         """
-        Handles upgrading an existing property.
+        Handles upgrading an existing property, with
+        a house or hotel from the bank's stock.
         """
+        bank = self.board.bank
         upgrade_type, upgrade_price = tile.get_upgrade_price()
         if upgrade_type == 'hotel':
+            # The hotel replaces the tile's four houses.
             tile.hotel = True
-            logging.debug('%s ($%d) upgraded "%s" to a hotel.' % (self.nickname, self.cash, tile.name))
+            bank.hotels -= 1
+            bank.houses += 4
+            logger.debug('%s ($%d) upgraded "%s" to a hotel.', self.nickname, self.cash, tile.name)
         else:
             tile.houses += 1
-            logging.debug('%s ($%d) has added a house to "%s", the total is now %d.' % (
-                self.nickname,
-                self.cash,
-                tile.name,
-                tile.houses
-            ))
+            bank.houses -= 1
+            logger.debug('%s ($%d) has added a house to "%s", the total is now %d.',
+                         self.nickname, self.cash, tile.name, tile.houses)
+        tile.property_group.development += 1
+        tile.mark_changed()
         self.wallet.withdraw(upgrade_price)
 
-    def handle_land_on_tile(self, tile, dice_roll):
+    def sell_building(self, tile):
+        """
+        Handles selling a house or hotel back to the bank for half its price.
+        A hotel is exchanged for four of the bank's houses.
+        """
+        bank = self.board.bank
+        value = tile.get_sale_value()
+        if tile.hotel:
+            tile.hotel = False
+            bank.hotels += 1
+            bank.houses -= 4
+            logger.debug('%s ($%d) sold the hotel on "%s".', self.nickname, self.cash, tile.name)
+        else:
+            tile.houses -= 1
+            bank.houses += 1
+            logger.debug('%s ($%d) sold a house on "%s", the total is now %d.',
+                         self.nickname, self.cash, tile.name, tile.houses)
+        tile.property_group.development -= 1
+        tile.mark_changed()
+        self.wallet.deposit(value)
+
+    def sell_group_buildings(self, group):
+        """
+        Handles selling every house and hotel in `group` back to the bank
+        at once, for when the bank hasn't the houses to break hotels down.
+        """
+        bank = self.board.bank
+        value = 0
+        for tile in group.tiles:
+            if tile.hotel:
+                value += tile.prices['hotel'] // 2 + 4 * (tile.prices['house'] // 2)
+                tile.hotel = False
+                bank.hotels += 1
+            else:
+                value += tile.houses * (tile.prices['house'] // 2)
+                bank.houses += tile.houses
+            tile.houses = 0
+            tile.mark_changed()
+        group.development = 0
+        logger.debug('%s ($%d) sold every building in the %s group.', self.nickname, self.cash, group.name)
+        self.wallet.deposit(value)
+
+    def mortgage_property(self, tile):
+        """
+        Handles mortgaging a property to the bank.
+        """
+        tile.mortgaged = True
+        tile.property_group.mortgaged += 1
+        tile.mark_changed()
+        self.mortgages.add(tile)
+        self.wallet.deposit(tile.mortgage_value)
+        logger.debug('%s ($%d) has mortgaged "%s" ($%d).', self.nickname, self.cash, tile.name, tile.mortgage_value)
+
+    def unmortgage_property(self, tile):
+        """
+        Handles lifting the mortgage on a property.
+        """
+        tile.mortgaged = False
+        tile.property_group.mortgaged -= 1
+        tile.mark_changed()
+        self.mortgages.discard(tile)
+        self.wallet.withdraw(tile.unmortgage_cost)
+        logger.debug('%s ($%d) has unmortgaged "%s" ($%d).',
+                     self.nickname, self.cash, tile.name, tile.unmortgage_cost)
+
+    def raise_cash(self, amount):
+        """
+        Mortgages and sells as little as it takes to have `amount` in cash,
+        following the board's liquidation plan. Returns whether they could.
+        """
+        if self.board is None:
+            return False
+        plan = self.board.liquidator.plan(self, amount)
+        if plan is None:
+            return False
+        for action, step in plan:
+            tile = self.board.tiles[step - 1]
+            if action == SELL:
+                self.sell_building(tile)
+            elif action == SELL_ALL:
+                self.sell_group_buildings(tile.property_group)
+            else:
+                self.mortgage_property(tile)
+        return True
+
+    def declare_bankruptcy(self, creditor=None):
+        """
+        Handles this player leaving the game. Their buildings are sold back
+        to the bank, and their properties and "Get Out Of Jail Free" cards
+        go to `creditor`, or back to the bank and decks if it's None. Returns
+        the cash they had left, which is also owed to `creditor`.
+        """
+        self.bankrupt = True
+        if self.board is not None:
+            self.board.bankruptcies += 1
+        for group in set(tile.property_group for tile in self.portfolio):
+            if group.development:
+                self.sell_group_buildings(group)
+        for tile in self.portfolio:
+            tile.owner = creditor
+            if creditor is not None:
+                creditor.portfolio.append(tile)
+            elif tile.mortgaged:
+                tile.mortgaged = False
+                tile.property_group.mortgaged -= 1
+        for deck, card in self.jail_free_cards:
+            if creditor is not None:
+                creditor.jail_free_cards.append((deck, card))
+            else:
+                deck.release(card)
+        self.portfolio = []
+        self.jail_free_cards = []
+        cash, self.cash = self.cash, 0
+        logger.debug('%s is bankrupt.', self.nickname)
+        return cash
+
+    def handle_land_on_tile(self, tile, dice_roll, rent_price=None):
         """
         What happens when our Player
         navigates to and stops on this tile?
+        If it's another player's, `rent_price` is charged instead of its
+        usual rent when given (e.g. by a card).
         """
         # Mark that we've now moved to this tile.
         self.tile = tile
+        self.dice_roll = dice_roll
 
         # Does the tile do anything when you visit it?
         tile.on_land(self)
@@ -155,44 +392,25 @@ class Player(object):
                         self.purchase_property(tile)
                     else:
                         # Player can afford it, but chose not to.
-                        logging.debug('%s chose not to buy "%s".' % (self.nickname, tile.name))
+                        logger.debug('%s chose not to buy "%s".', self.nickname, tile.name)
+                        tile.on_purchase_declined(self)
                 else:
                     # Player can't afford it.
-                    logging.debug('%s ($%d) cannot afford to buy "%s" ($%d).' %
-                                  (self.nickname, self.cash, tile.name, price))
-            elif tile.owner.id == self.id and tile.type == 'property':
-                # Only properties, not stations or utilities, can be upgraded.
-                # This property belongs to this player.
-                # Work out what the upgrade type and cost is.
-                upgrade_type, upgrade_price = tile.get_upgrade_price()
-
-                # If the player has enough cash...
-                if self.cash >= upgrade_price:
-                    # Let the player decide if they want to upgrade.
-                    decision = self.property_build_choice(upgrade_price)
-                    if decision == conf.PLAYER_BUILD_PROPERTY:
-                        # We've chosen to upgrade.
-                        self.upgrade_property(tile)
-                    else:
-                        # Player can afford the upgrade, but chose not to.
-                        logging.debug('%s chose not to upgrade "%s".' % (self.nickname, tile.name))
-                else:
-                    # Player can't afford the upgrade.
-                    logging.debug('%s ($%d) cannot afford to upgrade "%s" ($%d).' %
-                                  (self.nickname, self.cash, tile.name, upgrade_price))
+                    logger.debug('%s ($%d) cannot afford to buy "%s" ($%d).',
+                                 self.nickname, self.cash, tile.name, price)
+                    tile.on_purchase_declined(self)
+            elif tile.owner.id == self.id:
+                # This property belongs to this player. Houses and hotels are
+                # built at the start of a turn, see `construct_houses`.
+                pass
             else:
                 # This property belongs to someone else.
-                rent_price = tile.get_rent_cost(dice_roll)
-                # If the player has enough cash...
-                if self.cash >= rent_price:
-                    # Exchange the rent price.
-                    self.pay_rent(tile, rent_price)
+                if tile.mortgaged:
+                    logger.debug('%s landed on "%s", it is mortgaged so no rent is due.', self.nickname, tile.name)
                 else:
-                    # TODO: the player can't afford to pay rent.
-                    # Once mortgaging has been built, call it here.
-                    self.bankrupt = True
-                    logging.debug('%s ($%d) cannot afford to pay %s rent ($%d), they '
-                                  'are bankrupt.' % (self.nickname, self.cash, tile.owner.nickname, rent_price))
+                    if rent_price is None:
+                        rent_price = tile.get_rent_cost(dice_roll)
+                    tile.charge_rent(self, rent_price)
 
     def handle_transit_tile(self, tile):
         """
@@ -207,7 +425,7 @@ class Player(object):
         return PlayerWallet(player=self)
 
     def roll_die(self):
-        return randint(1, 6)
+        return self.dice.roll_die()
 
     def _roll_dice(self):
         return self.roll_die(), self.roll_die()
@@ -235,13 +453,16 @@ class PlayerWallet(object):
     def __init__(self, player):
         self.player = player
 
-    def withdraw(self, amount):
-        if (self.player.cash - amount) <= 0:
-            self.player.cash = 0
-            self.player.bankrupt = True
-            logging.debug('%s is bankrupt.' % self.player.nickname)
-        else:
-            self.player.cash -= amount
+    def withdraw(self, amount, creditor=None):
+        """
+        Takes `amount` from the player, who mortgages and sells what they
+        must to pay it. If they still can't, they're bankrupt and their
+        assets go to `creditor` (the bank if None). Returns the amount paid.
+        """
+        if self.player.cash < amount and not self.player.raise_cash(amount):
+            return self.player.declare_bankruptcy(creditor)
+        self.player.cash -= amount
+        return amount
 
     def deposit(self, amount):
         self.player.cash += amount
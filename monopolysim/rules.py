@@ -0,0 +1,148 @@
+import logging
+
+from . import conf
+from .tiles import TILE_CLASSES, FreeParkingTile, GoTile, PropertyTile, TaxableTile
+
+logger = logging.getLogger(__name__)
+
+# The house rules which can be played, by name.
+FREE_PARKING_JACKPOT = 'free_parking_jackpot'
+GO_LANDING_BONUS = 'go_landing_bonus'
+AUCTIONS = 'auctions'
+NO_JAIL_RENT = 'no_jail_rent'
+RULES = (FREE_PARKING_JACKPOT, GO_LANDING_BONUS, AUCTIONS, NO_JAIL_RENT)
+
+# The tile classes of each set of house rules, once they've been resolved.
+resolved_tile_classes = {}
+
+
+class JackpotTaxTile(TaxableTile):
+    """
+    A TaxableTile whose taxes go into the Free Parking jackpot, rather
+    than to the bank.
+    """
+    def on_land(self, player):
+        paid = player.wallet.withdraw(self.tax)
+        self.board.jackpot += paid
+        logger.debug('%s has arrived at "%s", they have been taxed %d.', player.nickname, self.name, self.tax)
+
+
+class JackpotFreeParkingTile(FreeParkingTile):
+    """
+    A "Free Parking" tile which pays out the jackpot of taxes to whoever
+    stops on it.
+    """
+    def on_land(self, player):
+        super(JackpotFreeParkingTile, self).on_land(player)
+        jackpot = self.board.jackpot
+        if jackpot:
+            player.wallet.deposit(jackpot)
+            self.board.jackpot = 0
+            logger.debug('%s has collected the Free Parking jackpot of %d.', player.nickname, jackpot)
+
+
+class BonusGoTile(GoTile):
+    """
+    A "GO" tile which pays double the salary to whoever stops on it.
+    """
+    def on_land(self, player):
+        super(BonusGoTile, self).on_land(player)
+        player.wallet.deposit(conf.GO_TRANSIT_PAYMENT)
+        logger.debug('%s has collected a bonus of %d for stopping on GO.', player.nickname, conf.GO_TRANSIT_PAYMENT)
+
+
+class AuctionPropertyTile(PropertyTile):
+    """
+    A PropertyTile which is auctioned when it isn't bought.
+    """
+    def on_purchase_declined(self, player):
+        auction(self, player)
+
+
+class NoJailRentPropertyTile(PropertyTile):
+    """
+    A PropertyTile which collects no rent while its owner is in jail.
+    """
+    def charge_rent(self, player, price):
+        if self.owner.in_jail:
+            logger.debug('%s landed on "%s", its owner is in jail so no rent is due.', player.nickname, self.name)
+            return
+        super(NoJailRentPropertyTile, self).charge_rent(player, price)
+
+
+def auction(tile, player):
+    """
+    Auctions `tile` after `player` declined to buy it. Every active player
+    bids up to their `auction_bid_limit`, or their cash if it's less,
+    starting with `player`. The highest bidder wins, paying one more than
+    the next highest limit (or the opening bid); the earliest bidder wins
+    a tie. If nobody can meet the opening bid, the tile stays unowned.
+    """
+    players = tile.board.get_active_players()
+    start = players.index(player) if player in players else 0
+    bids = []
+    for bidder in players[start:] + players[:start]:
+        limit = min(bidder.auction_bid_limit(tile), bidder.cash)
+        if limit >= conf.AUCTION_OPENING_BID:
+            bids.append((limit, bidder))
+    if not bids:
+        logger.debug('Nobody bid for "%s" at auction.', tile.name)
+        return
+    bids.sort(key=lambda bid: -bid[0])
+    limit, winner = bids[0]
+    price = min(limit, bids[1][0] + 1) if len(bids) > 1 else conf.AUCTION_OPENING_BID
+    logger.debug('%s won "%s" at auction for %d.', winner.nickname, tile.name, price)
+    winner.purchase_property(tile, price)
+
+
+def resolve_tile_classes(rules):
+    """
+    Returns the tile class of each type of tile under the house `rules`,
+    a frozenset. Each rule swaps in a subclass of the standard tile,
+    which is combined with any other rule's for the same type.
+    """
+    if rules not in resolved_tile_classes:
+        tile_classes = dict(TILE_CLASSES)
+        if FREE_PARKING_JACKPOT in rules:
+            tile_classes['tax'] = JackpotTaxTile
+            tile_classes['freeparking'] = JackpotFreeParkingTile
+        if GO_LANDING_BONUS in rules:
+            tile_classes['go'] = BonusGoTile
+        property_bases = tuple(tile_class for rule, tile_class in ((NO_JAIL_RENT, NoJailRentPropertyTile),
+                                                                   (AUCTIONS, AuctionPropertyTile)) if rule in rules)
+        if property_bases:
+            property_class = property_bases[0]
+            if len(property_bases) > 1:
+                property_class = type('PropertyTile', property_bases, {})
+            for tile_type in ('property', 'station', 'utility'):
+                tile_classes[tile_type] = property_class
+        resolved_tile_classes[rules] = tile_classes
+    return resolved_tile_classes[rules]
+
+
+class RuleSet(object):
+    """
+    The house rules a board is played with, from `RULES`:
+
+    - 'free_parking_jackpot': taxes are paid into a jackpot, which whoever
+      stops on "Free Parking" collects.
+    - 'go_landing_bonus': stopping on "GO" pays double the salary.
+    - 'auctions': a property which isn't bought is auctioned.
+    - 'no_jail_rent': players collect no rent while they're in jail.
+
+    The rules are resolved once, into the tile classes the board is built
+    from, so turns never check which rules are in play and the standard
+    rules run the standard tiles.
+    """
+    def __init__(self, rules=()):
+        unknown = set(rules) - set(RULES)
+        if unknown:
+            raise ValueError('Unknown house rules: %s.' % ', '.join(sorted(unknown)))
+        self.rules = frozenset(rules)
+        self.tile_classes = resolve_tile_classes(self.rules)
+
+    def __repr__(self):
+        return '<RuleSet: %s>' % (', '.join(sorted(self.rules)) or 'standard')
+
+    def __contains__(self, rule):
+        return rule in self.rules
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+from optparse import OptionParser
+
+from .analyzer import analyze_log
+from .stats import TileStats
+
+parser = OptionParser(usage='%prog [options] sim.log')
+parser.add_option('-l', '--locale', action='store', type='string',
+                  default='en-gb', help='The Monopoly board game locale the games were played in.', dest='locale')
+parser.add_option('-w', '--workers', action='store', type='int',
+                  default=None, help='The number of worker processes (default: one per CPU).', dest='workers')
+parser.add_option('-c', '--chunks', action='store', type='int', default=None,
+                  help='The number of chunks the log is split into (default: four per worker).', dest='chunks')
+parser.add_option('--heatmap', action='store', type='choice', choices=TileStats.FIELDS, default=None,
+                  help='Print a heatmap of a per-tile statistic.', dest='heatmap')
+parser.add_option('--csv', action='store', type='string', default=None,
+                  help='Write the per-tile statistics to a CSV file.', dest='csv')
+(options, args) = parser.parse_args()
+
+
+if __name__ == '__main__':
+    if len(args) != 1:
+        parser.error('Pass the path of a single log.')
+    analysis = analyze_log(args[0], locale=options.locale, workers=options.workers, chunks=options.chunks)
+
+    print('Read %d games, averaging %.1f turns.' % (len(analysis.games), analysis.mean_turns))
+    for nickname, wins in sorted(analysis.wins_by_player().items(), key=lambda item: (-item[1], item[0])):
+        print('%s won %d games.' % (nickname, wins))
+    print(analysis.stats.as_table())
+    if options.heatmap:
+        print(analysis.stats.heatmap(options.heatmap))
+    if options.csv:
+        with open(options.csv, 'w') as fs:
+            analysis.stats.write_csv(fs)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+from optparse import OptionParser
+
+from .batch import run_batch
+from .cache import ResultCache
+from .estimators import ESTIMATORS, Z_95
+from .stats import TileStats
+
+parser = OptionParser()
+parser.add_option('-g', '--games', action='store', type='int',
+                  default=1000, help='The number of games to simulate.', dest='games')
+parser.add_option('-s', '--seed', action='store', type='int',
+                  default=0, help='The master seed of the batch.', dest='seed')
+parser.add_option('-p', '--players', action='store', type='int',
+                  default=2, help='The total number of players.', dest='players')
+parser.add_option('-l', '--locale', action='store', type='string',
+                  default='en-gb', help='The Monopoly board game locale.', dest='locale')
+parser.add_option('-t', '--max-turns', action='store', type='int',
+                  default=None, help='The number of turns after which a game is abandoned.', dest='max_turns')
+parser.add_option('-w', '--workers', action='store', type='int',
+                  default=None, help='The number of worker processes (default: one per CPU).', dest='workers')
+parser.add_option('--stats', action='store_true', default=False,
+                  help='Collect and print per-tile statistics.', dest='stats')
+parser.add_option('--heatmap', action='store', type='choice', choices=TileStats.FIELDS, default=None,
+                  help='Print a heatmap of a per-tile statistic.', dest='heatmap')
+parser.add_option('--csv', action='store', type='string', default=None,
+                  help='Write the per-tile statistics to a CSV file.', dest='csv')
+parser.add_option('-m', '--start-method', action='store', type='choice', choices=('fork', 'forkserver', 'spawn'),
+                  default=None, help='How worker processes are started (default: fork).', dest='start_method')
+parser.add_option('-e', '--estimator', action='store', type='choice', choices=ESTIMATORS, default=None,
+                  help='Play the games for a variance-reducing estimator: antithetic, control or stratified.',
+                  dest='estimator')
+parser.add_option('--player-class', action='store', type='string', default=None,
+                  help='The module.Class of the player under study (default: the standard player).',
+                  dest='player_class')
+parser.add_option('--timelines', action='store', type='string', default=None,
+                  help='Write every game\'s turn-by-turn timeline to a file.', dest='timelines')
+parser.add_option('--timeline-turns', action='store', type='int', default=None,
+                  help='Only keep the last turns of each timeline (default: all of them).', dest='timeline_turns')
+parser.add_option('--store', action='store', type='string', default=None,
+                  help='Also write the games and their config to a SQLite results database.', dest='store')
+parser.add_option('--cache', action='store', type='string', default=None,
+                  help='A directory to serve already played shards of games from, and to cache new ones in.',
+                  dest='cache')
+parser.add_option('--cache-size', action='store', type='int', default=1024,
+                  help='The most megabytes the cache may take before the least recently used shards are evicted.',
+                  dest='cache_size')
+(options, args) = parser.parse_args()
+
+
+if __name__ == '__main__':
+    collect_stats = bool(options.stats or options.heatmap or options.csv)
+    cache = ResultCache(options.cache, options.cache_size << 20) if options.cache else None
+    result = run_batch(options.games, seed=options.seed, num_players=options.players, locale=options.locale,
+                       max_turns=options.max_turns, workers=options.workers, collect_stats=collect_stats,
+                       start_method=options.start_method, estimator=options.estimator,
+                       player_class=options.player_class, timelines=options.timelines,
+                       timeline_capacity=options.timeline_turns, store=options.store, cache=cache)
+
+    print('Played %d games, averaging %.1f turns.' % (len(result.games), result.mean_turns))
+    if cache is not None:
+        print('Served %d of %d shards from the cache.' % (cache.hits, cache.hits + cache.misses))
+    for seat, wins in enumerate(result.wins_by_seat()):
+        print('Seat %d won %d games.' % (seat + 1, wins))
+    if options.estimator:
+        for metric in ('wins', 'turns'):
+            estimate = result.estimate(metric, options.estimator)
+            print('%s estimate of %s: %.4f +/- %.4f, variance %.2fx lower than plain averaging.' % (
+                options.estimator.capitalize(), metric, estimate.mean, Z_95 * estimate.stderr,
+                result.variance_reduction(metric, options.estimator)))
+    if options.stats:
+        print(result.stats.as_table())
+    if options.heatmap:
+        print(result.stats.heatmap(options.heatmap))
+    if options.csv:
+        with open(options.csv, 'w') as fs:
+            result.stats.write_csv(fs)
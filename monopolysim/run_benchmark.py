@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+import json
+from optparse import OptionParser
+
+from .benchmark import compare_interpreters, interpreter_version, run_benchmark, time_games
+
+
+def parse_counts(value):
+    return tuple(int(count) for count in value.split(','))
+
+
+parser = OptionParser()
+parser.add_option('--tiles', action='store', type='string', default='40,400,4000',
+                  help='The board sizes to time, comma separated (synthetic boards besides 40).', dest='tiles')
+parser.add_option('-p', '--players', action='store', type='string', default='2,8,32',
+                  help='The numbers of players to time, comma separated.', dest='players')
+parser.add_option('-t', '--turns', action='store', type='int', default=5000,
+                  help='The number of turns timed for each combination.', dest='turns')
+parser.add_option('-r', '--repeat', action='store', type='int', default=3,
+                  help='The number of runs of each combination, of which the fastest is kept.', dest='repeat')
+parser.add_option('-g', '--games', action='store', type='int', default=None,
+                  help='Time whole games per second instead, on the first board size and number of players.',
+                  dest='games')
+parser.add_option('-i', '--interpreters', action='store', type='string', default=None,
+                  help='Time the games under each of these Python executables, comma separated, e.g. python2.7,'
+                       'python3,pypy3.', dest='interpreters')
+parser.add_option('-s', '--seed', action='store', type='int', default=0,
+                  help='The master seed of the games timed.', dest='seed')
+parser.add_option('--warmup', action='store', type='int', default=50,
+                  help='The number of untimed games played first, so a JIT has warmed up.', dest='warmup')
+parser.add_option('--json', action='store_true', default=False,
+                  help='Print the games timing as JSON.', dest='json')
+(options, args) = parser.parse_args()
+
+
+if __name__ == '__main__':
+    tile_counts, player_counts = parse_counts(options.tiles), parse_counts(options.players)
+
+    if options.interpreters:
+        timings = compare_interpreters(options.interpreters.split(','), options.games or 200, tile_counts[0],
+                                       player_counts[0], options.seed, options.repeat, options.warmup)
+        fastest = max([timing.games_per_second for timing in timings if not timing.error] or [None])
+        print('Games per second, %d tiles, %d players:' % (tile_counts[0], player_counts[0]))
+        for timing in timings:
+            if timing.error:
+                print('%-16s failed: %s' % (timing.interpreter, timing.error))
+            else:
+                print('%-16s %-20s %10.1f %6.2fx' % (timing.interpreter, timing.version, timing.games_per_second,
+                                                     timing.games_per_second / fastest))
+        if len(set(timing.turns for timing in timings if not timing.error)) > 1:
+            print('Warning: the interpreters played different games.')
+    elif options.games:
+        games_per_second, turns = time_games(options.games, tile_counts[0], player_counts[0], options.seed,
+                                             options.repeat, options.warmup)
+        if options.json:
+            print(json.dumps({'version': interpreter_version(), 'games_per_second': games_per_second,
+                              'turns': turns}))
+        else:
+            print('%s played %.1f games per second.' % (interpreter_version(), games_per_second))
+    else:
+        results = run_benchmark(tile_counts, player_counts, options.turns, repeat=options.repeat)
+
+        print('Microseconds per turn:')
+        print('%8s' % 'Tiles' + ''.join('%12s' % ('%d players' % count) for count in player_counts))
+        for tile_count in tile_counts:
+            print('%8d' % tile_count + ''.join('%12.1f' % (results[tile_count, count] * 1e6)
+                                               for count in player_counts))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+from importlib import import_module
+from optparse import OptionParser
+
+from .compare import Variant, parse_overrides, run_comparison
+
+
+def parse_player_classes(path, seat, num_players):
+    if path is None:
+        return None
+    from .player import Player
+    module_name, class_name = path.rsplit('.', 1)
+    player_classes = [Player] * num_players
+    player_classes[seat] = getattr(import_module(module_name), class_name)
+    return player_classes
+
+
+parser = OptionParser()
+parser.add_option('-g', '--games', action='store', type='int',
+                  default=1000, help='The number of games to play under each variant.', dest='games')
+parser.add_option('-s', '--seed', action='store', type='int',
+                  default=0, help='The master seed of the comparison.', dest='seed')
+parser.add_option('-p', '--players', action='store', type='int',
+                  default=2, help='The total number of players.', dest='players')
+parser.add_option('-l', '--locale', action='store', type='string',
+                  default='en-gb', help='The Monopoly board game locale.', dest='locale')
+parser.add_option('-t', '--max-turns', action='store', type='int',
+                  default=None, help='The number of turns after which a game is abandoned.', dest='max_turns')
+parser.add_option('-w', '--workers', action='store', type='int',
+                  default=None, help='The number of worker processes (default: one per CPU).', dest='workers')
+parser.add_option('--seat', action='store', type='int',
+                  default=1, help='The seat whose outcomes are compared.', dest='seat')
+parser.add_option('--set', action='append', default=[],
+                  help='A NAME=VALUE conf setting for the candidate, e.g. GO_TRANSIT_PAYMENT=400.', dest='settings')
+parser.add_option('--baseline-set', action='append', default=[],
+                  help='A NAME=VALUE conf setting for the baseline.', dest='baseline_settings')
+parser.add_option('--player-class', action='store', type='string', default=None,
+                  help='The module.Class playing the seat under study in the candidate.', dest='player_class')
+parser.add_option('--baseline-player-class', action='store', type='string', default=None,
+                  help='The module.Class playing the seat under study in the baseline.', dest='baseline_player_class')
+(options, args) = parser.parse_args()
+
+
+if __name__ == '__main__':
+    seat = options.seat - 1
+    baseline = Variant('baseline', parse_overrides(options.baseline_settings),
+                       parse_player_classes(options.baseline_player_class, seat, options.players))
+    candidate = Variant('candidate', parse_overrides(options.settings),
+                        parse_player_classes(options.player_class, seat, options.players))
+    comparison = run_comparison(options.games, baseline, candidate, seed=options.seed, num_players=options.players,
+                                locale=options.locale, max_turns=options.max_turns, seat=seat,
+                                workers=options.workers)
+    print(comparison.summary())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+from multiprocessing import Process, cpu_count
+from optparse import OptionParser
+
+from .distributed import DEFAULT_PORT, run_coordinator, run_worker
+
+parser = OptionParser(usage='%prog [options] coordinator|worker')
+parser.add_option('-a', '--address', action='store', type='string', default='localhost:%d' % DEFAULT_PORT,
+                  help='The host:port the coordinator listens on, or the worker connects to.', dest='address')
+parser.add_option('-g', '--games', action='store', type='int',
+                  default=1000, help='The number of games to simulate.', dest='games')
+parser.add_option('-s', '--seed', action='store', type='int',
+                  default=0, help='The master seed of the batch.', dest='seed')
+parser.add_option('-p', '--players', action='store', type='int',
+                  default=2, help='The total number of players.', dest='players')
+parser.add_option('-l', '--locale', action='store', type='string',
+                  default='en-gb', help='The Monopoly board game locale.', dest='locale')
+parser.add_option('-t', '--max-turns', action='store', type='int',
+                  default=None, help='The number of turns after which a game is abandoned.', dest='max_turns')
+parser.add_option('-w', '--workers', action='store', type='int', default=None,
+                  help='Coordinator: the total number of worker processes across every host, used to size the '
+                       'shards. Worker: the number of worker processes to start (default: one per CPU).',
+                  dest='workers')
+parser.add_option('--lease-timeout', action='store', type='float', default=None,
+                  help='Re-issue shards which have not been returned after this many seconds (default: four '
+                       'times as long as the slowest shard has taken, and at least 30).', dest='lease_timeout')
+parser.add_option('--stats', action='store_true', default=False,
+                  help='Collect and print per-tile statistics.', dest='stats')
+(options, args) = parser.parse_args()
+
+
+if __name__ == '__main__':
+    if len(args) != 1 or args[0] not in ('coordinator', 'worker'):
+        parser.error('Either "coordinator" or "worker" is required.')
+    host, _, port = options.address.rpartition(':')
+    address = (host, int(port))
+
+    if args[0] == 'worker':
+        processes = [Process(target=run_worker, args=(address,)) for _ in range(options.workers or cpu_count())]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    else:
+        result = run_coordinator(options.games, seed=options.seed, num_players=options.players, locale=options.locale,
+                                 max_turns=options.max_turns, workers=options.workers, collect_stats=options.stats,
+                                 address=address, lease_timeout=options.lease_timeout)
+        print('Played %d games, averaging %.1f turns.' % (len(result.games), result.mean_turns))
+        for seat, wins in enumerate(result.wins_by_seat()):
+            print('Seat %d won %d games.' % (seat + 1, wins))
+        if options.stats:
+            print(result.stats.as_table())
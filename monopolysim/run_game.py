@@ -1,18 +1,46 @@
 #!/usr/bin/env python
 
+import logging
 from optparse import OptionParser
-from board import Board
+
+from . import conf
+from .board import Board
+from .viewer import watch, record, replay
 
 parser = OptionParser()
 parser.add_option('-p', '--players', action='store', type='int',
                   default=2, help='The total number of players.', dest='players')
 parser.add_option('-l', '--locale', action='store', type='string',
                   default='en-gb', help='The Monopoly board game locale.', dest='locale')
-parser.add_option('-f', '--fast', action='store_true', default=False, help='Play the game in fast mode.', dest='fast')
+parser.add_option('-s', '--seed', action='store', type='int',
+                  default=None, help='The seed of the dice stream.', dest='seed')
+parser.add_option('-f', '--fast', action='store_true', default=False,
+                  help='Deprecated: games are always played at full speed.', dest='fast')
+parser.add_option('-w', '--watch', action='store_true', default=False,
+                  help='Watch the game in the terminal while it is played.', dest='watch')
+parser.add_option('--fps', action='store', type='int', default=conf.VIEWER_FRAME_RATE,
+                  help='The number of frames the viewer draws per second.', dest='fps')
+parser.add_option('-r', '--record', action='store', type='string', default=None,
+                  help='Play the game and record a trace of it to a file.', dest='record')
+parser.add_option('--replay', action='store', type='string', default=None,
+                  help='Watch a recorded trace instead of playing a game.', dest='replay')
+parser.add_option('--speed', action='store', type='float', default=10.0,
+                  help='The number of turns replayed per second.', dest='speed')
 (options, args) = parser.parse_args()
 
 
 if __name__ == '__main__':
-    game = Board(num_players=options.players, locale=options.locale, fast=options.fast)
-    game.setup()
-    game.start()
+    logging.basicConfig(format='%(message)s', filename='sim.log', level=logging.DEBUG)
+    if options.replay:
+        with open(options.replay) as fs:
+            replay(fs, speed=options.speed, fps=options.fps)
+    else:
+        game = Board(num_players=options.players, locale=options.locale, seed=options.seed)
+        game.setup()
+        if options.record:
+            with open(options.record, 'w') as fs:
+                record(game, fs, max_turns=conf.MAX_GAME_TURNS)
+        elif options.watch:
+            watch(game, fps=options.fps, max_turns=conf.MAX_GAME_TURNS)
+        else:
+            game.start()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+import sys
+from importlib import import_module
+from optparse import OptionParser
+
+from .harness import run_sweep
+
+parser = OptionParser(usage='%prog [options] module.EngineClass')
+parser.add_option('-g', '--games', action='store', type='int',
+                  default=10000, help='The number of seeded games to compare.', dest='games')
+parser.add_option('-s', '--seed', action='store', type='int',
+                  default=0, help='The first seed of the sweep.', dest='seed')
+parser.add_option('-p', '--players', action='store', type='int',
+                  default=2, help='The total number of players.', dest='players')
+parser.add_option('-l', '--locale', action='store', type='string',
+                  default='en-gb', help='The Monopoly board game locale.', dest='locale')
+parser.add_option('-t', '--max-turns', action='store', type='int',
+                  default=None, help='The number of turns after which a game is abandoned.', dest='max_turns')
+parser.add_option('-w', '--workers', action='store', type='int',
+                  default=None, help='The number of worker processes (default: one per CPU).', dest='workers')
+parser.add_option('-m', '--start-method', action='store', type='choice', choices=('fork', 'forkserver', 'spawn'),
+                  default=None, help='How worker processes are started (default: fork).', dest='start_method')
+(options, args) = parser.parse_args()
+
+
+if __name__ == '__main__':
+    if len(args) != 1:
+        parser.error('The candidate engine class is required, e.g. mypackage.fastboard.FastBoard')
+    module_name, class_name = args[0].rsplit('.', 1)
+    candidate = getattr(import_module(module_name), class_name)
+
+    result = run_sweep(candidate, options.games, start_seed=options.seed, num_players=options.players,
+                       locale=options.locale, max_turns=options.max_turns, workers=options.workers,
+                       start_method=options.start_method)
+    print('Compared %d games, found %d mismatches.' % (result.games, result.mismatch_count))
+    if result.minimal is not None:
+        minimal = result.minimal
+        print('Minimal failing game: seed %d with %d players, turn %d.' % (
+            minimal.seed, minimal.num_players, minimal.turn))
+        print('Expected: %r' % (minimal.expected,))
+        print('Actual:   %r' % (minimal.actual,))
+        sys.exit(1)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+import os
+from optparse import OptionParser
+
+from .optimizer import Optimizer, measure
+
+parser = OptionParser()
+parser.add_option('-n', '--generations', action='store', type='int',
+                  default=20, help='The total number of generations to evolve.', dest='generations')
+parser.add_option('--population', action='store', type='int',
+                  default=16, help='The number of candidates in each generation.', dest='population')
+parser.add_option('-g', '--games', action='store', type='int',
+                  default=200, help='The number of games each candidate plays per generation.', dest='games')
+parser.add_option('--validation-games', action='store', type='int',
+                  default=2000, help='The number of fresh games the best candidate is measured on.',
+                  dest='validation_games')
+parser.add_option('-s', '--seed', action='store', type='int',
+                  default=0, help='The master seed of the search.', dest='seed')
+parser.add_option('-p', '--players', action='store', type='int',
+                  default=2, help='The total number of players.', dest='players')
+parser.add_option('-l', '--locale', action='store', type='string',
+                  default='en-gb', help='The Monopoly board game locale.', dest='locale')
+parser.add_option('-t', '--max-turns', action='store', type='int',
+                  default=None, help='The number of turns after which a game is abandoned.', dest='max_turns')
+parser.add_option('-w', '--workers', action='store', type='int',
+                  default=None, help='The number of worker processes (default: one per CPU).', dest='workers')
+parser.add_option('--mutation', action='store', type='float',
+                  default=0.1, help='The mutation step, as a fraction of each parameter\'s range.', dest='mutation')
+parser.add_option('--checkpoint', action='store', type='string', default=None,
+                  help='A file to save the search to after every generation, and resume it from.',
+                  dest='checkpoint')
+parser.add_option('--start-method', action='store', type='string', default=None,
+                  help='How pool workers are started: fork (default) or forkserver.', dest='start_method')
+(options, args) = parser.parse_args()
+
+
+if __name__ == '__main__':
+    if options.checkpoint and os.path.exists(options.checkpoint):
+        optimizer = Optimizer.load(options.checkpoint)
+        print('Resuming from generation %d.' % optimizer.generation)
+    else:
+        optimizer = Optimizer(options.population, options.games, options.players, options.locale, options.max_turns,
+                              options.seed, mutation=options.mutation, checkpoint=options.checkpoint)
+
+    while optimizer.generation < options.generations:
+        record = optimizer.step(options.workers, options.start_method)
+        print('Generation %3d: best %.3f, mean %.3f' % (record['generation'], record['best'], record['mean']))
+
+    parameters, _ = optimizer.best
+    win_rate, difference = measure(parameters, options.validation_games, optimizer.seed, optimizer.num_players,
+                                   optimizer.locale, optimizer.max_turns, options.workers, options.start_method)
+    print('Best parameters: %s' % ', '.join('%s=%d' % item for item in sorted(parameters.items())))
+    print('Win rate against default players: %.4f, 95%% CI [%.4f, %.4f]' % ((win_rate.mean,) + win_rate.interval()))
+    print('Compared to a default player: %+.4f, 95%% CI [%+.4f, %+.4f]' % ((difference.mean,) +
+                                                                          difference.interval()))
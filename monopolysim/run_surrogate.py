@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+from optparse import OptionParser
+
+from .batch import run_batch
+from .compare import configured, parse_overrides
+from .estimators import Z_95
+from .store import ResultStore
+from .surrogate import MAX_TURNS_STDERR, MAX_WIN_RATE_STDERR, MEAN, QUANTILES, Surrogate
+
+parser = OptionParser()
+parser.add_option('--store', action='store', type='string', default=None,
+                  help='The SQLite results database of the batches to fit.', dest='store')
+parser.add_option('-p', '--players', action='store', type='int',
+                  default=2, help='The total number of players.', dest='players')
+parser.add_option('-l', '--locale', action='store', type='string',
+                  default='en-gb', help='The Monopoly board game locale.', dest='locale')
+parser.add_option('-t', '--max-turns', action='store', type='int',
+                  default=None, help='The number of turns after which a game is abandoned.', dest='max_turns')
+parser.add_option('--player-class', action='store', type='string', default=None,
+                  help='The module.Class of the player under study (default: the standard player).',
+                  dest='player_class')
+parser.add_option('--set', action='append', default=[],
+                  help='A NAME=VALUE conf setting to predict for, e.g. INITIAL_PLAYER_CASH=1750.', dest='settings')
+parser.add_option('--degree', action='store', type='int', default=2,
+                  help='The highest degree of the fitted polynomials.', dest='degree')
+parser.add_option('--max-win-rate-stderr', action='store', type='float', default=MAX_WIN_RATE_STDERR,
+                  help='The largest standard error of a win rate which is relied on.', dest='max_win_rate_stderr')
+parser.add_option('--max-turns-stderr', action='store', type='float', default=MAX_TURNS_STDERR,
+                  help='The largest standard error of game length which is relied on.', dest='max_turns_stderr')
+parser.add_option('--fill', action='store', type='int', default=None,
+                  help='Play this many games of the config if the prediction is uncertain, and refit.', dest='fill')
+parser.add_option('-s', '--seed', action='store', type='int',
+                  default=0, help='The master seed of the games played to fill in.', dest='seed')
+parser.add_option('-w', '--workers', action='store', type='int',
+                  default=None, help='The number of worker processes (default: one per CPU).', dest='workers')
+(options, args) = parser.parse_args()
+
+
+def describe(estimate, format):
+    if estimate is None:
+        return 'no model'
+    return (format + ' +/- ' + format) % (estimate.mean, Z_95 * estimate.stderr)
+
+
+def report(surrogate, overrides):
+    prediction = surrogate.predict(overrides, options.players)
+    print('Fitted %d configs over %s.' % (len(surrogate.observations), ', '.join(surrogate.features) or 'nothing'))
+    for seat, estimate in enumerate(prediction.win_rates):
+        print('Seat %d win rate: %s' % (seat + 1, describe(estimate, '%.4f')))
+    print('Mean turns: %s' % describe(prediction.turns[MEAN], '%.1f'))
+    for quantile in QUANTILES:
+        print('%d%% of games within: %s turns' % (quantile * 100, describe(prediction.turns[quantile], '%.1f')))
+    reasons = prediction.reasons(options.max_win_rate_stderr, options.max_turns_stderr)
+    for reason in reasons:
+        print('Uncertain: %s.' % reason)
+    return reasons
+
+
+if __name__ == '__main__':
+    if options.store is None:
+        parser.error('--store is required.')
+    overrides = parse_overrides(options.settings)
+    store = ResultStore(options.store)
+
+    def fit():
+        return Surrogate.from_store(store, locale=options.locale, player_class=options.player_class,
+                                    max_turns=options.max_turns, degree=options.degree)
+
+    try:
+        reasons = report(fit(), overrides)
+    except ValueError as e:
+        print(e)
+        reasons = [str(e)]
+    if reasons and options.fill:
+        with configured(overrides):
+            run_batch(options.fill, seed=options.seed, num_players=options.players, locale=options.locale,
+                      max_turns=options.max_turns, workers=options.workers, player_class=options.player_class,
+                      store=options.store)
+        print('Played %d games of the config; refitting.' % options.fill)
+        report(fit(), overrides)
+    store.close()
@@ -1,17 +1,59 @@
 #!/usr/bin/env python
 
 from unittest import TestLoader, TextTestRunner, TestSuite
-from tests.test_board import BoardTestCase
-from tests.test_player import PlayerTestCase
-from tests.test_tiles import TileTestCase
+from .tests.test_analyzer import AnalyzerTestCase
+from .tests.test_benchmark import BenchmarkTestCase
+from .tests.test_board import BoardTestCase
+from .tests.test_building import BuildingTestCase
+from .tests.test_cache import CacheTestCase
+from .tests.test_cards import CardTestCase
+from .tests.test_compare import CompareTestCase
+from .tests.test_distributed import DistributedTestCase
+from .tests.test_estimators import EstimatorsTestCase
+from .tests.test_events import EventsTestCase
+from .tests.test_expectimax import ExpectimaxTestCase
+from .tests.test_harness import HarnessTestCase
+from .tests.test_liquidation import LiquidationTestCase
+from .tests.test_optimizer import OptimizerTestCase
+from .tests.test_parallel import ParallelTestCase
+from .tests.test_player import PlayerTestCase
+from .tests.test_rules import RulesTestCase
+from .tests.test_tiles import TileTestCase
+from .tests.test_stats import StatsTestCase
+from .tests.test_store import StoreTestCase
+from .tests.test_surrogate import SurrogateTestCase
+from .tests.test_timeline import TimelineTestCase
+from .tests.test_trading import TradingTestCase
+from .tests.test_viewer import ViewerTestCase
 
 
 if __name__ == "__main__":
     loader = TestLoader()
     suite = TestSuite((
+        loader.loadTestsFromTestCase(AnalyzerTestCase),
+        loader.loadTestsFromTestCase(BenchmarkTestCase),
         loader.loadTestsFromTestCase(BoardTestCase),
+        loader.loadTestsFromTestCase(BuildingTestCase),
+        loader.loadTestsFromTestCase(CacheTestCase),
+        loader.loadTestsFromTestCase(CardTestCase),
+        loader.loadTestsFromTestCase(CompareTestCase),
+        loader.loadTestsFromTestCase(DistributedTestCase),
+        loader.loadTestsFromTestCase(EstimatorsTestCase),
+        loader.loadTestsFromTestCase(EventsTestCase),
+        loader.loadTestsFromTestCase(ExpectimaxTestCase),
+        loader.loadTestsFromTestCase(HarnessTestCase),
+        loader.loadTestsFromTestCase(LiquidationTestCase),
+        loader.loadTestsFromTestCase(OptimizerTestCase),
+        loader.loadTestsFromTestCase(ParallelTestCase),
         loader.loadTestsFromTestCase(PlayerTestCase),
-        loader.loadTestsFromTestCase(TileTestCase)
+        loader.loadTestsFromTestCase(RulesTestCase),
+        loader.loadTestsFromTestCase(TileTestCase),
+        loader.loadTestsFromTestCase(StatsTestCase),
+        loader.loadTestsFromTestCase(StoreTestCase),
+        loader.loadTestsFromTestCase(SurrogateTestCase),
+        loader.loadTestsFromTestCase(TimelineTestCase),
+        loader.loadTestsFromTestCase(TradingTestCase),
+        loader.loadTestsFromTestCase(ViewerTestCase)
     ))
     runner = TextTestRunner(verbosity=2)
     runner.run(suite)
@@ -0,0 +1,168 @@
+import csv
+from array import array
+from operator import add
+
+from .layout import ring_layout
+
+try:
+    array('q')
+    COUNTER_TYPECODE = 'q'
+except ValueError:
+    # Python 2's arrays have no 64 bit type; 'l' is 64 bits, except on Windows.
+    COUNTER_TYPECODE = 'l'
+
+
+class TileStats(object):
+    """
+    Per-tile counters, kept as integer arrays indexed by a tile's position
+    in the locale template (i.e. `tile.step - 1`):
+
+    - `landings` counts how many times a player stopped on the tile.
+    - `rent` totals the rent collected on the tile, i.e. what was paid
+      rather than charged when the payer went bankrupt.
+    - `purchases` counts how many times the tile was bought.
+    - `purchase_turns` totals the turn numbers on which it was bought.
+    - `bankruptcies` counts the players who went bankrupt on the tile.
+
+    Counters are only maintained for boards passed to `bind`, which wraps
+    the relevant methods of that game's board and players. Games which
+    aren't bound run the engine untouched, so disabled statistics cost
+    nothing.
+    """
+    FIELDS = ('landings', 'rent', 'purchases', 'purchase_turns', 'bankruptcies')
+
+    def __init__(self, tile_names):
+        self.tile_names = list(tile_names)
+        self.games = 0
+        for field in self.FIELDS:
+            setattr(self, field, array(COUNTER_TYPECODE, [0]) * len(self.tile_names))
+
+    def __repr__(self):
+        return '<TileStats: %d tiles, %d games>' % (len(self.tile_names), self.games)
+
+    @classmethod
+    def for_board(cls, board):
+        return cls(tile.name for tile in board.tiles)
+
+    def bind(self, board):
+        """
+        Starts counting events in `board`'s game.
+        """
+        for player in board.players:
+            self._bind_player(board, player)
+        self.games += 1
+
+    def _bind_player(self, board, player):
+        landings = self.landings
+        rent = self.rent
+        purchases = self.purchases
+        purchase_turns = self.purchase_turns
+        bankruptcies = self.bankruptcies
+        handle_land_on_tile = player.handle_land_on_tile
+        pay_rent = player.pay_rent
+        purchase_property = player.purchase_property
+        declare_bankruptcy = player.declare_bankruptcy
+
+        def counted_handle_land_on_tile(tile, dice_roll, rent_price=None):
+            landings[tile.step - 1] += 1
+            return handle_land_on_tile(tile, dice_roll, rent_price)
+
+        def counted_pay_rent(tile, price):
+            paid = pay_rent(tile, price)
+            rent[tile.step - 1] += paid
+            return paid
+
+        def counted_purchase_property(tile, price=None):
+            purchases[tile.step - 1] += 1
+            purchase_turns[tile.step - 1] += board.turn
+            return purchase_property(tile, price)
+
+        def counted_declare_bankruptcy(creditor=None):
+            # Players also go bankrupt in others' turns, e.g. paying for a birthday card.
+            bankruptcies[player.tile.step - 1] += 1
+            return declare_bankruptcy(creditor)
+
+        player.handle_land_on_tile = counted_handle_land_on_tile
+        player.pay_rent = counted_pay_rent
+        player.purchase_property = counted_purchase_property
+        player.declare_bankruptcy = counted_declare_bankruptcy
+
+    def to_dict(self):
+        """
+        Returns the counters as plain lists, e.g. to send them as JSON.
+        """
+        data = dict((field, list(getattr(self, field))) for field in self.FIELDS)
+        data['tile_names'] = self.tile_names
+        data['games'] = self.games
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data['tile_names'])
+        stats.games = data['games']
+        for field in cls.FIELDS:
+            setattr(stats, field, array(COUNTER_TYPECODE, data[field]))
+        return stats
+
+    def merge(self, other):
+        """
+        Adds `other`'s counters, from the same board template, to these.
+        """
+        if other.tile_names != self.tile_names:
+            raise ValueError('Cannot merge statistics from different board templates.')
+        for field in self.FIELDS:
+            setattr(self, field, array(COUNTER_TYPECODE, map(add, getattr(self, field), getattr(other, field))))
+        self.games += other.games
+        return self
+
+    def rows(self):
+        """
+        Returns one row per tile: its name, followed by each counter and
+        the average turn on which the tile was bought.
+        """
+        rows = []
+        for index, name in enumerate(self.tile_names):
+            row = [name] + [getattr(self, field)[index] for field in self.FIELDS]
+            purchases = self.purchases[index]
+            row.append(float(self.purchase_turns[index]) / purchases if purchases else None)
+            rows.append(row)
+        return rows
+
+    def write_csv(self, fs):
+        """
+        Writes the table of `rows` to the file object `fs`.
+        """
+        writer = csv.writer(fs)
+        writer.writerow(('tile',) + self.FIELDS + ('mean_purchase_turn',))
+        writer.writerows(self.rows())
+
+    def as_table(self):
+        """
+        Returns the table of `rows` as aligned text.
+        """
+        header = ('Tile', 'Landings', 'Rent', 'Purchases', 'Purchase turns', 'Bankruptcies', 'Mean purchase turn')
+        lines = ['%-24s %10s %12s %10s %15s %13s %19s' % header]
+        for row in self.rows():
+            mean_purchase_turn = '-' if row[-1] is None else '%.1f' % row[-1]
+            lines.append('%-24s %10d %12d %10d %15d %13d %19s' % tuple(row[:-1] + [mean_purchase_turn]))
+        return '\n'.join(lines)
+
+    def heatmap(self, field='landings', shades=' .:-=+*#%@'):
+        """
+        Renders `field` as text, laid out around the board. Each tile shows
+        its share of the total as a percentage, shaded by its intensity.
+        """
+        values = getattr(self, field)
+        total = sum(values) or 1
+        highest = max(values) or 1
+        lines = []
+        for row in ring_layout(len(self.tile_names)):
+            cells = []
+            for index in row:
+                if index is None:
+                    cells.append(' ' * 7)
+                    continue
+                shade = shades[values[index] * (len(shades) - 1) // highest]
+                cells.append('%s%5.1f ' % (shade, 100.0 * values[index] / total))
+            lines.append(''.join(cells).rstrip())
+        return '\n'.join(lines)
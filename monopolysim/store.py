@@ -0,0 +1,244 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+from . import conf
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS configs (hash TEXT PRIMARY KEY, config TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS settings (config_hash TEXT NOT NULL, name TEXT NOT NULL, value NUMERIC, '
+    'PRIMARY KEY (config_hash, name))',
+    'CREATE INDEX IF NOT EXISTS settings_by_value ON settings (name, value)',
+    'CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, config_hash TEXT NOT NULL, locale TEXT NOT NULL, '
+    'num_players INTEGER NOT NULL, seed INTEGER NOT NULL, games INTEGER NOT NULL, created REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS runs_by_config ON runs (config_hash)',
+    'CREATE INDEX IF NOT EXISTS runs_by_locale ON runs (locale, num_players)',
+    'CREATE INDEX IF NOT EXISTS runs_by_players ON runs (num_players)',
+    'CREATE INDEX IF NOT EXISTS runs_by_seed ON runs (seed)',
+    'CREATE TABLE IF NOT EXISTS games (run_id INTEGER NOT NULL, game INTEGER NOT NULL, seed INTEGER NOT NULL, '
+    'turns INTEGER NOT NULL, winner INTEGER, seat INTEGER NOT NULL, antithetic INTEGER NOT NULL, '
+    'cash TEXT NOT NULL)',
+    'CREATE UNIQUE INDEX IF NOT EXISTS games_by_run ON games (run_id, game)',
+    'CREATE INDEX IF NOT EXISTS games_by_seed ON games (seed)',
+)
+
+INSERT_GAME = ('INSERT INTO games (run_id, game, seed, turns, winner, seat, antithetic, cash) '
+               'VALUES (?, ?, ?, ?, ?, ?, ?, ?)')
+
+# `conf` settings which don't change how games are played.
+DISPLAY_SETTINGS = ('VIEWER_FRAME_RATE',)
+
+
+def connect(path):
+    """
+    Opens the results database at `path`, creating its tables if needed.
+    Its journal is written ahead, so queries can run while a batch writes.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    with connection:
+        for statement in SCHEMA:
+            connection.execute(statement)
+    return connection
+
+
+def game_settings():
+    """
+    The current numeric `conf` settings which affect how games are played,
+    and the house rules, comma separated.
+    """
+    settings = {'HOUSE_RULES': ','.join(sorted(conf.HOUSE_RULES))}
+    for name in dir(conf):
+        value = getattr(conf, name)
+        if name.isupper() and name not in DISPLAY_SETTINGS and isinstance(value, (int, float)) \
+                and not isinstance(value, bool):
+            settings[name] = value
+    return settings
+
+
+def config_metadata(locale='en-gb', num_players=2, max_turns=None, estimator=None, player_class=None):
+    """
+    Describes how a batch's games were played: its arguments, and the
+    `conf` settings at the time.
+    """
+    return {
+        'locale': locale,
+        'num_players': num_players,
+        'max_turns': max_turns,
+        'estimator': estimator,
+        'player_class': player_class,
+        'settings': game_settings(),
+    }
+
+
+def config_hash(config):
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResultStore(object):
+    """
+    A SQLite database of batch results, which can be queried across runs.
+
+    Every run records the hash of its config (see `config_metadata`), and
+    each config's settings are kept one per row, so runs can be selected
+    by any of them:
+
+        store = ResultStore('results.db')
+        store.win_rates(locale='en-gb', num_players=4, settings={'INITIAL_PLAYER_CASH': 2500})
+
+    Games are written by a `ResultWriter`.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.connection = connect(path)
+
+    def __repr__(self):
+        return '<ResultStore: %s>' % self.path
+
+    def add_run(self, config, seed, games):
+        """
+        Records a run of `games` games with master `seed`, and returns its id.
+        """
+        digest = config_hash(config)
+        with self.connection:
+            self.connection.execute('INSERT OR IGNORE INTO configs (hash, config) VALUES (?, ?)',
+                                    (digest, json.dumps(config, sort_keys=True)))
+            self.connection.executemany('INSERT OR IGNORE INTO settings (config_hash, name, value) VALUES (?, ?, ?)',
+                                        [(digest, name, value) for name, value in config['settings'].items()])
+            cursor = self.connection.execute(
+                'INSERT INTO runs (config_hash, locale, num_players, seed, games, created) VALUES (?, ?, ?, ?, ?, ?)',
+                (digest, config['locale'], config['num_players'], seed, games, time.time()))
+        return cursor.lastrowid
+
+    def select_runs(self, locale=None, num_players=None, seed=None, config_hash=None, settings=None):
+        """
+        Returns the SQL condition on `runs` matching the given filters, and
+        its parameters.
+        """
+        conditions, parameters = [], []
+        for column, value in (('locale', locale), ('num_players', num_players), ('seed', seed),
+                              ('config_hash', config_hash)):
+            if value is not None:
+                conditions.append('runs.%s = ?' % column)
+                parameters.append(value)
+        for name, value in sorted((settings or {}).items()):
+            conditions.append('runs.config_hash IN (SELECT config_hash FROM settings WHERE name = ? AND value = ?)')
+            parameters.extend((name, value))
+        return ' AND '.join(conditions) or '1', parameters
+
+    def runs(self, **filters):
+        """
+        Returns `(id, config_hash, locale, num_players, seed, games)` for
+        every matching run (see `select_runs`).
+        """
+        condition, parameters = self.select_runs(**filters)
+        return self.connection.execute(
+            'SELECT id, config_hash, locale, num_players, seed, games FROM runs WHERE %s ORDER BY id' % condition,
+            parameters).fetchall()
+
+    def config(self, digest):
+        row = self.connection.execute('SELECT config FROM configs WHERE hash = ?', (digest,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def config_hashes(self, **filters):
+        """
+        Returns the hash of every matching run's config, once each.
+        """
+        condition, parameters = self.select_runs(**filters)
+        return [row[0] for row in self.connection.execute(
+            'SELECT DISTINCT config_hash FROM runs WHERE %s ORDER BY config_hash' % condition, parameters)]
+
+    def outcomes(self, **filters):
+        """
+        Returns `(turns, winner)` for every game of every matching run.
+        """
+        condition, parameters = self.select_runs(**filters)
+        return self.connection.execute(
+            'SELECT games.turns, games.winner FROM games JOIN runs ON games.run_id = runs.id WHERE %s '
+            'ORDER BY games.run_id, games.game' % condition, parameters).fetchall()
+
+    def count_games(self, **filters):
+        condition, parameters = self.select_runs(**filters)
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM games JOIN runs ON games.run_id = runs.id WHERE %s' % condition,
+            parameters).fetchone()[0]
+
+    def win_rates(self, **filters):
+        """
+        Returns `{seat: win rate}` over the games of every matching run.
+        """
+        condition, parameters = self.select_runs(**filters)
+        rows = self.connection.execute(
+            'SELECT games.winner, COUNT(*) FROM games JOIN runs ON games.run_id = runs.id WHERE %s '
+            'GROUP BY games.winner' % condition, parameters).fetchall()
+        total = sum(count for _, count in rows)
+        return dict((winner, float(count) / total) for winner, count in rows if winner is not None)
+
+    def close(self):
+        self.connection.close()
+
+
+class ResultWriter(object):
+    """
+    The single writer of games into a `ResultStore` at `path`.
+
+    `write` only queues a chunk of games, so the batch runner goes straight
+    back to collecting results from its pool. A background thread, with a
+    connection of its own, inserts them in transactions of at least
+    `batch_size` games. `close` writes whatever's left, and raises any
+    error the thread met.
+    """
+    def __init__(self, path, batch_size=20000):
+        self.path = path
+        self.batch_size = batch_size
+        # Bounded, so a stalled disk holds the batch back rather than
+        # filling memory with results.
+        self.queue = Queue(64)
+        self.error = None
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def __repr__(self):
+        return '<ResultWriter: %s>' % self.path
+
+    def write(self, run_id, start, games):
+        """
+        Queues `games`, a list of `GameResult`s, as games `start` onwards of
+        run `run_id`.
+        """
+        self.queue.put([(run_id, start + index, game.seed, game.turns, game.winner, game.seat, int(game.antithetic),
+                         json.dumps(list(game.cash))) for index, game in enumerate(games)])
+
+    def run(self):
+        connection = connect(self.path)
+        rows = []
+        while True:
+            chunk = self.queue.get()
+            if chunk is not None:
+                rows.extend(chunk)
+            if rows and (chunk is None or len(rows) >= self.batch_size):
+                try:
+                    with connection:
+                        connection.executemany(INSERT_GAME, rows)
+                except sqlite3.Error as e:
+                    # Keep draining the queue, so `write` never blocks.
+                    self.error = self.error or e
+                rows = []
+            if chunk is None:
+                break
+        connection.close()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
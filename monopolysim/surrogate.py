@@ -0,0 +1,294 @@
+from math import ceil, floor, sqrt
+
+from . import conf
+from .estimators import Estimate, Z_95, solve
+from .store import game_settings
+
+# What the surrogate predicts of each config's games: each seat's win
+# rate, and the mean and these quantiles of the number of turns played.
+WIN_RATE = 'win_rate'
+TURNS = 'turns'
+MEAN = 'mean'
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# The feature for the number of players, alongside the `conf` settings.
+NUM_PLAYERS = 'num_players'
+
+# Predictions less certain than this are flagged (see `Prediction.reasons`).
+MAX_WIN_RATE_STDERR = 0.02
+MAX_TURNS_STDERR = 5.0
+
+# The least standard error of a quantile of turns, which are whole numbers.
+MIN_QUANTILE_STDERR = 0.5
+
+
+def quantile_estimate(turns, quantile):
+    """
+    Estimates `quantile` of the sorted `turns`, with a standard error from
+    the order statistics bracketing it with 95% confidence, which makes no
+    assumption about the shape of the distribution.
+    """
+    count = len(turns)
+    position = quantile * count
+    spread = Z_95 * sqrt(count * quantile * (1 - quantile))
+    low = turns[max(0, int(floor(position - spread)))]
+    high = turns[min(count - 1, int(ceil(position + spread)))]
+    stderr = max((high - low) / (2 * Z_95), MIN_QUANTILE_STDERR)
+    return Estimate(float(turns[min(count - 1, int(position))]), stderr ** 2, 1)
+
+
+def summarize(num_players, games):
+    """
+    Returns `{target: Estimate}` of the `(turns, winner)` `games` played
+    under one config. A win rate's variance is that of its proportion with
+    a win and a loss added, so seats which never or always won still have
+    some uncertainty.
+    """
+    count = len(games)
+    turns = sorted(game_turns for game_turns, _ in games)
+    targets = {(TURNS, MEAN): Estimate.from_values(turns)}
+    for quantile in QUANTILES:
+        targets[TURNS, quantile] = quantile_estimate(turns, quantile)
+    for seat in range(num_players):
+        wins = sum(1 for _, winner in games if winner == seat)
+        smoothed = (wins + 1.0) / (count + 2)
+        targets[WIN_RATE, seat] = Estimate(float(wins) / count, smoothed * (1 - smoothed), count)
+    return targets
+
+
+class Observation(object):
+    """
+    The games played under one config (see `store.config_metadata`): the
+    config's settings and number of players, as a `point`, and the
+    estimate of each target from its games.
+    """
+    def __init__(self, config, games):
+        self.config = config
+        self.point = dict(config['settings'])
+        self.point[NUM_PLAYERS] = config['num_players']
+        self.games = len(games)
+        self.targets = summarize(config['num_players'], games)
+
+    def __repr__(self):
+        return '<Observation: %d players, %d games>' % (self.point[NUM_PLAYERS], self.games)
+
+
+def load_observations(store, locale='en-gb', player_class=None, max_turns=None, house_rules=None):
+    """
+    Returns an `Observation` for each config of the runs in `store` played
+    in `locale` by `player_class`, abandoned after `max_turns`, and under
+    `house_rules` (by default, those in `conf`).
+    """
+    rules = ','.join(sorted(conf.HOUSE_RULES if house_rules is None else house_rules))
+    observations = []
+    for digest in store.config_hashes(locale=locale):
+        config = store.config(digest)
+        if (config['player_class'], config['max_turns'], config['settings'].get('HOUSE_RULES', '')) != \
+                (player_class, max_turns, rules):
+            continue
+        games = store.outcomes(config_hash=digest)
+        if games:
+            observations.append(Observation(config, games))
+    return observations
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def varying_features(observations):
+    """
+    The numeric settings, and the number of players, which differ between
+    `observations`.
+    """
+    names = set(observations[0].point)
+    for observation in observations[1:]:
+        names &= set(observation.point)
+    return sorted(name for name in names if all(is_number(observation.point[name]) for observation in observations)
+                  and len(set(observation.point[name] for observation in observations)) > 1)
+
+
+def count_terms(features, degree):
+    return 1 + len(features) + (len(features) * (len(features) + 1) // 2 if degree > 1 else 0)
+
+
+class Model(object):
+    """
+    A polynomial of `degree` in the features, fitted to observations of
+    one target by weighted least squares: each observation is weighted by
+    its precision, so those of more games count for more. `rows` are each
+    observation's terms (see `Surrogate.terms`).
+
+    A prediction's variance is that of the fitted polynomial at its terms,
+    scaled up by how much worse the fit is than the observations'
+    variances alone would explain, if it is.
+    """
+    def __init__(self, degree, rows, estimates):
+        self.degree = degree
+        width = len(rows[0])
+        weights = [1.0 / max(estimate.stderr ** 2, 1e-12) for estimate in estimates]
+        normal = [[sum(weight * row[i] * row[j] for weight, row in zip(weights, rows)) for j in range(width)]
+                  for i in range(width)]
+        moments = [sum(weight * row[i] * estimate.mean for weight, row, estimate in zip(weights, rows, estimates))
+                   for i in range(width)]
+        self.coefficients = solve(normal, moments)
+        if self.coefficients is None:
+            raise ValueError('The observations are too few, or too alike, to fit %d terms.' % width)
+        self.covariance = list(zip(*[solve(normal, [float(i == j) for i in range(width)]) for j in range(width)]))
+        self.dof = len(rows) - width
+        residuals = sum(weight * (estimate.mean - self.evaluate(row)) ** 2
+                        for weight, row, estimate in zip(weights, rows, estimates))
+        self.scale = max(1.0, residuals / self.dof) if self.dof > 0 else 1.0
+
+    def __repr__(self):
+        return '<Model: degree %d, %d degrees of freedom>' % (self.degree, self.dof)
+
+    def evaluate(self, row):
+        return sum(coefficient * term for coefficient, term in zip(self.coefficients, row))
+
+    def predict(self, row):
+        variance = sum(row[i] * self.covariance[i][j] * row[j] for i in range(len(row)) for j in range(len(row)))
+        return Estimate(self.evaluate(row), self.scale * max(variance, 0.0), 1)
+
+
+class Prediction(object):
+    """
+    The surrogate's answer for one config: `win_rates`, each seat's
+    `Estimate`, and `turns`, `{MEAN or quantile: Estimate}`. A target
+    without a model is None. `extrapolated` names the features outside the
+    range they were observed over, and `unexplored` the settings which
+    differ from the only value they were ever played with.
+    """
+    def __init__(self, num_players, win_rates, turns, extrapolated, unexplored):
+        self.num_players = num_players
+        self.win_rates = win_rates
+        self.turns = turns
+        self.extrapolated = extrapolated
+        self.unexplored = unexplored
+
+    def __repr__(self):
+        return '<Prediction: %d players, %s>' % (self.num_players, 'uncertain' if self.uncertain() else 'certain')
+
+    def reasons(self, max_win_rate_stderr=MAX_WIN_RATE_STDERR, max_turns_stderr=MAX_TURNS_STDERR):
+        """
+        Returns why the prediction can't be relied on, if it can't, so the
+        config should be simulated instead.
+        """
+        reasons = ['%s is outside the observed range' % name for name in self.extrapolated]
+        reasons.extend('%s was only ever played at one value' % name for name in self.unexplored)
+        for seat, estimate in enumerate(self.win_rates):
+            if estimate is None:
+                reasons.append('seat %d win rate has too few observations to fit' % (seat + 1))
+            elif estimate.stderr > max_win_rate_stderr:
+                reasons.append('seat %d win rate has a standard error of %.4f' % (seat + 1, estimate.stderr))
+        for target in (MEAN,) + QUANTILES:
+            estimate = self.turns[target]
+            if estimate is None:
+                reasons.append('turns (%s) has too few observations to fit' % target)
+            elif estimate.stderr > max_turns_stderr:
+                reasons.append('turns (%s) has a standard error of %.1f' % (target, estimate.stderr))
+        return reasons
+
+    def uncertain(self, max_win_rate_stderr=MAX_WIN_RATE_STDERR, max_turns_stderr=MAX_TURNS_STDERR):
+        return bool(self.reasons(max_win_rate_stderr, max_turns_stderr))
+
+
+class Surrogate(object):
+    """
+    Regression models of batch results over `conf` settings and the number
+    of players, which predict the win rate of each seat and the mean and
+    quantiles of game length for configs between those simulated, with
+    their standard errors.
+
+    `features` are the settings (and `NUM_PLAYERS`) modelled, by default
+    those which differ between the `observations`. They are scaled to
+    [-1, 1] over their observed range, and each target is fitted with a
+    polynomial of up to `degree` 2, with squares and products of pairs, or
+    lower if there are too few observations of it to leave a degree of
+    freedom.
+    """
+    def __init__(self, observations, features=None, degree=2):
+        if not observations:
+            raise ValueError('There are no batch results to fit.')
+        self.observations = observations
+        self.features = varying_features(observations) if features is None else list(features)
+        self.degree = degree
+        self.bounds = dict((name, (min(observation.point[name] for observation in observations),
+                                   max(observation.point[name] for observation in observations)))
+                           for name in self.features)
+        self.models = {}
+        for target in self.targets():
+            observed = [observation for observation in observations if target in observation.targets]
+            self.models[target] = self.fit(target, observed)
+
+    def __repr__(self):
+        return '<Surrogate: %d configs, features %s>' % (len(self.observations), ', '.join(self.features))
+
+    @classmethod
+    def from_store(cls, store, locale='en-gb', player_class=None, max_turns=None, house_rules=None, features=None,
+                   degree=2):
+        """
+        Fits a surrogate to the runs in a `store.ResultStore` (see
+        `load_observations`).
+        """
+        return cls(load_observations(store, locale, player_class, max_turns, house_rules), features, degree)
+
+    def targets(self):
+        targets = set()
+        for observation in self.observations:
+            targets.update(observation.targets)
+        return sorted(targets, key=str)
+
+    def terms(self, point, degree):
+        """
+        The terms of the polynomial of `degree` at `point`.
+        """
+        scaled = []
+        for name in self.features:
+            low, high = self.bounds[name]
+            scaled.append((point[name] - (low + high) / 2.0) / ((high - low) / 2.0) if high > low else 0.0)
+        terms = [1.0] + scaled
+        if degree > 1:
+            terms.extend(scaled[i] * scaled[j] for i in range(len(scaled)) for j in range(i, len(scaled)))
+        return terms
+
+    def fit(self, target, observations):
+        for degree in range(self.degree, 0, -1):
+            if len(observations) > count_terms(self.features, degree):
+                try:
+                    return Model(degree, [self.terms(observation.point, degree) for observation in observations],
+                                 [observation.targets[target] for observation in observations])
+                except ValueError:
+                    continue
+        return None
+
+    def predict(self, settings=None, num_players=2):
+        """
+        Returns the `Prediction` for `num_players` players under the current
+        `conf` settings, with `settings` overriding them.
+        """
+        point = game_settings()
+        point.update(settings or {})
+        point[NUM_PLAYERS] = num_players
+
+        def predict(target):
+            model = self.models.get(target)
+            if model is None:
+                return None
+            return model.predict(self.terms(point, model.degree))
+
+        win_rates = []
+        for seat in range(num_players):
+            estimate = predict((WIN_RATE, seat))
+            if estimate is not None:
+                estimate.mean = min(1.0, max(0.0, estimate.mean))
+            win_rates.append(estimate)
+        turns = dict((target, predict((TURNS, target))) for target in (MEAN,) + QUANTILES)
+        extrapolated = [name for name in self.features
+                        if not self.bounds[name][0] <= point[name] <= self.bounds[name][1]]
+        unexplored = []
+        for name in sorted(set(point) - set(self.features)):
+            values = set(observation.point.get(name) for observation in self.observations)
+            if len(values) == 1 and values != set([point[name]]):
+                unexplored.append(name)
+        return Prediction(num_players, win_rates, turns, extrapolated, unexplored)
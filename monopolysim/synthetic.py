@@ -0,0 +1,55 @@
+import re
+from copy import deepcopy
+
+# Synthetic locales are named after their number of tiles, e.g.
+# "synthetic-1000", and are built from this locale's template and cards.
+SYNTHETIC_LOCALE = re.compile(r'^synthetic-(\d+)$')
+BASE_LOCALE = 'en-gb'
+
+
+def synthetic_tile_count(locale):
+    """
+    Returns the number of tiles of a synthetic `locale`, or None if it's
+    not synthetic.
+    """
+    match = SYNTHETIC_LOCALE.match(locale)
+    return int(match.group(1)) if match else None
+
+
+def synthetic_template(base_template, tile_count):
+    """
+    Builds a board template of `tile_count` tiles from `base_template`.
+    Each side of the board repeats the tiles of the base template's
+    sides, in order, until it's long enough. The first copy of each tile
+    keeps its name, so the base locale's cards still find their targets;
+    later copies are numbered, and form colour groups of their own.
+
+    Stations and utilities are still grouped by type, so rent is set for
+    owning up to every station on the board.
+    """
+    base_count = len(base_template)
+    if tile_count < base_count or tile_count % 4:
+        raise ValueError('Synthetic boards need a multiple of four tiles, and at least %d.' % base_count)
+
+    side = base_count // 4
+    base_sides = [base_template[index * side + 1:(index + 1) * side] for index in range(4)]
+    corners = [base_template[index * side] for index in range(4)]
+
+    template = []
+    for corner, base_side in zip(corners, base_sides):
+        template.append(deepcopy(corner))
+        for position in range(tile_count // 4 - 1):
+            tile = deepcopy(base_side[position % len(base_side)])
+            copy = position // len(base_side)
+            if copy:
+                if tile['type'] not in ('chance', 'community_chest'):
+                    tile['name'] = '%s %d' % (tile['name'], copy + 1)
+                if 'group' in tile:
+                    tile['group'] = '%s-%d' % (tile['group'], copy + 1)
+            template.append(tile)
+
+    stations = [tile for tile in template if tile['type'] == 'station']
+    for tile in stations:
+        tile['prices']['rent'] = dict((str(count), min(200, 25 * 2 ** (count - 1)))
+                                      for count in range(1, len(stations) + 1))
+    return template
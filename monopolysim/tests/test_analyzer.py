@@ -0,0 +1,118 @@
+import os
+import mmap
+import shutil
+import logging
+import tempfile
+from unittest import TestCase
+
+from ..analyzer import analyze_lines, analyze_log, chunk_offsets
+from ..board import Board
+from ..stats import TileStats
+
+# A game logged by the first engine, whose bankrupt players paid no rent
+# and logged no "is bankrupt." line.
+BASELINE_LOG = b"""Initializing a new board.
+Initializing 2 players.
+Ann rolled a 1 and 2.
+Ann has arrived at "Whitechapel Road".
+Ann ($1440) has purchased "Whitechapel Road" ($60).
+----------------------------------------------------------------------
+Bob rolled a 2 and 1.
+Bob has arrived at "Whitechapel Road".
+Bob ($1496) paid Ann $4 in rent.
+----------------------------------------------------------------------
+Ann rolled a 3 and 4.
+Ann has arrived at "Pentonville Road".
+Ann ($1320) has purchased "Pentonville Road" ($120).
+----------------------------------------------------------------------
+Bob rolled a 1 and 3.
+Bob has arrived at "Pentonville Road".
+Bob ($5) cannot afford to pay Ann rent ($8), they are bankrupt.
+Hurray, Ann won the game with $1328 and 2 properties!
+"""
+
+
+class AnalyzerTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'sim.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _log_games(self, seeds):
+        """
+        Plays a game for each of `seeds`, logging them as `run_game` does,
+        and returns the counters collected while they were played.
+        """
+        logger = logging.getLogger('monopolysim')
+        handler = logging.FileHandler(self.path)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        level = logger.level
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        stats, turns = None, []
+        try:
+            for seed in seeds:
+                board = Board(num_players=3, seed=seed)
+                board.setup()
+                if stats is None:
+                    stats = TileStats.for_board(board)
+                stats.bind(board)
+                while board.step():
+                    logging.getLogger('monopolysim.board').debug('-' * 70)
+                turns.append(board.turn)
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(level)
+            handler.close()
+        return stats, turns
+
+    def test_rebuilds_tile_stats(self):
+        stats, turns = self._log_games([1, 2, 3])
+        with open(self.path, 'rb') as fs:
+            analysis = analyze_lines(fs)
+        self.assertEqual([game.turns for game in analysis.games], turns)
+        for field in ('landings', 'rent', 'purchases', 'purchase_turns'):
+            self.assertEqual(list(getattr(analysis.stats, field)), list(getattr(stats, field)))
+        self.assertEqual(sum(analysis.stats.bankruptcies), sum(stats.bankruptcies))
+        self.assertEqual([len(game.bankrupt) for game in analysis.games], [2, 2, 2])
+        self.assertTrue(all(game.rolls >= game.turns for game in analysis.games))
+
+    def test_baseline_log(self):
+        analysis = analyze_lines(BASELINE_LOG.splitlines(True))
+        game, = analysis.games
+        board = Board(num_players=2)
+        board.setup()
+        index = board.get_tile_by_name('Pentonville Road').step - 1
+        self.assertEqual(game.turns, 3)
+        self.assertEqual(game.rent, 4)
+        self.assertEqual(game.bankrupt, ['Bob'])
+        self.assertEqual(game.winner, 'Ann')
+        self.assertEqual(analysis.stats.bankruptcies[index], 1)
+        self.assertEqual(sum(analysis.stats.bankruptcies), 1)
+        self.assertEqual(analysis.stats.rent[index], 0)
+
+    def test_chunks_start_at_games(self):
+        self._log_games([1, 2, 3, 4])
+        with open(self.path, 'rb') as fs:
+            data = fs.read()
+        with open(self.path, 'rb') as fs:
+            buf = mmap.mmap(fs.fileno(), 0, access=mmap.ACCESS_READ)
+            offsets = chunk_offsets(buf, 3)
+            buf.close()
+        self.assertEqual(offsets[0][0], 0)
+        self.assertEqual(offsets[-1][1], len(data))
+        for (_, stop), (start, _) in zip(offsets, offsets[1:]):
+            self.assertEqual(stop, start)
+            self.assertTrue(data[start:].startswith(b'Initializing a new board.'))
+
+    def test_parallel_matches_single_pass(self):
+        self._log_games([5, 6, 7, 8, 9])
+        with open(self.path, 'rb') as fs:
+            expected = analyze_lines(fs)
+        analysis = analyze_log(self.path, workers=2, chunks=4)
+        self.assertEqual([game.turns for game in analysis.games], [game.turns for game in expected.games])
+        self.assertEqual([game.bankrupt for game in analysis.games], [game.bankrupt for game in expected.games])
+        self.assertEqual(analysis.stats.to_dict(), expected.stats.to_dict())
@@ -0,0 +1,21 @@
+import sys
+from unittest import TestCase
+
+from ..benchmark import compare_interpreters, time_games
+
+
+class BenchmarkTestCase(TestCase):
+
+    def test_time_games(self):
+        games_per_second, turns = time_games(3, num_players=2, repeat=1, warmup=1)
+        self.assertGreater(games_per_second, 0)
+        self.assertEqual(time_games(3, num_players=2, repeat=2, warmup=0)[1], turns)
+
+    def test_compare_interpreters(self):
+        timing, missing = compare_interpreters([sys.executable, 'no-such-python'], 3, num_players=2, repeat=1,
+                                               warmup=0)
+        self.assertIsNone(timing.error)
+        self.assertGreater(timing.games_per_second, 0)
+        self.assertEqual(timing.turns, time_games(3, num_players=2, repeat=1, warmup=0)[1])
+        self.assertIsNotNone(missing.error)
+        self.assertIsNone(missing.games_per_second)
@@ -1,9 +1,9 @@
 from unittest import TestCase
 
-from tiles import Tile
-from player import Player
-from board import Board, LocaleDoesNotExist
-from conf import INITIAL_PLAYER_CASH
+from ..tiles import Tile
+from ..player import Player
+from ..board import Board, LocaleDoesNotExist
+from ..conf import INITIAL_PLAYER_CASH, GO_TRANSIT_PAYMENT
 
 
 class BoardTestCase(TestCase):
@@ -199,3 +199,60 @@ class BoardTestCase(TestCase):
         self.assertEqual(nickname, 'Player3')
         player = Player(nickname=nickname)
         board.players.append(player)
+
+    def test_synthetic_board(self):
+        board = Board(num_players=2, locale='synthetic-400', seed=3)
+        board.setup()
+        self.assertEqual(len(board.tiles), 400)
+        self.assertEqual([board.tiles[step].type for step in (0, 100, 200, 300)],
+                         ['go', 'jail', 'freeparking', 'gotojail'])
+        self.assertEqual(board.get_tile_by_name('Mayfair').step, 310)
+        self.assertEqual(board.get_tile_by_name('Mayfair 2').step, 319)
+        self.assertEqual(len(set(tile.name for tile in board.tiles if tile.type == 'property')),
+                         len([tile for tile in board.tiles if tile.type == 'property']))
+        self.assertTrue(max(len(group.tiles) for name, group in board.groups.items()
+                            if name not in ('station', 'utility')) <= 3)
+        board.run(200)
+        self.assertEqual(board.turn, 200)
+
+    def test_synthetic_board_sizes(self):
+        for locale in ('synthetic-20', 'synthetic-402'):
+            with self.assertRaises(ValueError):
+                Board(locale=locale).initialize_board()
+
+    def test_get_nearest_tile(self):
+        board = Board(locale='en-gb')
+        board.initialize_board()
+        chance = board.get_tile_by_name('Chance')
+        self.assertEqual(board.get_nearest_tile(chance, 'station').name, 'Marylebone Station')
+        self.assertEqual(board.get_nearest_tile(board.tiles[-1], 'go').name, 'GO')
+        self.assertIsNone(board.get_nearest_tile(board.tiles[0], 'go'))
+
+    def test_transit_tiles(self):
+        board = Board(num_players=1, locale='en-gb')
+        board.setup()
+        self.assertEqual(board.get_transit_tiles(1, 12), [])
+        self.assertEqual(board.get_transit_tiles(39, 3), [board.tiles[0]])
+        self.assertEqual(board.get_transit_tiles(39, 2), [])
+
+        # Passing GO pays, however far the player moves.
+        player = board.players[0]
+        player.tile = board.tiles[-2]
+        cash = player.cash
+        self.assertEqual(board.move_player(player, 30).step, 29)
+        self.assertEqual(player.cash, cash + GO_TRANSIT_PAYMENT)
+
+    def test_active_players_after_bankruptcy(self):
+        board = Board(num_players=3, locale='en-gb')
+        board.setup()
+        self.assertEqual(board.get_active_players(), board.players)
+        board.players[1].declare_bankruptcy()
+        self.assertEqual(board.get_active_players(), [board.players[0], board.players[2]])
+        self.assertEqual(board.count_active_players(), 2)
+
+    def test_many_players(self):
+        board = Board(num_players=40, locale='en-gb', seed=1)
+        board.setup()
+        self.assertEqual(len(set(player.nickname for player in board.players)), 40)
+        board.run(400)
+        self.assertEqual(board.turn, 400)
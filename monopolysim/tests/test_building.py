@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from ..board import Board
+
+
+class BuildingTestCase(TestCase):
+
+    def _board(self, num_players=2):
+        board = Board(num_players=num_players, locale='en-gb', seed=1)
+        board.setup()
+        return board
+
+    def _own(self, board, player, *names):
+        for name in names:
+            tile = board.get_tile_by_name(name)
+            tile.owner = player
+            player.portfolio.append(tile)
+
+    def test_monopoly_required(self):
+        board = self._board()
+        player = board.players[0]
+        self._own(board, player, 'Old Kent Road')
+        player.construct_houses()
+        self.assertEqual(board.get_tile_by_name('Old Kent Road').houses, 0)
+        self.assertEqual(player.monopolies, set())
+
+        self._own(board, player, 'Whitechapel Road')
+        self.assertEqual(player.monopolies, set([board.groups['brown']]))
+        board.get_tile_by_name('Whitechapel Road').owner = board.players[1]
+        self.assertEqual(player.monopolies, set())
+
+    def test_builds_evenly(self):
+        board = self._board()
+        player = board.players[0]
+        self._own(board, player, 'Old Kent Road', 'Whitechapel Road')
+        player.cash = board.get_tile_by_name('Old Kent Road').prices['house'] * 2
+        player.construct_houses()
+        self.assertEqual([tile.houses for tile in board.groups['brown'].tiles], [1, 1])
+        self.assertEqual(board.bank.houses, 30)
+        self.assertEqual(board.groups['brown'].development, 2)
+        self.assertEqual(player.cash, 0)
+
+    def test_hotel_returns_houses(self):
+        board = self._board()
+        player = board.players[0]
+        player.cash = 10000
+        self._own(board, player, 'Old Kent Road', 'Whitechapel Road')
+        player.construct_houses()
+        for tile in board.groups['brown'].tiles:
+            self.assertTrue(tile.hotel)
+        self.assertEqual(board.bank.houses, 32)
+        self.assertEqual(board.bank.hotels, 10)
+        self.assertIsNone(board.groups['brown'].get_buildable_tile())
+
+    def test_stations_not_buildable(self):
+        board = self._board()
+        player = board.players[0]
+        self._own(board, player, "King's Cross Station", 'Marylebone Station',
+                  'Fenchurch St Station', 'Liverpool Street Station')
+        self.assertIn(board.groups['station'], player.monopolies)
+        self.assertIsNone(board.groups['station'].get_buildable_tile())
+
+    def test_housing_shortage(self):
+        board = self._board()
+        player = board.players[0]
+        player.cash = 10000
+        board.bank.houses = 3
+        self._own(board, player, 'Old Kent Road', 'Whitechapel Road')
+        player.construct_houses()
+        self.assertEqual([tile.houses for tile in board.groups['brown'].tiles], [2, 1])
+        self.assertEqual(board.bank.houses, 0)
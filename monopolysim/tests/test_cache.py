@@ -0,0 +1,86 @@
+import os
+import re
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ..batch import run_batch
+from ..cache import ENGINE_MODULES, PACKAGE_DIR, ResultCache, shard_key
+from ..compare import configured
+
+
+class CacheTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def task(self, **changes):
+        task = dict(seed=1, start=0, stop=10, num_players=2, locale='en-gb', max_turns=None, collect_stats=False,
+                    estimator=None, player_class=None, timelines=None)
+        task.update(changes)
+        return tuple(task[name] for name in ('seed', 'start', 'stop', 'num_players', 'locale', 'max_turns',
+                                             'collect_stats', 'estimator', 'player_class', 'timelines'))
+
+    def test_shard_key(self):
+        key = shard_key(self.task())
+        self.assertEqual(key, shard_key(self.task()))
+        self.assertNotEqual(key, shard_key(self.task(seed=2)))
+        self.assertNotEqual(key, shard_key(self.task(stop=11)))
+        self.assertNotEqual(key, shard_key(self.task(player_class='monopolysim.player.Player')))
+        with configured({'GO_TRANSIT_PAYMENT': 400}):
+            self.assertNotEqual(key, shard_key(self.task()))
+
+    def test_engine_modules(self):
+        # Every module the board's code comes from is hashed into the keys.
+        pending, seen = ['board'], set()
+        while pending:
+            module = pending.pop()
+            seen.add(module)
+            with open(os.path.join(PACKAGE_DIR, module + '.py')) as fs:
+                imported = re.findall(r'^from \.(\w+) import', fs.read(), re.MULTILINE)
+            pending.extend(set(imported) - seen)
+        self.assertEqual(seen - set(ENGINE_MODULES), set())
+
+    def test_overlapping_batches(self):
+        cache = ResultCache(self.directory)
+        first = run_batch(6, seed=4, max_turns=100, workers=2, chunk_size=2, collect_stats=True, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+        second = run_batch(10, seed=4, max_turns=100, workers=2, chunk_size=2, collect_stats=True, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (3, 5))
+
+        uncached = run_batch(10, seed=4, max_turns=100, workers=1, chunk_size=2, collect_stats=True)
+        self.assertEqual([game.to_list() for game in second.games], [game.to_list() for game in uncached.games])
+        self.assertEqual(second.stats.to_dict(), uncached.stats.to_dict())
+        self.assertEqual([game.to_list() for game in first.games], [game.to_list() for game in uncached.games[:6]])
+
+    def test_integrity(self):
+        cache = ResultCache(self.directory)
+        run_batch(2, seed=4, max_turns=100, workers=1, cache=cache)
+        _, _, path = cache.entries()[0]
+        with open(path, 'rb') as fs:
+            data = fs.read()
+        with open(path, 'wb') as fs:
+            fs.write(data.replace(b'[', b'{', 1)[:-1])
+        cache.hits = cache.misses = 0
+        result = run_batch(2, seed=4, max_turns=100, workers=1, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(len(result.games), 2)
+        run_batch(2, seed=4, max_turns=100, workers=1, cache=cache)
+        self.assertEqual(cache.hits, 1)
+
+    def test_eviction(self):
+        cache = ResultCache(self.directory, max_bytes=0)
+        run_batch(2, seed=4, max_turns=100, workers=1, cache=cache)
+        self.assertEqual(cache.entries(), [])
+
+        cache = ResultCache(self.directory)
+        run_batch(4, seed=4, max_turns=100, workers=1, chunk_size=2, cache=cache)
+        sizes = [size for _, size, _ in cache.entries()]
+        os.utime(cache.entries()[0][2], (0, 0))
+        recent = cache.entries()[1][2]
+        cache.max_bytes = max(sizes)
+        cache.evict()
+        self.assertEqual([path for _, _, path in cache.entries()], [recent])
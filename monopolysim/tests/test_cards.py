@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+from .. import conf
+from ..board import Board
+
+
+class CardTestCase(TestCase):
+
+    def _board(self, num_players=1, seed=1):
+        board = Board(num_players=num_players, locale='en-gb', seed=seed)
+        board.setup()
+        return board
+
+    def _card(self, board, deck_name, action, **attributes):
+        deck = board.decks[deck_name]
+        for card in deck.cards:
+            if card.action == action and all(getattr(card, k) == v for k, v in attributes.items()):
+                return card, deck
+
+    def test_deck_draws_every_card_once(self):
+        board = self._board()
+        deck = board.decks['chance']
+        drawn = [deck.draw() for _ in range(len(deck.cards))]
+        self.assertEqual(sorted(card.index for card in drawn), list(range(len(deck.cards))))
+        self.assertIs(deck.draw(), drawn[0])
+
+    def test_deck_shuffled_per_seed(self):
+        first, second, other = self._board(seed=3), self._board(seed=3), self._board(seed=4)
+        self.assertEqual(first.decks['chance'].order, second.decks['chance'].order)
+        self.assertNotEqual(first.decks['chance'].order, other.decks['chance'].order)
+
+    def test_land_on_card_tile_draws(self):
+        board = self._board()
+        player = board.players[0]
+        player.tile = board.get_tile_by_name('Income Tax')
+        deck = board.decks['chance']
+        board.handle_play_turn(player, (1, 2))
+        self.assertEqual(deck.cursor, 1)
+
+    def test_advance_card_passes_go(self):
+        board = self._board()
+        player = board.players[0]
+        player.tile = board.tiles[36]
+        card, deck = self._card(board, 'chance', 'advance', tile='Pall Mall')
+        previous_cash = player.cash
+        card.apply(player, deck)
+        self.assertEqual(player.tile.name, 'Pall Mall')
+        self.assertEqual(player.cash, previous_cash + 200 - 140)
+
+    def test_advance_to_go_card_collects_salary(self):
+        for rules, salaries in ((None, 1), (['go_landing_bonus'], 2)):
+            board = Board(num_players=1, locale='en-gb', seed=1, rules=rules)
+            board.setup()
+            player = board.players[0]
+            player.tile = board.get_tile_by_name('Chance')
+            card, deck = self._card(board, 'chance', 'advance', tile='GO')
+            previous_cash = player.cash
+            card.apply(player, deck)
+            self.assertEqual(player.tile.name, 'GO')
+            self.assertEqual(player.cash, previous_cash + salaries * conf.GO_TRANSIT_PAYMENT)
+
+    def test_go_back_card(self):
+        board = self._board()
+        player = board.players[0]
+        player.tile = board.tiles[7]
+        card, deck = self._card(board, 'chance', 'go_back')
+        previous_cash = player.cash
+        card.apply(player, deck)
+        self.assertEqual(player.tile.name, 'Income Tax')
+        self.assertEqual(player.cash, previous_cash - 200)
+
+    def test_nearest_station_pays_double_rent(self):
+        board = self._board(num_players=2)
+        p1, p2 = board.players
+        board.get_tile_by_name('Marylebone Station').owner = p2
+        p1.tile = board.tiles[7]
+        card, deck = self._card(board, 'chance', 'advance_to_nearest', tile_type='station')
+        previous_cash = p1.cash
+        card.apply(p1, deck)
+        self.assertEqual(p1.tile.name, 'Marylebone Station')
+        self.assertEqual(p1.cash, previous_cash - 50)
+
+    def test_repairs_card(self):
+        board = self._board()
+        player = board.players[0]
+        for name, houses, hotel in [('Old Kent Road', 2, False), ('Mayfair', 4, True)]:
+            tile = board.get_tile_by_name(name)
+            tile.owner = player
+            tile.houses = houses
+            tile.hotel = hotel
+            player.portfolio.append(tile)
+        card, deck = self._card(board, 'chance', 'repairs')
+        previous_cash = player.cash
+        card.apply(player, deck)
+        self.assertEqual(player.cash, previous_cash - 2 * 25 - 100)
+
+    def test_get_out_of_jail_free_card(self):
+        board = self._board()
+        player = board.players[0]
+        card, deck = self._card(board, 'community_chest', 'get_out_of_jail_free')
+        card.apply(player, deck)
+        self.assertTrue(deck.held[card.index])
+        for _ in range(len(deck.cards) * 2):
+            self.assertIsNot(deck.draw(), card)
+
+        player.handle_jail_entry()
+        previous_cash = player.cash
+        board.handle_jail_turn(player)
+        self.assertFalse(player.in_jail)
+        self.assertEqual(player.cash, previous_cash)
+        self.assertEqual(player.jail_free_cards, [])
+        self.assertFalse(deck.held[card.index])
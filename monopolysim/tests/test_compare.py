@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from .. import conf
+from ..compare import Variant, configured, run_comparison
+from ..player import Player
+
+
+class ThriftyPlayer(Player):
+
+    def property_build_choice(self, upgrade_price):
+        return None
+
+
+class CompareTestCase(TestCase):
+
+    def test_configured(self):
+        payment = conf.GO_TRANSIT_PAYMENT
+        with configured({'GO_TRANSIT_PAYMENT': 1}):
+            self.assertEqual(conf.GO_TRANSIT_PAYMENT, 1)
+        self.assertEqual(conf.GO_TRANSIT_PAYMENT, payment)
+        with self.assertRaises(ValueError):
+            with configured({'NO_SUCH_SETTING': 1}):
+                pass
+
+    def test_identical_variants(self):
+        comparison = run_comparison(10, Variant('a'), Variant('b'), seed=3, max_turns=100, workers=1)
+        for metric in ('wins', 'turns', 'cash'):
+            estimate = comparison.paired(metric)
+            self.assertEqual((estimate.mean, estimate.variance), (0.0, 0.0))
+
+    def test_paired_differences(self):
+        comparison = run_comparison(20, Variant('baseline'), Variant('rich', {'GO_TRANSIT_PAYMENT': 400}),
+                                    seed=3, max_turns=50, workers=1)
+        self.assertEqual(conf.GO_TRANSIT_PAYMENT, 200)
+        paired = comparison.paired('cash')
+        self.assertGreater(paired.mean, 0)
+        self.assertLess(paired.variance, comparison.independent('cash').variance)
+        self.assertIn('cash', comparison.summary())
+
+    def test_player_classes(self):
+        comparison = run_comparison(4, Variant('baseline'), Variant('thrifty', player_classes=[ThriftyPlayer, Player]),
+                                    seed=3, max_turns=100, workers=1)
+        self.assertEqual(len(comparison.candidate_result.games), 4)
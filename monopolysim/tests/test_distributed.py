@@ -0,0 +1,70 @@
+import socket
+from multiprocessing import Process
+from unittest import TestCase
+
+from ..batch import BatchResult, batch_tasks, run_batch
+from ..distributed import (INITIAL_LEASE_TIMEOUT, LEASE_TIMEOUT_FACTOR, Coordinator, start_coordinator, run_worker,
+                           send_message, receive_message)
+
+
+class DistributedTestCase(TestCase):
+
+    def _assert_identical(self, result, expected):
+        self.assertEqual([game.to_list() for game in result.games], [game.to_list() for game in expected.games])
+        self.assertEqual(result.stats.to_dict(), expected.stats.to_dict())
+
+    def _serve(self, games, seed, lease_timeout=None):
+        tasks = batch_tasks(games, seed, 2, 'en-gb', 100, 2, True, chunk_size=3)
+        coordinator = Coordinator(tasks, lease_timeout)
+        server = start_coordinator(coordinator, ('localhost', 0))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return coordinator, server.server_address
+
+    def test_result_round_trip(self):
+        expected = run_batch(4, seed=1, max_turns=50, workers=1, collect_stats=True)
+        self._assert_identical(BatchResult.from_dict(expected.to_dict()), expected)
+
+    def test_matches_single_node(self):
+        coordinator, address = self._serve(10, seed=5)
+        workers = [Process(target=run_worker, args=(address, 0.05)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        result = coordinator.wait(1.0)
+        for worker in workers:
+            worker.join()
+        self._assert_identical(result, run_batch(10, seed=5, max_turns=100, workers=1, collect_stats=True))
+
+    def test_dead_worker_shards_reissued(self):
+        coordinator, address = self._serve(6, seed=7)
+        dead = socket.create_connection(address)
+        send_message(dead, {'type': 'lease'})
+        self.assertEqual(receive_message(dead)['shard'], 0)
+        dead.close()
+
+        self.assertEqual(run_worker(address, 0.05), 2)
+        self._assert_identical(coordinator.wait(1.0), run_batch(6, seed=7, max_turns=100, workers=1,
+                                                                collect_stats=True))
+
+    def test_lease_timeout(self):
+        coordinator = Coordinator(['first', 'second'], lease_timeout=0)
+        self.assertEqual(coordinator.lease(), 0)
+        self.assertEqual(coordinator.lease(), 0)
+        coordinator.complete(0, BatchResult().to_dict())
+        coordinator.complete(0, BatchResult().to_dict())
+        self.assertEqual(coordinator.lease(), 1)
+        coordinator.complete(1, BatchResult().to_dict())
+        self.assertEqual(coordinator.lease(), -1)
+
+    def test_default_lease_timeout(self):
+        coordinator = Coordinator(['first', 'second', 'third'])
+        self.assertEqual(coordinator.current_lease_timeout(), INITIAL_LEASE_TIMEOUT)
+        self.assertEqual(coordinator.lease(), 0)
+        coordinator.leases[0] -= 100
+        coordinator.complete(0, BatchResult().to_dict())
+        self.assertAlmostEqual(coordinator.current_lease_timeout(), LEASE_TIMEOUT_FACTOR * 100, delta=1)
+        # A worker which vanishes without closing its connection loses its shard.
+        self.assertEqual(coordinator.lease(), 1)
+        coordinator.leases[1] -= LEASE_TIMEOUT_FACTOR * 100 + 10
+        self.assertEqual(coordinator.lease(), 1)
+        self.assertEqual(coordinator.lease(), 2)
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from ..batch import run_batch
+from ..dice import DiceStream
+from ..estimators import Estimate, antithetic, control_variate, solve, stratified
+
+
+class EstimatorsTestCase(TestCase):
+
+    def test_estimate(self):
+        estimate = Estimate.from_values([1, 2, 3, 4])
+        self.assertEqual(estimate.mean, 2.5)
+        self.assertAlmostEqual(estimate.variance, 5.0 / 3)
+        low, high = estimate.interval()
+        self.assertAlmostEqual((low + high) / 2, 2.5)
+
+    def test_solve(self):
+        self.assertEqual(solve([[2, 1], [1, 3]], [3, 5]), [0.8, 1.4])
+        self.assertIsNone(solve([[1, 2], [2, 4]], [1, 2]))
+
+    def test_antithetic_dice(self):
+        dice, mirrored = DiceStream(5), DiceStream(5, antithetic=True)
+        for _ in range(100):
+            self.assertEqual(dice.roll_die() + mirrored.roll_die(), 7)
+
+    def test_antithetic(self):
+        estimate = antithetic([1, 5, 2, 4, 6, 0])
+        self.assertEqual((estimate.mean, estimate.variance, estimate.count), (3.0, 0.0, 3))
+
+    def test_control_variate(self):
+        controls = [(-2,), (-1,), (0,), (1,), (2,)]
+        estimate = control_variate([8, 9, 10, 11, 12], controls)
+        self.assertAlmostEqual(estimate.mean, 10)
+        self.assertAlmostEqual(estimate.variance, 0)
+
+    def test_stratified(self):
+        estimate = stratified([1, 1, 9, 9], [0, 0, 1, 1])
+        self.assertEqual((estimate.mean, estimate.variance), (5.0, 0.0))
+
+    def test_batch_designs(self):
+        result = run_batch(4, seed=2, max_turns=50, workers=1, estimator='antithetic')
+        self.assertEqual([game.seed for game in result.games[:2]], [result.games[0].seed] * 2)
+        self.assertEqual([game.antithetic for game in result.games], [False, True, False, True])
+        self.assertEqual(result.estimate('turns', 'antithetic').count, 2)
+
+        result = run_batch(4, seed=2, num_players=2, max_turns=50, workers=1, estimator='stratified')
+        self.assertEqual([game.seat for game in result.games], [0, 1, 0, 1])
+
+        result = run_batch(4, seed=2, max_turns=50, workers=1, estimator='control')
+        for game in result.games:
+            self.assertEqual(len(game.controls()), 4)
+            self.assertGreater(sum(rolls for rolls, _, _ in game.dice), 0)
+        self.assertGreater(result.variance_reduction('turns', 'control'), 0)
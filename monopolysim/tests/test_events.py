@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from ..batch import count_dice, play_game
+from ..board import Board
+from ..events import Hooks, EVENTS, DiceRolled, GameEnded, JailEntered, JailExited, PlayerBankrupt, \
+    PropertyPurchased, PropertyUpgraded, RentPaid, TileLanded, TurnStarted
+from ..stats import TileStats
+
+
+class EventsTestCase(TestCase):
+
+    def _hooked_board(self, events, seed=2):
+        board = Board(num_players=3, locale='en-gb', seed=seed)
+        board.setup()
+        hooks = Hooks()
+        received = dict((event, []) for event in events)
+        for event in events:
+            hooks.subscribe(event, received[event].append)
+        hooks.bind(board)
+        return board, received
+
+    def test_events_match_counters(self):
+        board, received = self._hooked_board(EVENTS)
+        stats = TileStats.for_board(board)
+        stats.bind(board)
+        dice = count_dice(board)
+        board.run()
+
+        self.assertEqual(len(received[TurnStarted]), board.turn)
+        self.assertEqual([event.turn for event in received[TurnStarted]], list(range(board.turn)))
+        self.assertTrue(len(received[DiceRolled]) >= sum(counts[0] for counts in dice))
+        self.assertEqual(len(received[TileLanded]), sum(stats.landings))
+        self.assertEqual(sum(event.price for event in received[RentPaid]), sum(stats.rent))
+        self.assertEqual(len(received[PropertyPurchased]), sum(stats.purchases))
+        self.assertTrue(len(received[JailEntered]) >= len(received[JailExited]))
+        self.assertTrue(all(1 <= event.development <= 5 for event in received[PropertyUpgraded]))
+
+        self.assertEqual(len(received[PlayerBankrupt]), 2)
+        self.assertEqual(len(received[GameEnded]), 1)
+        ended = received[GameEnded][0]
+        self.assertEqual(ended.turns, board.turn)
+        self.assertFalse(ended.winner.bankrupt)
+        self.assertNotIn(ended.winner, [event.player for event in received[PlayerBankrupt]])
+
+    def test_unsubscribed_events_are_not_hooked(self):
+        board, received = self._hooked_board([RentPaid])
+        player = board.players[0]
+        self.assertIn('pay_rent', player.__dict__)
+        for name in ('_roll_dice', 'handle_land_on_tile', 'purchase_property', 'declare_bankruptcy'):
+            self.assertNotIn(name, player.__dict__)
+        self.assertNotIn('play_turn', board.__dict__)
+        self.assertNotIn('step', board.__dict__)
+
+    def test_decorator_and_play_game(self):
+        hooks = Hooks()
+        purchases = []
+
+        @hooks.on(PropertyPurchased)
+        def purchased(event):
+            purchases.append(event.tile.name)
+
+        play_game(3, max_turns=50, hooks=hooks)
+        self.assertTrue(purchases)
+        self.assertRaises(ValueError, hooks.subscribe, 'rent', purchased)
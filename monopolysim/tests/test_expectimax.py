@@ -0,0 +1,90 @@
+from math import sqrt
+from unittest import TestCase
+
+from ..board import Board
+from ..cards import GetOutOfJailFreeCard
+from ..dice import DiceStream
+from ..expectimax import ExactEvaluator, evaluate
+from ..player import Player
+from ..rules import FREE_PARKING_JACKPOT
+
+
+class PassivePlayer(Player):
+
+    def property_purchase_choice(self, purchase_price):
+        return None
+
+    def propose_trades(self):
+        pass
+
+
+class ExpectimaxTestCase(TestCase):
+
+    def board(self, seed=3, rules=None):
+        board = Board(num_players=2, seed=seed, rules=rules, player_classes=[PassivePlayer, PassivePlayer])
+        board.setup()
+        player, opponent = board.players
+        for name in ('Old Kent Road', 'Whitechapel Road', "King's Cross Station", 'Electric Company', 'Vine Street',
+                     'Water Works', 'Park Lane', 'Mayfair'):
+            opponent.purchase_property(board.get_tile_by_name(name))
+        board.get_tile_by_name('Mayfair').houses = 2
+        return board, player
+
+    def test_no_turns(self):
+        board, player = self.board()
+        evaluation = evaluate(board, player, 0)
+        self.assertEqual(evaluation.expected_cash, 0)
+        self.assertEqual(evaluation.cash_distribution(), {0: 1})
+
+    def test_jail_card(self):
+        board, player = self.board()
+        deck = board.decks['chance']
+        card = next(card for card in deck.cards if isinstance(card, GetOutOfJailFreeCard))
+        card.apply(player, deck)
+        player.handle_jail_entry()
+        evaluation = evaluate(board, player, 1)
+        self.assertEqual(evaluation.cash_distribution(), {0: 1})
+        self.assertEqual(evaluation.jail_probability, 0)
+
+    def test_distribution(self):
+        board, player = self.board()
+        evaluation = evaluate(board, player, 2)
+        distribution = evaluation.cash_distribution()
+        self.assertEqual(sum(distribution.values()) + evaluation.truncated, 1)
+        self.assertLess(evaluation.truncated, 1e-5)
+        self.assertEqual(sum(cash * probability for cash, probability in distribution.items()),
+                         evaluation.expected_cash)
+        # Only the expectation is kept, but it's the same.
+        expectation = evaluate(board, player, 2, distribution=False)
+        self.assertEqual(expectation.expected_cash, evaluation.expected_cash)
+        self.assertEqual(expectation.jail_probability, evaluation.jail_probability)
+        with self.assertRaises(ValueError):
+            expectation.cash_distribution()
+
+    def test_transpositions(self):
+        board, player = self.board()
+        evaluator = ExactEvaluator(board, player, distribution=False)
+        evaluator.evaluate(2)
+        played = len(evaluator.play_outcomes)
+        evaluator.evaluate(2)
+        self.assertEqual(len(evaluator.play_outcomes), played)
+
+    def test_monte_carlo(self):
+        board, player = self.board()
+        expected = float(evaluate(board, player, 2, distribution=False).expected_cash)
+        swings = []
+        for index in range(1500):
+            board, player = self.board()
+            player.dice = DiceStream(1000 + index)
+            cash = player.cash
+            for _ in range(2):
+                board.play_turn(player)
+            swings.append(player.cash - cash)
+        mean = float(sum(swings)) / len(swings)
+        error = sqrt(sum((swing - mean) ** 2 for swing in swings) / (len(swings) - 1) / len(swings))
+        self.assertLess(abs(mean - expected), 4 * error)
+
+    def test_unsupported_rules(self):
+        board, player = self.board(rules=[FREE_PARKING_JACKPOT])
+        with self.assertRaises(ValueError):
+            evaluate(board, player)
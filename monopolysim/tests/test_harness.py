@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from ..board import Board
+from ..harness import play_in_lockstep, run_sweep
+
+
+class DivergentBoard(Board):
+    """
+    An engine which hands the first player an extra credit on turn 5.
+    """
+    def step(self):
+        running = super(DivergentBoard, self).step()
+        if self.turn == 5:
+            self.players[0].cash += 1
+        return running
+
+
+class HarnessTestCase(TestCase):
+
+    def test_same_seed_same_game(self):
+        first = Board(num_players=2, locale='en-gb', seed=7)
+        first.setup()
+        second = Board(num_players=2, locale='en-gb', seed=7)
+        second.setup()
+        for _ in range(50):
+            first.step()
+            second.step()
+            self.assertEqual(first.snapshot(), second.snapshot())
+
+    def test_reference_matches_itself(self):
+        for seed in range(5):
+            self.assertIsNone(play_in_lockstep(Board, seed, max_turns=50))
+
+    def test_lockstep_finds_divergent_turn(self):
+        mismatch = play_in_lockstep(DivergentBoard, 3, max_turns=50)
+        self.assertEqual(mismatch.seed, 3)
+        self.assertEqual(mismatch.turn, 5)
+
+    def test_sweep_shrinks_to_minimal_game(self):
+        result = run_sweep(DivergentBoard, 6, start_seed=10, num_players=3,
+                           max_turns=20, workers=1, chunk_size=4)
+        self.assertEqual(result.games, 6)
+        self.assertEqual(result.mismatch_count, 6)
+        # Only the earliest mismatch of each chunk is kept.
+        self.assertEqual([mismatch.seed for mismatch in result.mismatches], [10, 14])
+        self.assertEqual(result.minimal.seed, 10)
+        self.assertEqual(result.minimal.turn, 5)
+        self.assertEqual(result.minimal.num_players, 2)
+
+    def test_parallel_shrink(self):
+        result = run_sweep(DivergentBoard, 4, start_seed=10, num_players=4,
+                           max_turns=20, workers=2, chunk_size=2)
+        self.assertEqual(result.mismatch_count, 4)
+        self.assertEqual((result.minimal.seed, result.minimal.turn, result.minimal.num_players), (10, 5, 2))
+
+    def test_parallel_sweep(self):
+        result = run_sweep(Board, 4, max_turns=20, workers=2, chunk_size=2)
+        self.assertEqual(result.games, 4)
+        self.assertTrue(result.passed)
+        self.assertIsNone(result.minimal)
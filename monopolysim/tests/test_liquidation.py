@@ -0,0 +1,129 @@
+from unittest import TestCase
+
+from ..board import Board
+
+
+class LiquidationTestCase(TestCase):
+
+    def _board(self, num_players=2):
+        board = Board(num_players=num_players, locale='en-gb', seed=1)
+        board.setup()
+        return board
+
+    def _own(self, board, player, *names):
+        for name in names:
+            tile = board.get_tile_by_name(name)
+            tile.owner = player
+            player.portfolio.append(tile)
+
+    def test_mortgage_value(self):
+        board = self._board()
+        self.assertEqual(board.get_tile_by_name('Old Kent Road').mortgage_value, 50)
+        self.assertEqual(board.get_tile_by_name('Electric Company').mortgage_value, 75)
+        self.assertEqual(board.get_tile_by_name('Old Kent Road').unmortgage_cost, 55)
+
+    def test_cheapest_mortgages(self):
+        board = self._board()
+        player = board.players[0]
+        player.cash = 0
+        # Mortgages of 50, 70 and 120.
+        self._own(board, player, 'Old Kent Road', 'Whitehall', 'Trafalgar Square')
+        self.assertEqual(player.wallet.withdraw(60), 60)
+        self.assertFalse(player.bankrupt)
+        self.assertEqual(player.cash, 10)
+        self.assertEqual([tile.name for tile in player.portfolio if tile.mortgaged], ['Whitehall'])
+
+    def test_monopolies_kept_until_last(self):
+        board = self._board()
+        player = board.players[0]
+        player.cash = 10000
+        self._own(board, player, 'Old Kent Road', 'Whitechapel Road', 'Whitehall')
+        player.construct_houses()
+        player.cash = 0
+
+        player.wallet.withdraw(70)
+        self.assertTrue(board.get_tile_by_name('Whitehall').mortgaged)
+        self.assertEqual(board.groups['brown'].development, 10)
+
+        # The hotels are broken down, and the houses sold evenly.
+        player.wallet.withdraw(30)
+        self.assertEqual([tile.development for tile in board.groups['brown'].tiles], [4, 4])
+        self.assertEqual(board.bank.houses, 24)
+        self.assertFalse(board.get_tile_by_name('Old Kent Road').mortgaged)
+
+    def test_plans_memoized(self):
+        board = self._board()
+        player = board.players[0]
+        self._own(board, player, 'Old Kent Road', 'Whitehall')
+        player.cash = 0
+        first = board.liquidator.plan(player, 60)
+        options = board.liquidator.options.copy()
+        self.assertEqual(board.liquidator.plan(player, 20), (('mortgage', 2),))
+        self.assertEqual(first, (('mortgage', board.get_tile_by_name('Whitehall').step),))
+        self.assertEqual(board.liquidator.options, options)
+        self.assertIsNone(board.liquidator.plan(player, 200))
+
+    def test_bankruptcy_to_creditor(self):
+        board = self._board()
+        p1, p2 = board.players
+        self._own(board, p2, 'Mayfair', 'Old Kent Road', 'Whitechapel Road')
+        p2.cash = 10000
+        p2.construct_houses()
+        self._own(board, p1, 'Park Lane', 'Whitehall')
+        p1.cash = 0
+        p1.mortgage_property(board.get_tile_by_name('Whitehall'))
+        previous_cash = p2.cash
+        p1.tile = board.get_tile_by_name('Liverpool Street Station')
+        p1.handle_land_on_tile(board.get_tile_by_name('Old Kent Road'), (1, 2))
+
+        self.assertTrue(p1.bankrupt)
+        self.assertEqual(p1.portfolio, [])
+        self.assertEqual(p1.cash, 0)
+        self.assertEqual(p2.cash, previous_cash + 70)
+        self.assertIs(board.get_tile_by_name('Park Lane').owner, p2)
+        self.assertIn(board.groups['darkblue'], p2.monopolies)
+        self.assertTrue(board.get_tile_by_name('Whitehall').mortgaged)
+
+    def test_bankruptcy_to_bank(self):
+        board = self._board()
+        player = board.players[0]
+        self._own(board, player, 'Old Kent Road')
+        player.cash = 0
+        player.wallet.withdraw(1000)
+        self.assertTrue(player.bankrupt)
+        tile = board.get_tile_by_name('Old Kent Road')
+        self.assertFalse(tile.is_owned)
+        self.assertFalse(tile.mortgaged)
+        self.assertEqual(board.groups['brown'].mortgaged, 0)
+
+    def test_mortgaged_tile_rent(self):
+        board = self._board()
+        p1, p2 = board.players
+        self._own(board, p2, 'Mayfair')
+        board.get_tile_by_name('Mayfair').mortgaged = True
+        previous_cash = p1.cash
+        p1.handle_land_on_tile(board.get_tile_by_name('Mayfair'), (1, 2))
+        self.assertEqual(p1.cash, previous_cash)
+
+    def test_unmortgage_monopolies_first(self):
+        board = self._board()
+        player = board.players[0]
+        self._own(board, player, 'Whitehall', 'Old Kent Road', 'Whitechapel Road')
+        for tile in player.portfolio:
+            player.mortgage_property(tile)
+        player.cash = 120
+        player.unmortgage_properties()
+        self.assertEqual([tile.mortgaged for tile in player.portfolio], [True, False, False])
+        self.assertEqual(player.cash, 10)
+        self.assertEqual(board.groups['brown'].mortgaged, 0)
+
+    def test_unmortgage_with_exact_cost(self):
+        board = self._board()
+        player = board.players[0]
+        self._own(board, player, 'Old Kent Road')
+        tile = player.portfolio[0]
+        player.mortgage_property(tile)
+        player.cash = tile.unmortgage_cost
+        player.unmortgage_properties()
+        self.assertFalse(tile.mortgaged)
+        self.assertEqual(player.cash, 0)
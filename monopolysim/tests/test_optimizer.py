@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from .. import conf
+from ..optimizer import (DEFAULT_PARAMETERS, PARAMETERS, Optimizer, ParameterizedPlayer, measure,
+                         parameterized_class, play_candidates)
+from ..player import Player
+
+
+class OptimizerTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_parameterized_class(self):
+        self.assertIs(parameterized_class(None), Player)
+        parameters = dict(DEFAULT_PARAMETERS, purchase_reserve=1000)
+        player_class = parameterized_class(parameters)
+        self.assertTrue(issubclass(player_class, ParameterizedPlayer))
+        self.assertEqual(player_class.parameters, parameters)
+        self.assertEqual(ParameterizedPlayer.parameters, DEFAULT_PARAMETERS)
+
+    def test_default_parameters_play_like_default_player(self):
+        wins = play_candidates((3, 0, 6, 2, 'en-gb', 100, [DEFAULT_PARAMETERS, None]))
+        self.assertEqual(wins[0], wins[1])
+
+    def test_choices(self):
+        player = parameterized_class(dict(DEFAULT_PARAMETERS, purchase_reserve=2000, jail_pay_cash=0))(cash=2500)
+        self.assertIsNone(player.property_purchase_choice(600))
+        self.assertEqual(player.property_purchase_choice(500), conf.PLAYER_PURCHASE_PROPERTY)
+        self.assertEqual(player.jail_exit_choice(), conf.PLAYER_JAIL_PAY)
+
+    def test_run_is_reproducible(self):
+        first = Optimizer(population_size=4, games=4, max_turns=60, seed=5)
+        second = Optimizer(population_size=4, games=4, max_turns=60, seed=5)
+        self.assertEqual(first.run(2, workers=1), second.run(2, workers=2))
+        self.assertEqual(first.population, second.population)
+        self.assertEqual(len(first.history), 2)
+        for parameters in first.population:
+            for name, low, high in PARAMETERS:
+                self.assertTrue(low <= parameters[name] <= high)
+
+    def test_resume_from_checkpoint(self):
+        path = os.path.join(self.directory, 'search.json')
+        uninterrupted = Optimizer(population_size=4, games=4, max_turns=60, seed=2)
+        uninterrupted.run(2, workers=1)
+        Optimizer(population_size=4, games=4, max_turns=60, seed=2, checkpoint=path).run(1, workers=1)
+        resumed = Optimizer.load(path)
+        self.assertEqual(resumed.generation, 1)
+        resumed.run(2, workers=1)
+        self.assertEqual(resumed.to_dict(), uninterrupted.to_dict())
+
+    def test_measure(self):
+        win_rate, difference = measure(DEFAULT_PARAMETERS, games=6, seed=1, max_turns=100, workers=1)
+        self.assertEqual(win_rate.count, 6)
+        self.assertEqual((difference.mean, difference.variance), (0.0, 0.0))
@@ -0,0 +1,43 @@
+import os
+import sys
+import logging
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ..batch import play_game
+from ..board import board_templates
+from ..parallel import PRELOAD_MODULES, create_pool, split_range
+
+
+def worker_state(_):
+    return all(module in sys.modules for module in PRELOAD_MODULES), 'en-gb' in board_templates
+
+
+class ParallelTestCase(TestCase):
+
+    def test_split_range(self):
+        self.assertEqual(split_range(10, 5, 1, chunk_size=2), [(10, 12), (12, 14), (14, 15)])
+        self.assertEqual(len(split_range(0, 1024, 4)), 16)
+
+    def test_preloaded_workers(self):
+        pool = create_pool(2)
+        try:
+            states = pool.map(worker_state, range(2))
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(states, [(True, True), (True, True)])
+
+    def test_game_has_no_side_effects(self):
+        handlers = list(logging.getLogger().handlers)
+        cwd = os.getcwd()
+        directory = tempfile.mkdtemp()
+        try:
+            os.chdir(directory)
+            play_game(1, max_turns=20)
+            self.assertEqual(os.listdir(directory), [])
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(directory)
+        self.assertEqual(logging.getLogger().handlers, handlers)
@@ -1,7 +1,7 @@
 from unittest import TestCase
 
-from player import Player
-from board import Board
+from ..player import Player
+from ..board import Board
 
 
 class PlayerTestCase(TestCase):
@@ -0,0 +1,93 @@
+from unittest import TestCase
+
+from .. import conf
+from ..batch import play_game
+from ..board import Board
+from ..compare import configured
+from ..player import Player
+from ..rules import AUCTIONS, NO_JAIL_RENT, RuleSet
+from ..tiles import TILE_CLASSES, PropertyTile
+
+
+class DecliningPlayer(Player):
+
+    def property_purchase_choice(self, purchase_price):
+        return None
+
+    def auction_bid_limit(self, tile):
+        return 0
+
+
+class RulesTestCase(TestCase):
+
+    def board(self, rules, num_players=2, player_classes=None):
+        board = Board(num_players=num_players, rules=rules, player_classes=player_classes)
+        board.setup()
+        return board
+
+    def test_standard_rules(self):
+        self.assertEqual(RuleSet().tile_classes, TILE_CLASSES)
+        board = self.board(None)
+        self.assertIs(type(board.get_tile_by_name('Mayfair')), PropertyTile)
+        with self.assertRaises(ValueError):
+            RuleSet(['no_such_rule'])
+
+    def test_rules_from_conf(self):
+        with configured({'HOUSE_RULES': [AUCTIONS]}):
+            board = self.board(None)
+        self.assertIn(AUCTIONS, board.rules)
+        self.assertNotIn(AUCTIONS, self.board(None).rules)
+
+    def test_combined_rules(self):
+        tile = self.board([AUCTIONS, NO_JAIL_RENT]).get_tile_by_name('Mayfair')
+        self.assertTrue(isinstance(tile, PropertyTile))
+        self.assertEqual(type(tile).on_purchase_declined.__module__, 'monopolysim.rules')
+        self.assertEqual(type(tile).charge_rent.__module__, 'monopolysim.rules')
+
+    def test_free_parking_jackpot(self):
+        board = self.board(['free_parking_jackpot'])
+        first, second = board.players
+        first.handle_land_on_tile(board.get_tile_by_name('Income Tax'), (1, 2))
+        first.handle_land_on_tile(board.get_tile_by_name('Super Tax'), (1, 2))
+        self.assertEqual(board.jackpot, 300)
+        second.handle_land_on_tile(board.get_tile_by_name('Free Parking'), (1, 2))
+        self.assertEqual((first.cash, second.cash), (conf.INITIAL_PLAYER_CASH - 300, conf.INITIAL_PLAYER_CASH + 300))
+        self.assertEqual(board.jackpot, 0)
+
+    def test_go_landing_bonus(self):
+        board = self.board(['go_landing_bonus'])
+        player = board.players[0]
+        player.tile = board.get_tile_by_name('Mayfair')
+        player.handle_land_on_tile(board.move_player(player, 1), (1, 2))
+        self.assertEqual(player.cash, conf.INITIAL_PLAYER_CASH + 2 * conf.GO_TRANSIT_PAYMENT)
+
+    def test_auctions(self):
+        board = self.board([AUCTIONS], num_players=3, player_classes=[DecliningPlayer, Player, Player])
+        decliner, first, second = board.players
+        second.cash = 150
+        tile = board.get_tile_by_name('Mayfair')
+        decliner.handle_land_on_tile(tile, (1, 2))
+        self.assertIs(tile.owner, first)
+        self.assertEqual(first.cash, conf.INITIAL_PLAYER_CASH - 151)
+
+        tile = board.get_tile_by_name('Park Lane')
+        first.cash = second.cash = 5
+        decliner.handle_land_on_tile(tile, (1, 2))
+        self.assertFalse(tile.is_owned)
+
+    def test_no_jail_rent(self):
+        board = self.board([NO_JAIL_RENT])
+        owner, player = board.players
+        tile = board.get_tile_by_name('Mayfair')
+        owner.purchase_property(tile)
+        owner.in_jail = True
+        player.handle_land_on_tile(tile, (1, 2))
+        self.assertEqual(player.cash, conf.INITIAL_PLAYER_CASH)
+        owner.in_jail = False
+        player.handle_land_on_tile(tile, (1, 2))
+        self.assertEqual(player.cash, conf.INITIAL_PLAYER_CASH - tile.prices['rent']['0'])
+
+    def test_games_with_every_rule(self):
+        with configured({'HOUSE_RULES': ['free_parking_jackpot', 'go_landing_bonus', AUCTIONS, NO_JAIL_RENT]}):
+            game = play_game(7, num_players=4, max_turns=300)
+        self.assertNotEqual(play_game(7, num_players=4, max_turns=300).to_list(), game.to_list())
@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+from ..board import Board
+from ..batch import run_batch
+from ..layout import ring_layout
+from ..stats import TileStats
+
+
+class StatsTestCase(TestCase):
+
+    def _bound_board(self):
+        board = Board(num_players=2, locale='en-gb', seed=1)
+        board.setup()
+        stats = TileStats.for_board(board)
+        stats.bind(board)
+        return board, stats
+
+    def test_count_landing_and_purchase(self):
+        board, stats = self._bound_board()
+        player = board.players[0]
+        board.handle_play_turn(player, (1, 2))
+        tile = board.get_tile_by_name('Whitechapel Road')
+        self.assertEqual(stats.landings[tile.step - 1], 1)
+        self.assertEqual(stats.purchases[tile.step - 1], 1)
+        self.assertEqual(sum(stats.landings), 1)
+
+    def test_count_rent(self):
+        board, stats = self._bound_board()
+        p1, p2 = board.players
+        tile = board.get_tile_by_name('Mayfair')
+        tile.owner = p1
+        p2.tile = board.get_tile_by_name('Park Lane')
+        board.handle_play_turn(p2, (1, 1))
+        self.assertEqual(stats.rent[tile.step - 1], 50)
+
+    def test_count_rent_paid_by_bankrupt_player(self):
+        board, stats = self._bound_board()
+        p1, p2 = board.players
+        tile = board.get_tile_by_name('Mayfair')
+        tile.owner = p1
+        p2.cash = 30
+        p2.tile = board.get_tile_by_name('Park Lane')
+        board.handle_play_turn(p2, (1, 1))
+        self.assertTrue(p2.bankrupt)
+        self.assertEqual(stats.rent[tile.step - 1], 30)
+
+    def test_count_card_landing(self):
+        board, stats = self._bound_board()
+        p1, p2 = board.players
+        tile = board.get_tile_by_name('Marylebone Station')
+        tile.owner = p2
+        p1.tile = board.tiles[7]
+        card = next(card for card in board.decks['chance'].cards if card.action == 'advance_to_nearest'
+                    and card.tile_type == 'station')
+        card.apply(p1, board.decks['chance'])
+        self.assertEqual(stats.landings[tile.step - 1], 1)
+        self.assertEqual(stats.rent[tile.step - 1], 50)
+
+    def test_count_bankruptcy(self):
+        board, stats = self._bound_board()
+        player = board.players[0]
+        player.cash = 100
+        player.tile = board.get_tile_by_name('Old Kent Road')
+        setattr(player, '_roll_dice', lambda: (1, 2))
+        board.play_turn(player)
+        tile = board.get_tile_by_name('Income Tax')
+        self.assertTrue(player.bankrupt)
+        self.assertEqual(stats.bankruptcies[tile.step - 1], 1)
+
+    def test_count_bankruptcy_in_another_turn(self):
+        board, stats = self._bound_board()
+        p1, p2 = board.players
+        p2.cash = 5
+        tile = p2.tile = board.get_tile_by_name('Pentonville Road')
+        card = next(card for card in board.decks['community_chest'].cards if card.action == 'collect_from_players')
+        card.apply(p1, board.decks['community_chest'])
+        self.assertTrue(p2.bankrupt)
+        self.assertEqual(board.bankruptcies, 1)
+        self.assertEqual(stats.bankruptcies[tile.step - 1], 1)
+        self.assertEqual(sum(stats.bankruptcies), 1)
+
+    def test_unbound_board_is_untouched(self):
+        board = Board(num_players=2, locale='en-gb')
+        board.setup()
+        self.assertNotIn('play_turn', vars(board))
+        self.assertNotIn('handle_land_on_tile', vars(board.players[0]))
+
+    def test_batch_stats_independent_of_workers(self):
+        serial = run_batch(6, seed=3, max_turns=30, workers=1, collect_stats=True)
+        parallel = run_batch(6, seed=3, max_turns=30, workers=2, collect_stats=True, chunk_size=2)
+        self.assertEqual(serial.stats.games, 6)
+        self.assertEqual(list(serial.stats.landings), list(parallel.stats.landings))
+        self.assertEqual(list(serial.stats.rent), list(parallel.stats.rent))
+        self.assertEqual([g.turns for g in serial.games], [g.turns for g in parallel.games])
+
+    def test_ring_layout(self):
+        grid = ring_layout(40)
+        self.assertEqual(len(grid), 11)
+        self.assertEqual(grid[10][10], 0)
+        self.assertEqual(grid[10][0], 10)
+        self.assertEqual(grid[0][0], 20)
+        self.assertEqual(grid[0][10], 30)
+        self.assertEqual(grid[9][10], 39)
+        self.assertIsNone(grid[5][5])
+
+    def test_heatmap_and_table(self):
+        board, stats = self._bound_board()
+        board.handle_play_turn(board.players[0], (1, 2))
+        heatmap = stats.heatmap()
+        self.assertEqual(len(heatmap.splitlines()), 11)
+        self.assertIn('@100.0', heatmap)
+        self.assertIn('Whitechapel Road', stats.as_table())
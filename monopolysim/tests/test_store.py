@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from .. import conf
+from ..batch import GameResult, run_batch
+from ..compare import configured
+from ..store import ResultStore, ResultWriter, config_hash, config_metadata
+
+
+class StoreTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'results.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_config_metadata(self):
+        config = config_metadata('en-gb', 4)
+        self.assertEqual(config['settings']['INITIAL_PLAYER_CASH'], conf.INITIAL_PLAYER_CASH)
+        self.assertNotIn('VIEWER_FRAME_RATE', config['settings'])
+        self.assertNotIn('DEFAULT_PLAYER_NAMES', config['settings'])
+        self.assertEqual(config_hash(config), config_hash(config_metadata('en-gb', 4)))
+        with configured({'INITIAL_PLAYER_CASH': 1500}):
+            self.assertNotEqual(config_hash(config), config_hash(config_metadata('en-gb', 4)))
+
+    def test_writer_batches(self):
+        store = ResultStore(self.path)
+        run_id = store.add_run(config_metadata(), 0, 5)
+        writer = ResultWriter(self.path, batch_size=2)
+        writer.write(run_id, 0, [GameResult(index, 2, 10, index % 2, (1, 2)) for index in range(3)])
+        writer.write(run_id, 3, [GameResult(index, 2, 10, None, (1, 2)) for index in range(3, 5)])
+        writer.close()
+        self.assertEqual(store.count_games(), 5)
+        self.assertEqual(store.win_rates(), {0: 0.4, 1: 0.2})
+        store.close()
+
+    def test_run_batch(self):
+        result = run_batch(6, seed=2, max_turns=100, workers=2, store=self.path)
+        with configured({'INITIAL_PLAYER_CASH': 1500}):
+            run_batch(4, seed=2, num_players=3, max_turns=100, workers=1, store=self.path)
+
+        store = ResultStore(self.path)
+        runs = store.runs()
+        self.assertEqual([(locale, num_players, seed, games) for _, _, locale, num_players, seed, games in runs],
+                         [('en-gb', 2, 2, 6), ('en-gb', 3, 2, 4)])
+        self.assertEqual(store.config(runs[1][1])['settings']['INITIAL_PLAYER_CASH'], 1500)
+        self.assertEqual(store.count_games(num_players=2), 6)
+        self.assertEqual(store.count_games(settings={'INITIAL_PLAYER_CASH': 1500}), 4)
+        self.assertEqual(store.count_games(locale='fr-fr'), 0)
+
+        rows = store.connection.execute('SELECT game, seed, turns, winner FROM games WHERE run_id = ? ORDER BY game',
+                                        (runs[0][0],)).fetchall()
+        self.assertEqual(rows, [(index, game.seed, game.turns, game.winner) for index, game in enumerate(result.games)])
+        wins = result.wins_by_seat()
+        self.assertEqual(store.win_rates(num_players=2, seed=2),
+                         dict((seat, count / 6.0) for seat, count in enumerate(wins) if count))
+        store.close()
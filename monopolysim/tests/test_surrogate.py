@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from ..batch import GameResult
+from ..compare import configured
+from ..estimators import Estimate
+from ..store import ResultStore, ResultWriter, config_metadata
+from ..surrogate import MEAN, Model, Surrogate, load_observations, quantile_estimate
+
+CASH = (1000, 1500, 2000, 2500, 3000)
+
+
+class SurrogateTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'results.db')
+        self.store = ResultStore(self.path)
+        for cash in CASH:
+            # The first seat wins more, and games last longer, with more cash.
+            wins = 30 + cash // 100
+            self.add_run({'INITIAL_PLAYER_CASH': cash},
+                         [GameResult(index, 2, cash // 20 + index % 11 - 5, 0 if index < wins else 1, (0, 0))
+                          for index in range(100)])
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def add_run(self, overrides, games, player_class=None):
+        with configured(overrides):
+            config = config_metadata(player_class=player_class)
+        run_id = self.store.add_run(config, 0, len(games))
+        writer = ResultWriter(self.path)
+        writer.write(run_id, 0, games)
+        writer.close()
+
+    def test_quantile_estimate(self):
+        estimate = quantile_estimate(list(range(100)), 0.5)
+        self.assertEqual(estimate.mean, 50)
+        self.assertGreater(estimate.stderr, 4)
+        self.assertLess(estimate.stderr, 6)
+        self.assertEqual(quantile_estimate([7] * 10, 0.9).mean, 7)
+
+    def test_exact_model(self):
+        rows = [[1.0, x] for x in (-1.0, -0.5, 0.0, 0.5, 1.0)]
+        model = Model(1, rows, [Estimate(2 + 3 * row[1], 1.0, 1) for row in rows])
+        self.assertAlmostEqual(model.coefficients[0], 2)
+        self.assertAlmostEqual(model.coefficients[1], 3)
+        self.assertEqual(model.scale, 1)
+        self.assertAlmostEqual(model.predict([1.0, 0.25]).mean, 2.75)
+        # The variance is least at the middle of the observations.
+        self.assertLess(model.predict([1.0, 0.0]).variance, model.predict([1.0, 1.0]).variance)
+
+    def test_load_observations(self):
+        self.add_run({'INITIAL_PLAYER_CASH': 1000}, [GameResult(0, 2, 10, 0, (0, 0))], 'monopolysim.player.Player')
+        self.assertEqual(len(load_observations(self.store)), len(CASH))
+        self.assertEqual(len(load_observations(self.store, player_class='monopolysim.player.Player')), 1)
+        self.assertEqual(load_observations(self.store, locale='en-us'), [])
+        with self.assertRaises(ValueError):
+            Surrogate.from_store(self.store, locale='en-us')
+
+    def test_interpolation(self):
+        surrogate = Surrogate.from_store(self.store)
+        self.assertEqual(surrogate.features, ['INITIAL_PLAYER_CASH'])
+        prediction = surrogate.predict({'INITIAL_PLAYER_CASH': 1750})
+        self.assertEqual(prediction.extrapolated, [])
+        self.assertEqual(prediction.unexplored, [])
+        self.assertAlmostEqual(prediction.win_rates[0].mean, 0.475, delta=0.01)
+        self.assertAlmostEqual(prediction.win_rates[1].mean, 0.525, delta=0.01)
+        self.assertLess(prediction.win_rates[0].stderr, 0.05)
+        self.assertAlmostEqual(prediction.turns[MEAN].mean, 87.5, delta=0.5)
+        self.assertAlmostEqual(prediction.turns[0.5].mean, 87.5, delta=1.5)
+        self.assertFalse(prediction.uncertain(max_win_rate_stderr=0.05))
+
+    def test_uncertain(self):
+        surrogate = Surrogate.from_store(self.store)
+        prediction = surrogate.predict({'INITIAL_PLAYER_CASH': 5000})
+        self.assertEqual(prediction.extrapolated, ['INITIAL_PLAYER_CASH'])
+        self.assertTrue(prediction.uncertain(max_win_rate_stderr=1, max_turns_stderr=100))
+        prediction = surrogate.predict({'INITIAL_PLAYER_CASH': 2000, 'GO_TRANSIT_PAYMENT': 400})
+        self.assertEqual(prediction.unexplored, ['GO_TRANSIT_PAYMENT'])
+        # No three player games were played, so there's no model of the third seat.
+        prediction = surrogate.predict({'INITIAL_PLAYER_CASH': 2000}, num_players=3)
+        self.assertIsNone(prediction.win_rates[2])
+        self.assertIn('seat 3 win rate has too few observations to fit', prediction.reasons())
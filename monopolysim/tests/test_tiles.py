@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from board import Board
+from ..board import Board
 
 
 class TileTestCase(TestCase):
@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from .. import conf
+from ..board import Board
+from ..batch import game_seed, run_batch
+from ..tiles import PropertyTile
+from ..timeline import Timeline, TimelineFile, TimelineWriter
+
+
+class TimelineTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _played_board(self, turns=60, capacity=None, locale='en-gb'):
+        board = Board(num_players=3, locale=locale, seed=4)
+        board.setup()
+        timeline = Timeline.for_board(board, capacity)
+        timeline.bind(board)
+        board.run(turns)
+        return board, timeline
+
+    def _ownership(self, board):
+        seats = dict((player, seat) for seat, player in enumerate(board.players))
+        return [(seats.get(tile.owner, -1), tile.development, int(tile.mortgaged))
+                if isinstance(tile, PropertyTile) else (-1, 0, 0) for tile in board.tiles]
+
+    def test_records_every_turn(self):
+        board, timeline = self._played_board()
+        self.assertEqual(timeline.rows, board.turn + 1)
+        self.assertEqual(timeline.row(0), [(conf.INITIAL_PLAYER_CASH, conf.INITIAL_PLAYER_CASH, 0)] * 3)
+        self.assertEqual([cash for cash, _, _ in timeline.row(board.turn)], [p.cash for p in board.players])
+        self.assertEqual([position for _, _, position in timeline.row(board.turn)],
+                         [p.tile.step - 1 for p in board.players])
+        self.assertEqual(timeline.ownership_at(board.turn), self._ownership(board))
+        self.assertEqual(timeline.ownership_at(0), [(-1, 0, 0)] * board.total_tile_count)
+
+    def test_large_board(self):
+        board, timeline = self._played_board(300, locale='synthetic-400')
+        self.assertEqual(timeline.ownership_at(board.turn), self._ownership(board))
+        self.assertTrue(max(timeline.position) > 255)
+        path = os.path.join(self.directory, 'large.timeline')
+        run_batch(2, seed=1, locale='synthetic-400', max_turns=300, workers=1, timelines=path)
+        loaded = TimelineFile(path)
+        try:
+            game = loaded[1]
+            self.assertEqual(game.tile_count, 400)
+            self.assertTrue(all(0 <= position < 400 for position in game.position))
+        finally:
+            loaded.close()
+
+    def test_ownership_is_delta_encoded(self):
+        board, timeline = self._played_board()
+        owned = len([tile for tile in board.tiles if isinstance(tile, PropertyTile) and tile.owner])
+        self.assertTrue(owned <= len(timeline.event_turn) < board.turn)
+
+    def test_ring_buffer_keeps_last_turns(self):
+        board, full = self._played_board()
+        _, ring = self._played_board(capacity=10)
+        self.assertEqual(ring.rows, 10)
+        self.assertEqual(ring.first_turn, board.turn - 9)
+        for turn in range(ring.first_turn, board.turn + 1):
+            self.assertEqual(ring.row(turn), full.row(turn))
+            self.assertEqual(ring.ownership_at(turn), full.ownership_at(turn))
+        self.assertRaises(IndexError, ring.row, ring.first_turn - 1)
+
+    def test_file_round_trip(self):
+        path = os.path.join(self.directory, 'games.timeline')
+        timelines = [self._played_board(turns)[1] for turns in (30, 40)] + [self._played_board(capacity=8)[1]]
+        with open(path, 'wb') as fs:
+            writer = TimelineWriter(fs)
+            for timeline in timelines:
+                writer.write(timeline)
+            writer.close()
+
+        loaded = TimelineFile(path)
+        try:
+            self.assertEqual(len(loaded), 3)
+            for index, timeline in enumerate(timelines):
+                game = loaded[index]
+                self.assertEqual(game.seed, 4)
+                self.assertEqual((game.first_turn, game.rows), (timeline.first_turn, timeline.rows))
+                last = timeline.first_turn + timeline.rows - 1
+                self.assertEqual(game.row(last), timeline.row(last))
+                self.assertEqual(game.ownership_at(last), timeline.ownership_at(last))
+        finally:
+            loaded.close()
+
+    def test_batch_writes_games_in_order(self):
+        path = os.path.join(self.directory, 'batch.timeline')
+        result = run_batch(5, seed=2, max_turns=50, workers=2, chunk_size=2, timelines=path)
+        self.assertEqual(os.listdir(self.directory), ['batch.timeline'])
+        loaded = TimelineFile(path)
+        try:
+            self.assertEqual([loaded[index].seed for index in range(len(loaded))],
+                             [game_seed(2, index) for index in range(5)])
+            self.assertEqual([loaded[index].rows - 1 for index in range(len(loaded))],
+                             [game.turns for game in result.games])
+        finally:
+            loaded.close()
@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from .. import conf
+from ..board import Board
+from ..trading import Trade, candidate_trades, landing_probabilities
+
+
+class TradingTestCase(TestCase):
+
+    def _board(self, num_players=2):
+        board = Board(num_players=num_players, locale='en-gb', seed=1)
+        board.setup()
+        return board
+
+    def _own(self, board, player, *names):
+        for name in names:
+            tile = board.get_tile_by_name(name)
+            tile.owner = player
+            player.portfolio.append(tile)
+
+    def test_landing_probabilities(self):
+        board = self._board()
+        probabilities = landing_probabilities(board)
+        self.assertAlmostEqual(sum(probabilities), 1.0)
+        self.assertEqual(probabilities[board.get_tile_by_name('Go to Jail').step - 1], 0)
+        self.assertEqual(max(probabilities), probabilities[board.get_tile_by_name('Jail').step - 1])
+
+    def test_valuation_shared_per_locale(self):
+        self.assertIs(self._board().valuation, self._board().valuation)
+
+    def test_monopoly_worth_more(self):
+        board = self._board()
+        p1, p2 = board.players
+        self._own(board, p1, 'Old Kent Road')
+        self._own(board, p2, 'Whitechapel Road')
+        trade = Trade(p1, p2, take=[board.get_tile_by_name('Whitechapel Road')])
+        self.assertGreater(board.valuation.trade_gain(trade, p1), -board.valuation.trade_gain(trade, p2))
+
+    def test_trade_completes_monopoly(self):
+        board = self._board()
+        p1, p2 = board.players
+        self._own(board, p1, 'Old Kent Road')
+        self._own(board, p2, 'Whitechapel Road')
+        previous_cash = p1.cash, p2.cash
+        p1.propose_trades()
+
+        self.assertIn(board.groups['brown'], p1.monopolies)
+        self.assertEqual(p2.portfolio, [])
+        paid = p2.cash - previous_cash[1]
+        self.assertGreater(paid, 0)
+        self.assertEqual(p1.cash, previous_cash[0] - paid)
+
+    def test_no_trade_for_developed_group(self):
+        board = self._board()
+        p1, p2 = board.players
+        self._own(board, p1, 'Old Kent Road')
+        self._own(board, p2, 'Whitechapel Road')
+        board.groups['brown'].development = 1
+        self.assertEqual(list(candidate_trades(p1, board.valuation)), [])
+
+    def test_declined_trade(self):
+        board = self._board()
+        p1, p2 = board.players
+        self._own(board, p1, 'Old Kent Road')
+        self._own(board, p2, 'Whitechapel Road')
+        p2.trade_acceptance_choice = lambda trade: conf.PLAYER_DECLINE_TRADE
+        p1.propose_trades()
+        self.assertEqual(p1.monopolies, set())
+        self.assertIs(board.get_tile_by_name('Whitechapel Road').owner, p2)
+
+    def test_swap(self):
+        board = self._board()
+        p1, p2 = board.players
+        self._own(board, p1, 'Old Kent Road', 'Pall Mall')
+        self._own(board, p2, 'Whitechapel Road', 'Whitehall', 'Northumberland Avenue')
+        p1.cash = 0
+        p1.propose_trades()
+        self.assertIn(board.groups['brown'], p1.monopolies)
+        self.assertIn(board.groups['pink'], p2.monopolies)
+        self.assertGreater(p1.cash, 0)
@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from ..board import Board
+from ..viewer import BoardView, CLEAR_SCREEN, watch, record, replay
+
+
+class ViewerTestCase(TestCase):
+
+    def _board(self):
+        board = Board(num_players=2, locale='en-gb', seed=5)
+        board.setup()
+        return board
+
+    def test_render_board(self):
+        board = self._board()
+        p1, p2 = board.players
+        mayfair = board.get_tile_by_name('Mayfair')
+        mayfair.owner = p2
+        mayfair.houses = 3
+        p1.tile = mayfair
+        frame = BoardView.from_board(board).render(board.turn, board.snapshot())
+        lines = frame.splitlines()
+        self.assertTrue(lines[18].endswith('Mayfair'))
+        self.assertTrue(lines[19].endswith('b3 A'))
+        self.assertIn('Turn 0', frame)
+        self.assertIn(p2.nickname, frame)
+
+    def test_watch_plays_whole_game(self):
+        board = self._board()
+        out = StringIO()
+        watch(board, fps=1000, max_turns=200, out=out)
+        self.assertTrue(board.finished or board.turn == 200)
+        frames = out.getvalue().split(CLEAR_SCREEN)
+        self.assertIn('Turn %d' % board.turn, frames[-1])
+
+    def test_record_and_replay(self):
+        board = self._board()
+        trace = StringIO()
+        record(board, trace, max_turns=20)
+        self.assertEqual(len(trace.getvalue().splitlines()), board.turn + 2)
+
+        trace.seek(0)
+        out = StringIO()
+        replay(trace, speed=1000.0, fps=1000, out=out)
+        frames = out.getvalue().split(CLEAR_SCREEN)
+        self.assertIn('Turn %d' % board.turn, frames[-1])
@@ -1,12 +1,17 @@
 import logging
 
-from conf import GO_TRANSIT_PAYMENT
+from . import conf
+
+logger = logging.getLogger(__name__)
 
 
 class Tile(object):
     """
     Our base Tile object.
     """
+    # Whether passing the tile does anything besides logging the visit.
+    transit_effects = False
+
     def __init__(self, *args, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
@@ -19,14 +24,14 @@ class Tile(object):
         What happens when our Player
         navigates to and stops on this tile?
         """
-        logging.debug('%s has arrived at "%s".' % (player.nickname, self.name))
+        logger.debug('%s has arrived at "%s".', player.nickname, self.name)
 
     def on_transit(self, player):
         """
         What happens when our Player
         navigates past this tile?
         """
-        logging.debug('\t%s has visited "%s".' % (player.nickname, self.name))
+        logger.debug('\t%s has visited "%s".', player.nickname, self.name)
 
 
 class NoopTile(Tile):
@@ -38,9 +43,17 @@ class NoopTile(Tile):
 
 class CardTile(Tile):
     """
-    Our base CardTile object.
+    Our base CardTile object. Landing on it draws the next card from
+    the board's deck for this type of tile, and applies it.
     """
-    pass
+    deck = None
+
+    def on_land(self, player):
+        super(CardTile, self).on_land(player)
+        card = self.deck.draw()
+        if card is not None:
+            logger.debug('%s drew "%s".', player.nickname, card.text)
+            card.apply(player, self.deck)
 
 
 class ChanceTile(CardTile):
@@ -57,11 +70,19 @@ class CommunityChestTile(CardTile):
 
 class GoTile(Tile):
     """
-    The corner "GO" tile.
+    The corner "GO" tile, which pays the salary to whoever passes or
+    stops on it.
     """
+    transit_effects = True
+
     def on_transit(self, player):
-        player.wallet.deposit(GO_TRANSIT_PAYMENT)
-        logging.debug('%s has passed GO and collected %d.' % (player.nickname, GO_TRANSIT_PAYMENT))
+        player.wallet.deposit(conf.GO_TRANSIT_PAYMENT)
+        logger.debug('%s has passed GO and collected %d.', player.nickname, conf.GO_TRANSIT_PAYMENT)
+
+    def on_land(self, player):
+        super(GoTile, self).on_land(player)
+        player.wallet.deposit(conf.GO_TRANSIT_PAYMENT)
+        logger.debug('%s has collected %d for stopping on GO.', player.nickname, conf.GO_TRANSIT_PAYMENT)
 
 
 class FreeParkingTile(NoopTile):
@@ -84,7 +105,7 @@ class GoToJailTile(Tile):
     """
     def on_land(self, player):
         player.handle_jail_entry()
-        logging.debug('%s has arrived at Go To Jail, they are now in jail.' % player.nickname)
+        logger.debug('%s has arrived at Go To Jail, they are now in jail.', player.nickname)
 
 
 class TaxableTile(Tile):
@@ -93,22 +114,164 @@ class TaxableTile(Tile):
     """
     def on_land(self, player):
         player.wallet.withdraw(self.tax)
-        logging.debug('%s has arrived at "%s", they have been taxed %d.' % (player.nickname, self.name, self.tax))
+        logger.debug('%s has arrived at "%s", they have been taxed %d.', player.nickname, self.name, self.tax)
+
+
+class PropertyGroup(object):
+    """
+    The tiles of a single colour group, or all of the stations or utilities.
+
+    Counters are kept up to date as the group's tiles change hands and are
+    developed, so whether a player owns the whole group, or may build on
+    one of its tiles, is known without scanning the board:
+
+    - `owned` counts the tiles each player owns, and each player's
+      `monopolies` and `near_monopolies` hold the groups they own every
+      tile of, or all but one.
+    - `development` totals the group's houses, counting a hotel as five.
+    - `mortgaged` counts the group's mortgaged tiles.
+    - `changed`, if an observer sets it to a set, collects the group's
+      tiles whose owner, development or mortgage has changed.
+    """
+    def __init__(self, name, buildable):
+        self.name = name
+        self.buildable = buildable
+        self.tiles = []
+        self.owned = {}
+        self.development = 0
+        self.mortgaged = 0
+        self.changed = None
+
+    def __repr__(self):
+        return '<PropertyGroup: %s>' % self.name
+
+    def transfer(self, previous_owner, owner):
+        """
+        Updates the counters when one of our tiles changes hands.
+        """
+        size = len(self.tiles)
+        if previous_owner is not None:
+            self.owned[previous_owner] -= 1
+            owned = self.owned[previous_owner]
+            if owned == size - 1:
+                previous_owner.monopolies.discard(self)
+                if owned:
+                    previous_owner.near_monopolies.add(self)
+            elif owned == size - 2:
+                previous_owner.near_monopolies.discard(self)
+        if owner is not None:
+            self.owned[owner] = owned = self.owned.get(owner, 0) + 1
+            if owned == size:
+                owner.monopolies.add(self)
+                owner.near_monopolies.discard(self)
+            elif owned == size - 1:
+                owner.near_monopolies.add(self)
+
+    def is_monopoly(self, player):
+        return self.owned.get(player, 0) == len(self.tiles)
+
+    def get_buildable_tile(self):
+        """
+        Returns the tile on which the next house or hotel may be built.
+        Houses are built evenly, so no tile is ever more than one house
+        ahead of another: the next is built on a tile with the lowest
+        development, `development // len(tiles)`. Nothing may be built
+        while any of the group's tiles are mortgaged.
+        """
+        lowest = self.development // len(self.tiles)
+        if not self.buildable or self.mortgaged or lowest == 5:
+            return None
+        for tile in self.tiles:
+            if tile.development == lowest:
+                return tile
+
+    def get_sellable_tile(self):
+        """
+        Returns the tile from which the next house or hotel is sold back
+        to the bank. Houses are sold evenly too, so it's a tile with the
+        highest development.
+        """
+        if not self.development:
+            return None
+        highest = -(-self.development // len(self.tiles))
+        for tile in reversed(self.tiles):
+            if tile.development == highest:
+                return tile
 
 
 class PropertyTile(Tile):
     """
     All purchasable tiles are of this tile type.
     """
+    property_group = None
+
     def __init__(self, *args, **kwargs):
         super(PropertyTile, self).__init__(*args, **kwargs)
-        self.owner = None
+        self._owner = None
         self.houses = 0
         self.hotel = False
+        self.mortgaged = False
+
+    @property
+    def owner(self):
+        return self._owner
+
+    @owner.setter
+    def owner(self, player):
+        if self.property_group is not None:
+            self.property_group.transfer(self._owner, player)
+        if self.mortgaged:
+            if self._owner is not None:
+                self._owner.mortgages.discard(self)
+            if player is not None:
+                player.mortgages.add(self)
+        self._owner = player
+        self.mark_changed()
+
+    def mark_changed(self):
+        """
+        Tells the group's observer, if any, that our owner, development or
+        mortgage has changed.
+        """
+        group = self.property_group
+        if group is not None and group.changed is not None:
+            group.changed.add(self)
 
     @property
     def is_owned(self):
-        return self.owner is not None
+        return self._owner is not None
+
+    @property
+    def development(self):
+        """
+        The number of houses on this tile, counting a hotel as five.
+        """
+        if self.hotel:
+            return 5
+        return self.houses
+
+    @property
+    def mortgage_value(self):
+        """
+        What the bank lends against this tile. Tiles without a mortgage
+        price in the board template are mortgaged for half their price.
+        """
+        return self.prices.get('mortgage', self.prices['purchase'] // 2)
+
+    @property
+    def unmortgage_cost(self):
+        """
+        Lifting a mortgage repays it, plus 10% interest.
+        """
+        return self.mortgage_value + self.mortgage_value // 10
+
+    def get_sale_value(self):
+        """
+        Houses and hotels are sold back to the bank for half their price.
+        """
+        if self.hotel:
+            return self.prices['hotel'] // 2
+        return self.prices['house'] // 2
 
     def get_upgrade_price(self):
         """
@@ -117,29 +280,56 @@ class PropertyTile(Tile):
             return 'hotel', self.prices['hotel']
         return 'house', self.prices['house']
 
+    def charge_rent(self, player, price):
+        """
+        Makes `player` pay `price` in rent for stopping on this tile.
+        """
+        player.pay_rent(self, price)
+
+    def on_purchase_declined(self, player):
+        """
+        What happens when our Player stops on this tile while it's
+        unowned, and doesn't buy it?
+        """
+        pass
+
     def get_rent_cost(self, dice_roll):
         """
         When you land on a property, the number of houses decides
         how much the rent is. When you load on a station, the number
         of stations owned by the same player decides the price. When
         you land on a utility, if one is owned, the rent is four times
-        the dice roll. If both utilities are owned, rent is ten times
-        the dice roll.
+        the dice roll. If every utility is owned, rent is ten times
+        the dice roll. Mortgaged tiles don't collect rent.
         """
+        if self.mortgaged:
+            return 0
         if self.type == 'property':
             houses = str(self.houses)
             if self.hotel:
                 houses = '5'
             return self.prices['rent'][houses]
         elif self.type == 'station':
-            owner_portfolio = self.owner.get_portfolio()
-            owner_total_stations = len(owner_portfolio['station'])
+            owner_total_stations = self.property_group.owned[self.owner]
             return self.prices['rent'][str(owner_total_stations)]
         elif self.type == 'utility':
-            owner_portfolio = self.owner.get_portfolio()
-            owner_total_utilities = len(owner_portfolio['utility'])
-            if owner_total_utilities == 1:
-                return sum(dice_roll) * 4
-            elif owner_total_utilities == 2:
+            # Owning every utility on the board multiplies the roll by ten.
+            if self.property_group.is_monopoly(self.owner):
                 return sum(dice_roll) * 10
-            raise ValueError('Unexpectedly found %d utility tiles, expected one or two.' % owner_total_utilities)
+            return sum(dice_roll) * 4
+
+
+# The tile class of each type of tile in a board template, under the
+# standard rules. See `rules.RuleSet` for house rules.
+TILE_CLASSES = {
+    'go': GoTile,
+    'station': PropertyTile,
+    'utility': PropertyTile,
+    'tax': TaxableTile,
+    'jail': JailTile,
+    'chance': ChanceTile,
+    'property': PropertyTile,
+    'gotojail': GoToJailTile,
+    'freeparking': FreeParkingTile,
+    'community_chest': CommunityChestTile
+}
@@ -0,0 +1,409 @@
+import os
+import sys
+import mmap
+import struct
+from array import array
+
+from .tiles import PropertyTile
+
+# The kinds of ownership event, and what their value is.
+OWNER = 0        # The owning seat, or -1 for the bank.
+DEVELOPMENT = 1  # The number of houses, counting a hotel as five.
+MORTGAGED = 2    # 1 if mortgaged, otherwise 0.
+
+# Timeline files start with FILE_HEADER, the magic number and the format's
+# version, and end with an index of each game block's offset (unsigned 64
+# bit integers), followed by FOOTER.
+FILE_MAGIC = b'MTL1'
+FILE_VERSION = 2
+FILE_HEADER = struct.Struct('<4sI')
+FOOTER = struct.Struct('<QI4s')
+
+# Each game block starts with BLOCK_HEADER: a magic number, the block's
+# size in bytes, the game's seed (-1 if unknown), its number of players
+# and tiles, the turn of its first row, and its numbers of rows and events.
+BLOCK_MAGIC = b'GAME'
+BLOCK_HEADER = struct.Struct('<4sIqHHIII')
+
+# The block's columns follow its header, in this order, each padded to a
+# multiple of four bytes. All values are little-endian.
+# - base_owner, base_development, base_mortgaged: the state of each tile at the first row's turn.
+# - cash, net_worth, position: one value per player per row, row-major.
+# - event_turn, event_tile, event_kind, event_value: one value per ownership event.
+COLUMNS = (
+    ('base_owner', 'b', 'tiles'),
+    ('base_development', 'b', 'tiles'),
+    ('base_mortgaged', 'b', 'tiles'),
+    ('cash', 'i', 'cells'),
+    ('net_worth', 'i', 'cells'),
+    ('position', 'H', 'cells'),
+    ('event_turn', 'i', 'events'),
+    ('event_tile', 'i', 'events'),
+    ('event_kind', 'b', 'events'),
+    ('event_value', 'h', 'events'),
+)
+
+
+def to_bytes(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    if hasattr(values, 'tobytes'):
+        return values.tobytes()
+    return values.tostring()
+
+
+def from_bytes(typecode, data):
+    values = array(typecode)
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def padding(size):
+    return -size % 4
+
+
+class Timeline(object):
+    """
+    A single game's trajectory, turn by turn.
+
+    Each row holds every player's cash, net worth (what they'd have if they
+    sold and mortgaged everything) and position after a turn, in arrays
+    which are preallocated and doubled when full. Ownership is recorded as
+    events, only when a tile's owner, development or mortgage changes,
+    on top of the `base_*` state of every tile at the first row's turn.
+
+    With a `capacity`, the timeline is a ring buffer of the last `capacity`
+    turns: rows are overwritten in place, and events which fall out of the
+    window are folded into the base state.
+    """
+    def __init__(self, num_players, tile_count, seed=None, capacity=None):
+        self.num_players = num_players
+        self.tile_count = tile_count
+        self.seed = seed
+        self.capacity = capacity
+        self.first_turn = 0
+        self.rows = 0
+        self.base_owner = array('b', [-1]) * tile_count
+        self.base_development = array('b', [0]) * tile_count
+        self.base_mortgaged = array('b', [0]) * tile_count
+        allocated = (capacity or 64) * num_players
+        self.cash = array('i', [0]) * allocated
+        self.net_worth = array('i', [0]) * allocated
+        self.position = array('H', [0]) * allocated
+        self.event_turn = array('i')
+        self.event_tile = array('i')
+        self.event_kind = array('b')
+        self.event_value = array('h')
+        # The first event which is still inside the window.
+        self.event_start = 0
+        # The last recorded state of each tile, the seat of each player by
+        # id, the tiles changed since the last row (see
+        # `PropertyGroup.changed`) and what each seat's tiles are worth, set
+        # on the first `record`.
+        self.state = None
+        self.seats = None
+        self.changed = None
+        self.holdings = None
+
+    def __repr__(self):
+        return '<Timeline: turns %d to %d, %d events>' % (self.first_turn, self.first_turn + self.rows - 1,
+                                                          len(self.event_turn) - self.event_start)
+
+    @classmethod
+    def for_board(cls, board, capacity=None):
+        return cls(len(board.players), board.total_tile_count, board.seed, capacity)
+
+    def bind(self, board):
+        """
+        Records the starting position of `board`'s game, then a row after
+        every turn, by wrapping its `step`.
+        """
+        step = board.step
+
+        def recorded_step():
+            running = step()
+            if running:
+                self.record(board)
+            return running
+
+        board.step = recorded_step
+        self.record(board)
+
+    def record(self, board):
+        """
+        Records the current state of `board` as the row for `board.turn`.
+        The first row looks at every property tile; later rows only at those
+        which have changed since, so a row costs the same on any size of
+        board.
+        """
+        turn = board.turn
+        if self.state is None:
+            self.state = [(-1, 0, 0)] * self.tile_count
+            self.seats = dict((player.id, seat) for seat, player in enumerate(board.players))
+            self.holdings = [0] * self.num_players
+            self.changed = set()
+            for group in board.groups.values():
+                group.changed = self.changed
+            changed = [tile for tile in board.tiles if isinstance(tile, PropertyTile)]
+        else:
+            changed = sorted(self.changed, key=lambda tile: tile.step)
+        self.changed.clear()
+        for tile in changed:
+            self.update_tile(turn, tile)
+
+        row = self.next_row(turn)
+        offset = row * self.num_players
+        for seat, player in enumerate(board.players):
+            self.cash[offset + seat] = player.cash
+            self.net_worth[offset + seat] = player.cash + self.holdings[seat]
+            self.position[offset + seat] = player.tile.step - 1
+
+    def update_tile(self, turn, tile):
+        """
+        Records the events of any change to `tile` since the last row.
+        """
+        owner = tile.owner
+        index = tile.step - 1
+        previous = self.state[index]
+        if owner is None:
+            state = (-1, 0, 0)
+        else:
+            state = (self.seats[owner.id], tile.development, 1 if tile.mortgaged else 0)
+        if state == previous:
+            return
+        for kind in (OWNER, DEVELOPMENT, MORTGAGED):
+            if state[kind] != previous[kind]:
+                self.add_event(turn, index, kind, state[kind])
+        self.state[index] = state
+        if previous[0] >= 0:
+            self.holdings[previous[0]] -= self.holding_value(tile, previous)
+        if state[0] >= 0:
+            self.holdings[state[0]] += self.holding_value(tile, state)
+
+    def holding_value(self, tile, state):
+        """
+        What `tile` would raise by selling its buildings and mortgaging it,
+        in `state`.
+        """
+        _, development, mortgaged = state
+        value = 0 if mortgaged else tile.mortgage_value
+        if not development:
+            return value
+        if development == 5:
+            return value + tile.prices['hotel'] // 2 + 4 * (tile.prices['house'] // 2)
+        return value + development * (tile.prices['house'] // 2)
+
+    def add_event(self, turn, tile, kind, value):
+        self.event_turn.append(turn)
+        self.event_tile.append(tile)
+        self.event_kind.append(kind)
+        self.event_value.append(value)
+
+    def next_row(self, turn):
+        """
+        Returns the index of the row to hold `turn`, growing the arrays or,
+        for a ring buffer, dropping the oldest turn.
+        """
+        if not self.rows:
+            self.first_turn = turn
+        if self.capacity is None:
+            if (self.rows + 1) * self.num_players > len(self.cash):
+                for column in (self.cash, self.net_worth, self.position):
+                    column.extend(array(column.typecode, [0]) * len(column))
+            self.rows += 1
+            return self.rows - 1
+        if self.rows == self.capacity:
+            self.first_turn += 1
+            self.fold_events(self.first_turn)
+        else:
+            self.rows += 1
+        return turn % self.capacity
+
+    def fold_events(self, turn):
+        """
+        Applies the events up to and including `turn` to the base state.
+        """
+        base = (self.base_owner, self.base_development, self.base_mortgaged)
+        index = self.event_start
+        while index < len(self.event_turn) and self.event_turn[index] <= turn:
+            base[self.event_kind[index]][self.event_tile[index]] = self.event_value[index]
+            index += 1
+        self.event_start = index
+        if index > 1024 and index * 2 > len(self.event_turn):
+            for name in ('event_turn', 'event_tile', 'event_kind', 'event_value'):
+                setattr(self, name, getattr(self, name)[index:])
+            self.event_start = 0
+
+    def columns(self):
+        """
+        Returns each of `COLUMNS`, trimmed to the recorded rows and events,
+        with rows in turn order.
+        """
+        cells = self.rows * self.num_players
+        columns = {
+            'base_owner': self.base_owner,
+            'base_development': self.base_development,
+            'base_mortgaged': self.base_mortgaged,
+        }
+        for name in ('cash', 'net_worth', 'position'):
+            column = getattr(self, name)
+            if self.capacity is None:
+                columns[name] = column[:cells]
+            else:
+                start = (self.first_turn % self.capacity) * self.num_players
+                columns[name] = (column[start:] + column[:start])[:cells]
+        for name in ('event_turn', 'event_tile', 'event_kind', 'event_value'):
+            columns[name] = getattr(self, name)[self.event_start:]
+        return columns
+
+    def to_bytes(self):
+        """
+        Returns the timeline as a game block.
+        """
+        columns = self.columns()
+        body = []
+        for name, _, _ in COLUMNS:
+            data = to_bytes(columns[name])
+            body.append(data + b'\0' * padding(len(data)))
+        body = b''.join(body)
+        seed = self.seed if self.seed is not None and -2 ** 63 <= self.seed < 2 ** 63 else -1
+        header = BLOCK_HEADER.pack(BLOCK_MAGIC, BLOCK_HEADER.size + len(body), seed, self.num_players,
+                                   self.tile_count, self.first_turn, self.rows, len(columns['event_turn']))
+        return header + body
+
+    @classmethod
+    def from_buffer(cls, buf, offset=0):
+        """
+        Reads the game block at `offset` of `buf`, e.g. a memory-mapped
+        timeline file, only copying that block's columns.
+        """
+        magic, size, seed, num_players, tile_count, first_turn, rows, events = \
+            BLOCK_HEADER.unpack_from(buf, offset)
+        if magic != BLOCK_MAGIC:
+            raise ValueError('There is no game block at offset %d.' % offset)
+        timeline = cls(num_players, tile_count, None if seed < 0 else seed)
+        timeline.first_turn = first_turn
+        timeline.rows = rows
+        counts = {'tiles': tile_count, 'cells': rows * num_players, 'events': events}
+        position = offset + BLOCK_HEADER.size
+        for name, typecode, count in COLUMNS:
+            size = array(typecode).itemsize * counts[count]
+            setattr(timeline, name, from_bytes(typecode, buf[position:position + size]))
+            position += size + padding(size)
+        return timeline
+
+    def ownership_at(self, turn):
+        """
+        Returns each tile's `(owner, development, mortgaged)` after `turn`,
+        which must be within the timeline.
+        """
+        if not self.first_turn <= turn < self.first_turn + self.rows:
+            raise IndexError('Turn %d is not in the timeline.' % turn)
+        owner, development, mortgaged = (array('b', column) for column in (
+            self.base_owner, self.base_development, self.base_mortgaged))
+        state = (owner, development, mortgaged)
+        for index in range(self.event_start, len(self.event_turn)):
+            if self.event_turn[index] > turn:
+                break
+            state[self.event_kind[index]][self.event_tile[index]] = self.event_value[index]
+        return list(zip(owner, development, mortgaged))
+
+    def row(self, turn):
+        """
+        Returns each player's `(cash, net_worth, position)` after `turn`.
+        """
+        if not self.first_turn <= turn < self.first_turn + self.rows:
+            raise IndexError('Turn %d is not in the timeline.' % turn)
+        if self.capacity is None:
+            offset = (turn - self.first_turn) * self.num_players
+        else:
+            offset = (turn % self.capacity) * self.num_players
+        return [(self.cash[offset + seat], self.net_worth[offset + seat], self.position[offset + seat])
+                for seat in range(self.num_players)]
+
+
+class TimelineWriter(object):
+    """
+    Writes game blocks to the file object `fs`, then their index on `close`.
+    Timelines recorded for it keep the last `capacity` turns, if given.
+    """
+    def __init__(self, fs, capacity=None):
+        self.fs = fs
+        self.capacity = capacity
+        self.offsets = []
+        self.position = FILE_HEADER.size
+        fs.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+
+    def write(self, timeline):
+        self.write_block(timeline.to_bytes())
+
+    def write_block(self, block):
+        self.offsets.append(self.position)
+        self.fs.write(block)
+        self.position += len(block)
+
+    def close(self):
+        self.fs.write(struct.pack('<%dQ' % len(self.offsets), *self.offsets))
+        self.fs.write(FOOTER.pack(self.position, len(self.offsets), FILE_MAGIC))
+
+
+class TimelineFile(object):
+    """
+    A memory-mapped timeline file. Games are read one at a time, by index,
+    without reading the rest of the file.
+    """
+    def __init__(self, path):
+        self.fs = open(path, 'rb')
+        self.buffer = mmap.mmap(self.fs.fileno(), 0, access=mmap.ACCESS_READ)
+        index_offset, games, magic = FOOTER.unpack_from(self.buffer, len(self.buffer) - FOOTER.size)
+        if magic != FILE_MAGIC:
+            raise ValueError('%s is not a timeline file.' % path)
+        version = FILE_HEADER.unpack_from(self.buffer)[1]
+        if version != FILE_VERSION:
+            raise ValueError('%s is a version %d timeline file, not version %d.' % (path, version, FILE_VERSION))
+        self.offsets = struct.unpack_from('<%dQ' % games, self.buffer, index_offset)
+
+    def __repr__(self):
+        return '<TimelineFile: %d games>' % len(self)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        return Timeline.from_buffer(self.buffer, self.offsets[index])
+
+    def block(self, index):
+        """
+        Returns the raw bytes of a game block.
+        """
+        size = struct.unpack_from('<I', self.buffer, self.offsets[index] + 4)[0]
+        return self.buffer[self.offsets[index]:self.offsets[index] + size]
+
+    def close(self):
+        self.buffer.close()
+        self.fs.close()
+
+
+def merge_files(path, parts):
+    """
+    Writes the games of the timeline files at `parts`, in order, to a
+    single timeline file at `path`, and removes the parts.
+    """
+    with open(path, 'wb') as fs:
+        writer = TimelineWriter(fs)
+        for part in parts:
+            timelines = TimelineFile(part)
+            try:
+                for index in range(len(timelines)):
+                    writer.write_block(timelines.block(index))
+            finally:
+                timelines.close()
+        writer.close()
+    for part in parts:
+        os.remove(part)
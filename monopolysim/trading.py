@@ -0,0 +1,224 @@
+import logging
+
+from . import conf
+from .tiles import PropertyTile
+
+logger = logging.getLogger(__name__)
+
+# The probability of each total of two dice.
+DICE_TOTALS = [(total, (6 - abs(total - 7)) / 36.0) for total in range(2, 13)]
+
+# Valuations which have already been worked out, by locale and the
+# number of houses monopolies are valued at.
+valuations = {}
+
+
+def landing_probabilities(board, iterations=100):
+    """
+    Returns the probability of a player's turn ending on each of `board`'s
+    tiles, in the long run. Moves are treated as a Markov chain over the
+    tiles: a roll of two dice, then the "Go To Jail" tile or a card drawn
+    from a Chance or Community Chest deck may move the player on again.
+    Doubles and jail turns are ignored.
+    """
+    tile_count = board.total_tile_count
+    jail = board.get_tile_by_name('Jail').step - 1
+
+    def resolve(index, probability, outcomes):
+        tile = board.tiles[index]
+        if tile.type == 'gotojail':
+            outcomes[jail] = outcomes.get(jail, 0) + probability
+        elif tile.type in board.decks:
+            cards = board.decks[tile.type].cards
+            for card in cards:
+                share = probability / len(cards)
+                if card.action == 'advance':
+                    target = board.get_tile_by_name(card.tile).step - 1
+                    outcomes[target] = outcomes.get(target, 0) + share
+                elif card.action == 'advance_to_nearest':
+                    target = index
+                    for moves in range(1, tile_count):
+                        target = (index + moves) % tile_count
+                        if board.tiles[target].type == card.tile_type:
+                            break
+                    outcomes[target] = outcomes.get(target, 0) + share
+                elif card.action == 'go_back':
+                    resolve((index - card.steps) % tile_count, share, outcomes)
+                elif card.action == 'go_to_jail':
+                    outcomes[jail] = outcomes.get(jail, 0) + share
+                else:
+                    outcomes[index] = outcomes.get(index, 0) + share
+        else:
+            outcomes[index] = outcomes.get(index, 0) + probability
+
+    transitions = []
+    for index in range(tile_count):
+        outcomes = {}
+        for total, probability in DICE_TOTALS:
+            resolve((index + total) % tile_count, probability, outcomes)
+        transitions.append(sorted(outcomes.items()))
+
+    probabilities = [1.0 / tile_count] * tile_count
+    for _ in range(iterations):
+        following = [0.0] * tile_count
+        for index, outcomes in enumerate(transitions):
+            for target, probability in outcomes:
+                following[target] += probabilities[index] * probability
+        probabilities = following
+    return probabilities
+
+
+class Valuation(object):
+    """
+    Values properties by the rent they can be expected to collect.
+
+    `yields[step][count]` is the rent the tile at `step` collects per
+    opponent turn, on average, when its owner holds `count` tiles of its
+    group: a colour group's rent is taken as if it were developed to
+    `conf.TRADE_VALUATION_HOUSES` houses once it's a monopoly, stations
+    count the stations their owner holds, and utilities the utilities.
+
+    The table only depends on the board template, so it's worked out once
+    per locale (see `for_board`). As players trade, only the groups which
+    change hands are revalued, using the group counters which are kept up
+    to date as ownership changes.
+    """
+    def __init__(self, board):
+        probabilities = landing_probabilities(board)
+        self.yields = {}
+        for tile in board.tiles:
+            if not isinstance(tile, PropertyTile):
+                continue
+            size = len(tile.property_group.tiles)
+            probability = probabilities[tile.step - 1]
+            yields = [0.0]
+            for count in range(1, size + 1):
+                if tile.type == 'station':
+                    rent = tile.prices['rent'][str(count)]
+                elif tile.type == 'utility':
+                    rent = 7 * (10 if count == size else 4)
+                elif count == size:
+                    rent = tile.prices['rent'][str(conf.TRADE_VALUATION_HOUSES)]
+                else:
+                    rent = tile.prices['rent']['0']
+                yields.append(probability * rent)
+            self.yields[tile.step] = yields
+
+    @classmethod
+    def for_board(cls, board):
+        key = board.locale, conf.TRADE_VALUATION_HOUSES
+        if key not in valuations:
+            valuations[key] = cls(board)
+        return valuations[key]
+
+    def holding_value(self, steps):
+        """
+        The expected rent per opponent turn of holding the tiles at `steps`,
+        which all belong to a single group.
+        """
+        count = len(steps)
+        return sum(self.yields[step][count] for step in steps)
+
+    def worth(self, tiles, opponents):
+        """
+        What holding `tiles`, which all belong to a single group, is worth:
+        what they'd raise by mortgaging them, plus the rent `opponents`
+        other players can be expected to pay over the next
+        `conf.TRADE_VALUATION_ROUNDS` rounds.
+        """
+        rent = self.holding_value([tile.step for tile in tiles])
+        return sum(tile.mortgage_value for tile in tiles if not tile.mortgaged) + \
+            rent * opponents * conf.TRADE_VALUATION_ROUNDS
+
+    def trade_gain(self, trade, player):
+        """
+        How much better off `player`, who's a party to `trade`, would be if
+        it went ahead. Only the groups changing hands are revalued.
+        """
+        if player is trade.proposer:
+            given, received, cash = trade.give, trade.take, -trade.cash
+        else:
+            given, received, cash = trade.take, trade.give, trade.cash
+        opponents = player.board.count_active_players() - 1
+        gain = cash
+        for group in set(tile.property_group for tile in given + received):
+            held = [tile for tile in group.tiles if tile.owner is player]
+            after = [tile for tile in held if tile not in given] + [tile for tile in received
+                                                                    if tile.property_group is group]
+            gain += self.worth(after, opponents) - self.worth(held, opponents)
+        return gain
+
+
+class Trade(object):
+    """
+    An offer from `proposer` to `responder`: the tiles in `give` for the
+    tiles in `take`, with `cash` paid by the proposer (or, if it's negative,
+    by the responder).
+    """
+    def __init__(self, proposer, responder, give=(), take=(), cash=0):
+        self.proposer = proposer
+        self.responder = responder
+        self.give = list(give)
+        self.take = list(take)
+        self.cash = cash
+
+    def __repr__(self):
+        return '<Trade: %s gives %s and $%d to %s for %s>' % (
+            self.proposer.nickname, [tile.name for tile in self.give], self.cash,
+            self.responder.nickname, [tile.name for tile in self.take])
+
+    def is_affordable(self):
+        if self.cash >= 0:
+            return self.proposer.cash > self.cash
+        return self.responder.cash > -self.cash
+
+    def execute(self):
+        """
+        Exchanges the tiles and cash.
+        """
+        for tiles, previous_owner, owner in ((self.give, self.proposer, self.responder),
+                                             (self.take, self.responder, self.proposer)):
+            for tile in tiles:
+                tile.owner = owner
+                previous_owner.portfolio.remove(tile)
+                owner.portfolio.append(tile)
+        if self.cash >= 0:
+            self.proposer.wallet.withdraw(self.cash)
+            self.responder.wallet.deposit(self.cash)
+        else:
+            self.responder.wallet.withdraw(-self.cash)
+            self.proposer.wallet.deposit(-self.cash)
+        logger.debug('%s traded %s and $%d with %s for %s.', self.proposer.nickname,
+                     [tile.name for tile in self.give], self.cash, self.responder.nickname,
+                     [tile.name for tile in self.take])
+
+
+def is_tradable(tile):
+    """
+    Tiles can only change hands while their group has no buildings.
+    """
+    return not tile.property_group.development
+
+
+def candidate_trades(player, valuation):
+    """
+    Yields the trades which would complete one of `player`'s groups: the
+    last tile they're missing, for cash alone or for one of their tiles
+    outside of their monopolies. The cash is whatever leaves the other
+    player better off, so the trades they'd accept by default.
+    """
+    groups = sorted((group for group in player.near_monopolies if not group.development),
+                    key=lambda g: g.tiles[0].step)
+    if not groups:
+        return
+    spare = [tile for tile in player.portfolio
+             if tile.property_group not in player.monopolies and is_tradable(tile)]
+    for group in groups:
+        missing = [tile for tile in group.tiles if tile.owner is not player][0]
+        responder = missing.owner
+        if responder is None or responder.bankrupt:
+            continue
+        for give in [None] + [tile for tile in spare if tile.property_group is not group]:
+            trade = Trade(player, responder, [give] if give else [], [missing])
+            trade.cash = int(-valuation.trade_gain(trade, responder)) + 1
+            yield trade
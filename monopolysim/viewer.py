@@ -0,0 +1,139 @@
+import sys
+import json
+from threading import Thread
+from time import time, sleep
+from string import ascii_uppercase
+
+from . import conf
+from .layout import ring_layout
+from .tiles import PropertyTile
+
+# Clears the terminal and moves the cursor to the top-left corner.
+CLEAR_SCREEN = '\x1b[H\x1b[2J'
+
+
+class BoardView(object):
+    """
+    Renders board snapshots (see `Board.snapshot`) as text.
+
+    Players are drawn as letters, in seat order, on the tile they occupy.
+    Beneath each tile is the seat of its owner in lower case, followed by
+    the number of houses on it, or "H" for a hotel.
+    """
+    cell_width = 8
+
+    def __init__(self, tile_names, property_indices, player_names):
+        self.tile_names = tile_names
+        self.property_indices = property_indices
+        self.player_names = player_names
+        self.layout = ring_layout(len(tile_names))
+
+    @classmethod
+    def from_board(cls, board):
+        property_indices = [tile.step - 1 for tile in board.tiles if isinstance(tile, PropertyTile)]
+        return cls([tile.name for tile in board.tiles], property_indices,
+                   [player.nickname for player in board.players])
+
+    def header(self):
+        return {
+            'tiles': self.tile_names,
+            'properties': self.property_indices,
+            'players': self.player_names
+        }
+
+    def render(self, turn, snapshot):
+        players, properties = snapshot[:2]
+        width = self.cell_width - 1
+
+        tokens = [''] * len(self.tile_names)
+        for seat, player in enumerate(players):
+            step, cash, in_jail, jail_exit_rolls, bankrupt = player[:5]
+            if not bankrupt:
+                tokens[step - 1] += ascii_uppercase[seat % 26]
+
+        markers = [''] * len(self.tile_names)
+        for index, state in zip(self.property_indices, properties):
+            owner, houses, hotel = state[:3]
+            if owner is not None:
+                markers[index] = ascii_uppercase[owner % 26].lower() + ('H' if hotel else str(houses or ''))
+
+        lines = []
+        for row in self.layout:
+            names, states = [], []
+            for index in row:
+                if index is None:
+                    names.append(' ' * self.cell_width)
+                    states.append(' ' * self.cell_width)
+                    continue
+                names.append(self.tile_names[index].replace(' ', '')[:width].ljust(self.cell_width))
+                state = '%-3s%s' % (markers[index], tokens[index] or '')
+                states.append(state[:width].ljust(self.cell_width))
+            lines.append(''.join(names).rstrip())
+            lines.append(''.join(states).rstrip())
+
+        lines.append('')
+        lines.append('Turn %d' % turn)
+        for seat, player in enumerate(players):
+            step, cash, in_jail, jail_exit_rolls, bankrupt = player[:5]
+            status = ''
+            if bankrupt:
+                status = 'bankrupt'
+            elif in_jail:
+                status = 'in jail'
+            line = '%s  %-10s $%-7d %-24s %s' % (ascii_uppercase[seat % 26], self.player_names[seat],
+                                                  cash, self.tile_names[step - 1], status)
+            lines.append(line.rstrip())
+        return '\n'.join(lines)
+
+
+def draw(frame, out):
+    out.write(CLEAR_SCREEN + frame + '\n')
+    out.flush()
+
+
+def watch(board, fps=None, max_turns=None, out=sys.stdout):
+    """
+    Plays `board`'s game at full speed on a separate thread, while drawing
+    its state `fps` times per second. The viewer only samples the game, so
+    the game never waits for it.
+    """
+    interval = 1.0 / (fps or conf.VIEWER_FRAME_RATE)
+    view = BoardView.from_board(board)
+
+    engine = Thread(target=board.run, args=(max_turns,))
+    engine.daemon = True
+    engine.start()
+    while engine.is_alive():
+        draw(view.render(board.turn, board.snapshot()), out)
+        engine.join(interval)
+    draw(view.render(board.turn, board.snapshot()), out)
+
+
+def record(board, fs, max_turns=None):
+    """
+    Plays `board`'s game at full speed, writing a trace which `replay`
+    can play back: a JSON header line, then one `[turn, snapshot]` line
+    for the starting position and after every turn.
+    """
+    fs.write(json.dumps(dict(BoardView.from_board(board).header(), seed=board.seed)) + '\n')
+    fs.write(json.dumps([board.turn, board.snapshot()]) + '\n')
+    while (max_turns is None or board.turn < max_turns) and board.step():
+        fs.write(json.dumps([board.turn, board.snapshot()]) + '\n')
+
+
+def replay(fs, speed=10.0, fps=None, out=sys.stdout):
+    """
+    Plays back a trace written by `record`, at `speed` turns per second.
+    """
+    interval = 1.0 / (fps or conf.VIEWER_FRAME_RATE)
+    header = json.loads(fs.readline())
+    view = BoardView(header['tiles'], header['properties'], header['players'])
+    frames = [json.loads(line) for line in fs]
+
+    started = time()
+    while True:
+        index = min(int((time() - started) * speed), len(frames) - 1)
+        draw(view.render(*frames[index]), out)
+        if index == len(frames) - 1:
+            return
+        sleep(interval)